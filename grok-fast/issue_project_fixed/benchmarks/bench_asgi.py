@@ -0,0 +1,149 @@
+"""
+Load-test comparison: Flask (WSGI, thread pool) vs the ASGI app (asyncio)
+
+Both apps are driven in-process with distinct /api/register payloads
+against SQLite-backed uniqueness index and user store, as deployed with
+UNIQUENESS_DB and USER_DB. The ASGI app runs once with that work in the
+thread pool and once inline; the "loop lag" column is the longest a timer
+on the event loop was kept waiting meanwhile.
+
+Usage:
+    python benchmarks/bench_asgi.py [--requests N] [--concurrency N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.app import app as flask_app, rate_limiter  # noqa: E402
+from src.asgi_app import app as asgi_app, rate_limiter as asgi_rate_limiter  # noqa: E402
+from src.registration import (  # noqa: E402
+    Registrations,
+    get_user_store,
+    set_uniqueness_index,
+    set_user_store,
+)
+from src.uniqueness import open_uniqueness_index  # noqa: E402
+from src.user_store import open_user_store  # noqa: E402
+
+# All requests come from one address
+rate_limiter.enabled = False
+asgi_rate_limiter.enabled = False
+
+
+def payloads(prefix, count):
+    return [json.dumps({
+        "username": f"{prefix}{index}", "email": f"{prefix}{index}@example.com",
+        "birth_date": "05/15/1990",
+    }).encode() for index in range(count)]
+
+
+def open_stores(directory, name):
+    """Point registrations at fresh SQLite files, closing the previous store"""
+    get_user_store().close()
+    set_uniqueness_index(open_uniqueness_index(os.path.join(directory, f"{name}-unique.db")))
+    set_user_store(open_user_store(os.path.join(directory, f"{name}-users.db")))
+
+
+def report(name, latencies, elapsed, lag=None):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    lag = f"{lag * 1e3:>10.2f} ms" if lag is not None else f"{'-':>13}"
+    print(f"{name:<12}{len(latencies) / elapsed:>10,.0f} req/s"
+          f"{statistics.median(latencies) * 1e3:>10.2f} ms{p99 * 1e3:>10.2f} ms{lag}")
+
+
+def run_flask(bodies, threads):
+    client = flask_app.test_client()
+
+    def one(body):
+        start = time.perf_counter()
+        response = client.post("/api/register", data=body, content_type="application/json")
+        assert response.status_code == 201
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, bodies))
+    report("flask", latencies, time.perf_counter() - start)
+
+
+async def run_asgi(name, bodies, concurrency):
+    scope = {
+        "type": "http", "method": "POST", "path": "/api/register",
+        "headers": [(b"content-type", b"application/json")],
+    }
+    semaphore = asyncio.Semaphore(concurrency)
+    done = False
+    lag = 0.0
+
+    async def ticker():
+        # How late a 1 ms timer fires while requests are being served
+        nonlocal lag
+        while not done:
+            due = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - due)
+
+    async def one(body):
+        async with semaphore:
+            start = time.perf_counter()
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            async def send(message):
+                sent.append(message)
+
+            await asgi_app(scope, receive, send)
+            assert sent[0]["status"] == 201
+            return time.perf_counter() - start
+
+    timer = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(body) for body in bodies))
+    elapsed = time.perf_counter() - start
+    done = True
+    await timer
+    report(name, list(latencies), elapsed, lag)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=16, help="Flask worker threads")
+    args = parser.parse_args()
+
+    print(f"requests: {args.requests}, concurrency: {args.concurrency}, "
+          f"flask threads: {args.threads}, stores: SQLite")
+    print(f"{'app':<12}{'throughput':>16}{'p50':>13}{'p99':>13}{'loop lag':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        open_stores(directory, "flask")
+        run_flask(payloads("flask", args.requests), min(args.threads, args.concurrency))
+
+        open_stores(directory, "asgi")
+        asyncio.run(run_asgi("asgi", payloads("asgi", args.requests), args.concurrency))
+
+        # The same app with the SQLite work left on the event loop
+        open_stores(directory, "inline")
+        blocking = Registrations.blocking
+        Registrations.blocking = property(lambda self: False)
+        try:
+            asyncio.run(run_asgi("asgi inline", payloads("inline", args.requests),
+                                 args.concurrency))
+        finally:
+            Registrations.blocking = blocking
+            get_user_store().close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: validate_registration_batch vs per-record validate_registration_data
+
+Usage:
+    python benchmarks/bench_batch.py [--records N] [--distinct-dates N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.validators import (  # noqa: E402
+    validate_registration_batch,
+    validate_registration_data,
+)
+
+
+def make_records(count, distinct_dates, seed=42):
+    """Generate registrations that are mostly valid, like real traffic"""
+    rng = random.Random(seed)
+    spellings = []
+    for _ in range(distinct_dates):
+        year, month, day = rng.randint(1930, 2015), rng.randint(1, 12), rng.randint(1, 28)
+        spellings.append(rng.choice([
+            f"{year:04d}-{month:02d}-{day:02d}",
+            f"{month:02d}/{day:02d}/{year:04d}",
+            f"{day:02d}/{month:02d}/{year:04d}",
+        ]))
+    spellings += ["not-a-date", "2999-01-01", "1850-01-01", ""]
+    return [
+        {
+            "username": "user%d" % i if rng.random() < 0.95 else "ab",
+            "email": "user%d@example.com" % i if rng.random() < 0.95 else "invalid-email",
+            "birth_date": rng.choice(spellings),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--distinct-dates", type=int, default=20000)
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.distinct_dates)
+    usernames = [r["username"] for r in records]
+    emails = [r["email"] for r in records]
+    birth_dates = [r["birth_date"] for r in records]
+
+    start = time.perf_counter()
+    for r in records:
+        validate_registration_data(r["username"], r["email"], r["birth_date"])
+    per_record = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validate_registration_batch(usernames, emails, birth_dates)
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validate_registration_batch(records=records)
+    batch_records = time.perf_counter() - start
+
+    scale = 1e6 / args.records
+    print(f"records: {args.records}, distinct dates: {args.distinct_dates}")
+    print(f"per-record        {per_record * scale:8.3f} us/record")
+    print(f"batch (columns)   {batch * scale:8.3f} us/record  {per_record / batch:5.1f}x")
+    print(f"batch (records)   {batch_records * scale:8.3f} us/record  {per_record / batch_records:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Microbenchmark: compiled date parser vs the original strptime format loop
+
+Usage:
+    python benchmarks/bench_date_parser.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.date_parser import DATE_FORMATS, parse_date  # noqa: E402
+
+CASES = {
+    "iso": "1990-05-15",
+    "us": "05/15/1990",
+    "european": "15/05/1990",
+    "invalid": "not-a-date",
+    "worst_case_miss": "31/31/1990",  # tries every format before failing
+}
+
+
+def strptime_loop(date_string):
+    """The original validate_birth_date parsing loop"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100000, help="calls per case")
+    args = parser.parse_args()
+
+    print(f"{'case':<18}{'strptime (us)':>15}{'compiled (us)':>15}{'speedup':>10}")
+    for name, value in CASES.items():
+        baseline = timeit.timeit(lambda: strptime_loop(value), number=args.number)
+        compiled = timeit.timeit(lambda: parse_date(value), number=args.number)
+        per_call = 1e6 / args.number
+        print(
+            f"{name:<18}{baseline * per_call:>15.3f}{compiled * per_call:>15.3f}"
+            f"{baseline / compiled:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: birth date validation by parsing, LRU cache and lookup table
+
+Usage:
+    python benchmarks/bench_date_table.py [--number N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src import validators  # noqa: E402
+from src.date_table import DateTable  # noqa: E402
+from src.metrics import metrics  # noqa: E402
+
+# Distinct valid dates in the mix; larger than the LRU cache holds
+DISTINCT = 100000
+
+
+def sample_dates(count: int):
+    rng = random.Random(42)
+    start = date(1920, 1, 1)
+    spellings = []
+    for _ in range(count):
+        day = start + timedelta(days=rng.randrange(30000))
+        spellings.append(rng.choice((
+            day.isoformat(),
+            day.strftime("%m/%d/%Y"),
+            f"{day.month}/{day.day}/{day.year}",
+        )))
+    return spellings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--metrics", action="store_true",
+                        help="keep format counters on; they cost more than a table lookup")
+    args = parser.parse_args()
+    metrics.enabled = args.metrics
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = DateTable(validators.MIN_BIRTH_YEAR)
+    table.extend_to(date.today().year)
+    table_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    start = time.perf_counter()
+    DateTable(validators.MIN_BIRTH_YEAR).extend_to(date.today().year)
+    build_seconds = time.perf_counter() - start
+    print(f"table: {len(table):,} spellings, {table_bytes / 1e6:.1f} MB, built in {build_seconds:.2f} s")
+
+    dates = sample_dates(DISTINCT)
+    check = validators.check_birth_date
+
+    def run():
+        for date_string in dates:
+            check(date_string)
+
+    modes = (
+        ("parse", validators.disable_birth_date_cache, validators.disable_date_table),
+        ("LRU cache", lambda: validators.enable_birth_date_cache(50000), validators.disable_date_table),
+        ("table", validators.disable_birth_date_cache, validators.enable_date_table),
+    )
+    baseline = None
+    print(f"{'mode':<12}{'us/date':>10}{'speedup':>10}")
+    for name, cache_setup, table_setup in modes:
+        cache_setup()
+        table_setup()
+        run()  # warm up
+        repeats = max(1, args.number // DISTINCT)
+        seconds = min(timeit.repeat(run, number=repeats, repeat=3)) / (repeats * DISTINCT)
+        baseline = baseline or seconds
+        print(f"{name:<12}{seconds * 1e6:>10.3f}{baseline / seconds:>9.1f}x")
+    validators.disable_date_table()
+    validators.disable_birth_date_cache()
+
+
+if __name__ == "__main__":
+    main()
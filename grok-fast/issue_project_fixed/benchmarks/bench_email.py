@@ -0,0 +1,77 @@
+"""
+Benchmark: email validator throughput vs the downstream cost of bad addresses
+
+The old check ("@" in email) lets malformed and disposable addresses
+through, and each one later costs a failed send. --send-cost-ms is that
+per-address cost (an SMTP attempt, bounce handling); the default is a
+conservative guess, pass your own figure.
+
+Usage:
+    python benchmarks/bench_email.py [--count N] [--bad-ratio R] [--send-cost-ms MS]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.email_validation import domain_cache_info, validate_email  # noqa: E402
+
+DOMAINS = ["example.com", "mail.example.org", "bücher.example", "uni.example.ac.uk"]
+OLD_CHECK = '"@" in email'
+BAD = [
+    "invalid-email", "user@localhost", "user@@example.com", "user@example..com",
+    "us er@example.com", ".user@example.com", "user@exa_mple.com", "x@mailinator.com",
+    "x@yopmail.com", "user@", "@example.com",
+]
+
+
+def make_emails(count, bad_ratio, seed=42):
+    """Mostly valid addresses over a few hundred domains, with junk mixed in"""
+    rng = random.Random(seed)
+    domains = [f"d{i}.{rng.choice(DOMAINS)}" for i in range(300)] + DOMAINS
+    emails = []
+    for i in range(count):
+        if rng.random() < bad_ratio:
+            emails.append(rng.choice(BAD))
+        else:
+            emails.append(f"user.{i}+tag@{rng.choice(domains)}")
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--bad-ratio", type=float, default=0.05)
+    parser.add_argument("--send-cost-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    emails = make_emails(args.count, args.bad_ratio)
+
+    start = time.perf_counter()
+    old_rejected = sum(1 for email in emails if "@" not in email)
+    old_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_rejected = sum(1 for email in emails if not validate_email(email)[0])
+    new_seconds = time.perf_counter() - start
+
+    extra_seconds = new_seconds - old_seconds
+    caught = new_rejected - old_rejected
+    saved_seconds = caught * args.send_cost_ms / 1000
+    print(f"{'check':<22}{'rejected':>10}{'us/address':>12}{'addresses/s':>14}")
+    print(f"{OLD_CHECK:<22}{old_rejected:>10}{old_seconds / len(emails) * 1e6:>12.3f}"
+          f"{len(emails) / old_seconds:>14,.0f}")
+    print(f"{'validate_email':<22}{new_rejected:>10}{new_seconds / len(emails) * 1e6:>12.3f}"
+          f"{len(emails) / new_seconds:>14,.0f}")
+    print(f"domain cache: {domain_cache_info()}")
+    print(f"bad addresses caught up front: {caught}")
+    print(f"validation cost added: {extra_seconds:.3f} s; downstream cost avoided at "
+          f"{args.send_cost_ms:g} ms/send: {saved_seconds:.1f} s "
+          f"({saved_seconds / extra_seconds:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark: rejected registrations, message payloads vs error codes
+
+Usage:
+    python benchmarks/bench_errors.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.registration import registration_response  # noqa: E402
+
+REJECTS = [
+    ("bad date", {"username": "benchuser", "email": "bench@example.com", "birth_date": "31/31/1990"}),
+    ("out of range", {"username": "benchuser", "email": "bench@example.com", "birth_date": "1850-01-01"}),
+    ("all fields bad", {"username": "ab", "email": "bench", "birth_date": "not-a-date"}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'reject':<16}{'messages (us)':>15}{'codes (us)':>12}{'messages (B)':>14}{'codes (B)':>11}")
+    for name, data in REJECTS:
+        timings, sizes = {}, {}
+        for codes in (False, True):
+            timings[codes] = min(timeit.repeat(
+                lambda: registration_response(data, codes=codes), number=args.number, repeat=3
+            )) * 1e6 / args.number
+            sizes[codes] = len(registration_response(data, codes=codes)[0])
+        print(f"{name:<16}{timings[False]:>15.3f}{timings[True]:>12.3f}"
+              f"{sizes[False]:>14}{sizes[True]:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: cost of rejecting /api/register requests by payload size
+
+Usage:
+    python benchmarks/bench_guard.py [--number N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.app import app, rate_limiter  # noqa: E402
+from src.guard import MAX_BODY_BYTES  # noqa: E402
+
+SIZES = (100, 1000, MAX_BODY_BYTES // 2, MAX_BODY_BYTES * 4, MAX_BODY_BYTES * 64)
+
+
+def payloads(size: int) -> dict:
+    """Rejected bodies of roughly size bytes, padded in the field that matters"""
+    pad = "x" * max(65, size - 80)
+    return {
+        "short username": {"username": "ab", "email": "a@b.com", "birth_date": "1990-01-01", "p": pad},
+        "email without @": {"username": "benchuser", "email": "bench" + pad, "birth_date": "1990-01-01"},
+        "long username": {"username": "u" + pad, "email": "a@b.com", "birth_date": "1990-01-01"},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    rate_limiter.enabled = False
+    client = app.test_client()
+    names = list(payloads(0))
+    print(f"{'bytes':>8}" + "".join(f"{name + ' (us)':>22}" for name in names))
+    for size in SIZES:
+        row = []
+        for name, data in payloads(size).items():
+            body = json.dumps(data).encode()
+
+            def post():
+                return client.post("/api/register", data=body, content_type="application/json")
+
+            assert post().status_code in (400, 413)
+            row.append(min(timeit.repeat(post, number=args.number, repeat=3)) * 1e6 / args.number)
+        print(f"{size:>8}" + "".join(f"{timing:>22.1f}" for timing in row))
+
+
+if __name__ == "__main__":
+    main()
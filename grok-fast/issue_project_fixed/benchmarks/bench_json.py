@@ -0,0 +1,54 @@
+"""
+Benchmark: /api/register JSON encode/decode, stdlib vs the fast provider
+
+Usage:
+    python benchmarks/bench_json.py [--number N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src import json_provider  # noqa: E402
+from src.json_provider import encode_response, loads  # noqa: E402
+from src.registration import encode_success, registration_success  # noqa: E402
+
+REQUEST = json.dumps({
+    "username": "benchuser", "email": "bench@example.com", "birth_date": "05/15/1990"
+}).encode()
+FAILURE = {
+    "success": False,
+    "message": "Registration data validation failed",
+    "errors": ["Invalid email format", "Birth date cannot be in the future"],
+}
+
+
+def stdlib_response(body):
+    return (json.dumps(body, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+    backend = "orjson" if json_provider.orjson is not None else "stdlib fallback"
+    print(f"fast provider backend: {backend}")
+
+    cases = [
+        ("decode request", lambda: json.loads(REQUEST), lambda: loads(REQUEST)),
+        ("encode failure", lambda: stdlib_response(FAILURE), lambda: encode_response(FAILURE)),
+        ("success body", lambda: stdlib_response(registration_success(12345)),
+         lambda: encode_success(12345)),
+    ]
+    print(f"{'case':<16}{'stdlib (us)':>13}{'fast (us)':>11}")
+    for name, baseline, fast in cases:
+        base = timeit.timeit(baseline, number=args.number) * 1e6 / args.number
+        quick = timeit.timeit(fast, number=args.number) * 1e6 / args.number
+        print(f"{name:<16}{base:>13.3f}{quick:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: cost of NFKC username normalization over raw len + casefold
+
+Usage:
+    python benchmarks/bench_normalize.py [--number N] [--unicode FRACTION]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.validators import fold_text, normalize_text  # noqa: E402
+
+# Distinct names in the mix
+DISTINCT = 20000
+
+
+def make_names(count: int, unicode_fraction: float):
+    rng = random.Random(42)
+    names = []
+    for index in range(count):
+        if rng.random() < unicode_fraction:
+            names.append(rng.choice(("josé", "ａｌｉ", "Müller", "élève")) + str(index))
+        else:
+            names.append(f"user{index}")
+    return names
+
+
+def normalized(text):
+    return len(normalize_text(text)), fold_text(text)
+
+
+def plain(text):
+    return len(text), text.casefold()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument("--unicode", type=float, default=0.05,
+                        help="fraction of non-ASCII names in the mix")
+    args = parser.parse_args()
+
+    names = make_names(DISTINCT, args.unicode)
+    print(f"{DISTINCT:,} names, {args.unicode:.0%} non-ASCII")
+    print(f"{'mode':<22}{'ns/name':>9}")
+    for label, function in (("raw len + casefold", plain), ("NFKC every name", normalized)):
+        def run():
+            for name in names:
+                function(name)
+        seconds = min(timeit.repeat(run, number=args.number, repeat=3)) / (args.number * DISTINCT)
+        print(f"{label:<22}{seconds * 1e9:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
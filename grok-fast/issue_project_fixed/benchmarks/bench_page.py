@@ -0,0 +1,47 @@
+"""
+Benchmark: GET / rendered per request vs pre-rendered and compressed
+
+Usage:
+    python benchmarks/bench_page.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flask import render_template  # noqa: E402
+
+from src.app import REGISTER_PAGE, app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    for encoding, body in REGISTER_PAGE.bodies.items():
+        print(f"{encoding:<10}{len(body):>8} bytes")
+
+    with app.test_request_context("/"):
+        rendered = min(timeit.repeat(
+            lambda: render_template("register.html"), number=args.number, repeat=3
+        )) * 1e6 / args.number
+    print(f"render_template per request  {rendered:>8.2f} us")
+    cached = min(timeit.repeat(
+        lambda: REGISTER_PAGE.respond("gzip, deflate, br"), number=args.number, repeat=3
+    )) * 1e6 / args.number
+    print(f"StaticPage.respond           {cached:>8.2f} us")
+
+    client = app.test_client()
+    for label, headers in (("identity", {}), ("gzip", {"Accept-Encoding": "gzip"}),
+                           ("304", {"If-None-Match": REGISTER_PAGE.etags["identity"]})):
+        seconds = min(timeit.repeat(
+            lambda: client.get("/", headers=headers), number=args.number // 5, repeat=3
+        )) * 1e6 / (args.number // 5)
+        print(f"GET / ({label}){'':<{20 - len(label)}}{seconds:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
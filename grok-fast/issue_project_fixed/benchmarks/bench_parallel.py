@@ -0,0 +1,58 @@
+"""
+Benchmark: ParallelValidator scaling from one worker up to the core count
+
+Usage:
+    python benchmarks/bench_parallel.py [--records N] [--chunk-size N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_batch import make_records  # noqa: E402
+from src.parallel import ParallelValidator  # noqa: E402
+
+
+def timed(workers, records, chunk_size):
+    """Time one full run, excluding pool start-up (pools are long-lived)"""
+    with ParallelValidator(workers, chunk_size) as validator:
+        validator.validate(records[:chunk_size * workers * 3])  # warm the pool
+        start = time.perf_counter()
+        validator.validate(records)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    # Distinct dates per record defeat the per-chunk date de-duplication,
+    # so this measures raw validation work
+    records = make_records(args.records, args.records)
+
+    # Small job: must not be slower than calling the validator inline
+    small = records[:args.chunk_size]
+    start = time.perf_counter()
+    with ParallelValidator(cores, args.chunk_size) as validator:
+        validator.validate(small)
+    print(f"small job ({len(small)} records, inline): {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    baseline = None
+    print(f"{'workers':>8}{'seconds':>10}{'records/s':>14}{'speedup':>9}")
+    workers = 1
+    while True:
+        elapsed = timed(workers, records, args.chunk_size)
+        baseline = baseline or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{args.records / elapsed:>14,.0f}{baseline / elapsed:>8.2f}x")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: latency the rate limiter adds per request
+
+Usage:
+    python benchmarks/bench_rate_limit.py [--number N] [--clients N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.app import app, rate_limiter  # noqa: E402
+from src.rate_limit import RateLimiter, SharedBucketTable  # noqa: E402
+from src.registration import set_uniqueness_index  # noqa: E402
+
+# Rejected by the guard, so the request itself is cheap and constant
+BODY = b'{"username": "ab"}'
+UNLIMITED = 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=10000, help="distinct client addresses")
+    args = parser.parse_args()
+
+    addresses = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in (("anonymous map", None), ("shared file", os.path.join(directory, "rl"))):
+            limiter = RateLimiter(SharedBucketTable(path), UNLIMITED, UNLIMITED, UNLIMITED, UNLIMITED)
+            i = iter(range(10 ** 9))
+            seconds = min(timeit.repeat(
+                lambda: limiter.check(addresses[next(i) % args.clients]),
+                number=args.number, repeat=3,
+            ))
+            print(f"check() {name:<16}{seconds * 1e6 / args.number:>10.2f} us")
+            limiter.table.close()
+
+    # End to end through the middleware, limits high enough never to trigger
+    set_uniqueness_index(None)
+    client = app.test_client()
+    rate_limiter.ip_rate = rate_limiter.ip_burst = UNLIMITED
+    rate_limiter.subnet_rate = rate_limiter.subnet_burst = UNLIMITED
+    timings = {}
+    for enabled in (False, True):
+        rate_limiter.enabled = enabled
+        timings[enabled] = min(timeit.repeat(
+            lambda: client.post("/api/register", data=BODY, content_type="application/json"),
+            number=args.number // 10, repeat=3,
+        )) * 1e6 / (args.number // 10)
+    print(f"POST /api/register without limiter{timings[False]:>10.1f} us")
+    print(f"POST /api/register with limiter   {timings[True]:>10.1f} us")
+    print(f"added per request                 {timings[True] - timings[False]:>10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
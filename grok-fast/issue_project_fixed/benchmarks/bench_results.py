@@ -0,0 +1,79 @@
+"""
+Benchmark: memory and GC cost of dict vs slotted validation results
+
+Usage:
+    python benchmarks/bench_results.py [--records N] [--invalid FRACTION]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.metrics import metrics  # noqa: E402
+from src.validators import registration_errors, validate_registration_data  # noqa: E402
+
+
+def dict_result(username, email, birth_date, locale=None):
+    """The dict-returning validate_registration_data this replaced"""
+    errors = [error.message for error in registration_errors(username, email, birth_date, locale)]
+    return {
+        "valid": len(errors) == 0,
+        "errors": errors
+    }
+
+
+def make_records(count: int, invalid: float):
+    rng = random.Random(42)
+    records = []
+    for index in range(count):
+        if rng.random() < invalid:
+            records.append(("ab", f"user{index}@example.com", "not-a-date"))
+        else:
+            records.append((f"user{index}", f"user{index}@example.com", "1990-05-15"))
+    return records
+
+
+def measure(validate, records):
+    """Bytes retained per result, peak bytes per record and gen-0 collections"""
+    gc.collect()
+    collections = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    results = [validate(*record) for record in records]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc_runs = gc.get_stats()[0]["collections"] - collections
+
+    start = time.perf_counter()
+    for record in records:
+        validate(*record)
+    seconds = time.perf_counter() - start
+    del results
+    count = len(records)
+    return (current - base) / count, (peak - base) / count, gc_runs, seconds / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--invalid", type=float, default=0.1,
+                        help="fraction of invalid records in the mix")
+    args = parser.parse_args()
+    metrics.enabled = False
+
+    records = make_records(args.records, args.invalid)
+    validate_registration_data(*records[0])  # warm caches before tracing
+    print(f"{args.records:,} records, {args.invalid:.0%} invalid; results kept in a list")
+    print(f"{'result':<10}{'bytes/rec':>11}{'peak/rec':>10}{'gen0 GCs':>10}{'us/rec':>8}")
+    for name, validate in (("dict", dict_result), ("slotted", validate_registration_data)):
+        retained, peak, gc_runs, seconds = measure(validate, records)
+        print(f"{name:<10}{retained:>11.1f}{peak:>10.1f}{gc_runs:>10}{seconds * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: hand-written registration rules against the compiled schema
+
+Usage:
+    python benchmarks/bench_schema.py [--number N]
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.email_validation import check_email  # noqa: E402
+from src.errors import USERNAME_TOO_LONG_ERROR, USERNAME_TOO_SHORT_ERROR  # noqa: E402
+from src.metrics import metrics  # noqa: E402
+from src.schema import DEFAULT_SCHEMA_PATH, load_schema  # noqa: E402
+from src.validators import check_birth_date, normalize_text  # noqa: E402
+
+PAYLOADS = [
+    {"username": "alice", "email": "alice@example.com", "birth_date": "1990-05-15"},
+    {"username": "ab", "email": "bad", "birth_date": "not-a-date"},
+    {"username": "a" * 65, "email": "user@mailinator.com", "birth_date": "05/06/1990"},
+    {"username": None, "email": 5, "birth_date": ""},
+]
+
+
+def registration_errors(username, email, birth_date, locale=None):
+    """The hand-written rules the default schema replaced"""
+    errors = []
+    length = len(normalize_text(username)) if isinstance(username, str) else -1
+    if length < 3:
+        errors.append(USERNAME_TOO_SHORT_ERROR)
+    elif length > 64:
+        errors.append(USERNAME_TOO_LONG_ERROR)
+    for error in (check_email(email), check_birth_date(birth_date, locale)):
+        if error is not None:
+            errors.append(error)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=50000)
+    args = parser.parse_args()
+    metrics.enabled = False
+
+    start = time.perf_counter()
+    validate = load_schema(DEFAULT_SCHEMA_PATH)
+    print(f"schema compiled in {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    def hand_written():
+        for data in PAYLOADS:
+            registration_errors(data.get("username", ""), data.get("email", ""),
+                                data.get("birth_date", ""))
+
+    def compiled():
+        for data in PAYLOADS:
+            validate(data)
+
+    baseline = None
+    print(f"{'rules':<14}{'us/payload':>12}{'relative':>10}")
+    for name, run in (("hand-written", hand_written), ("compiled", compiled)):
+        seconds = min(timeit.repeat(run, number=args.number, repeat=3)) / (args.number * len(PAYLOADS))
+        baseline = baseline or seconds
+        print(f"{name:<14}{seconds * 1e6:>12.3f}{baseline / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
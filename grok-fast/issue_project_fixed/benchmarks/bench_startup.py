@@ -0,0 +1,92 @@
+"""
+Benchmark: worker cold start - import time report and first-request latency
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--top N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Run in a fresh interpreter per sample: build the app as a server would,
+# then time two registrations that warm_up() did not send verbatim
+_PROBE = """
+import json, time
+start = time.perf_counter()
+from src.app import create_app
+app = create_app()
+ready = time.perf_counter()
+client = app.test_client()
+timings = []
+for name in ("coldstart1", "coldstart2"):
+    sent = time.perf_counter()
+    client.post("/api/register", headers={"Accept-Language": "fr-FR"},
+                json={"username": name, "email": name + "@example.org", "birth_date": "04/07/1985"})
+    timings.append(time.perf_counter() - sent)
+print(json.dumps({"startup": ready - start, "first": timings[0], "second": timings[1]}))
+"""
+
+
+def _env(warm_up: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT, WARM_UP="on" if warm_up else "off")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_times(warm_up: bool = False):
+    """(self_us, cumulative_us, depth, module) rows from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.app"],
+        cwd=ROOT, env=_env(warm_up), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def probe(warm_up: bool, runs: int) -> dict:
+    """Median startup and first/second request latency over fresh processes"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            cwd=ROOT, env=_env(warm_up), capture_output=True, text=True, check=True,
+        )
+        samples.append(json.loads(result.stdout))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode")
+    parser.add_argument("--top", type=int, default=15, help="modules listed in the report")
+    args = parser.parse_args()
+
+    rows = import_times()
+    total = max(cumulative for _, cumulative, _, _ in rows)
+    own = sum(self_us for self_us, _, _, name in rows if name.split(".")[0] == "src")
+    print(f"import src.app: {total / 1e3:.1f} ms, of which src.* modules {own / 1e3:.1f} ms (self)")
+    print(f"{'cumulative ms':>14}{'self ms':>9}  module")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"{cumulative_us / 1e3:>14.1f}{self_us / 1e3:>9.1f}  {'  ' * depth}{name}")
+
+    print()
+    print(f"{'mode':<10}{'startup ms':>12}{'1st req ms':>12}{'2nd req ms':>12}")
+    for label, warm_up in (("cold", False), ("warm-up", True)):
+        result = probe(warm_up, args.runs)
+        print(f"{label:<10}{result['startup'] * 1e3:>12.1f}"
+              f"{result['first'] * 1e3:>12.2f}{result['second'] * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: user inserts/s, write-behind batching vs one transaction per request
+
+Usage:
+    python benchmarks/bench_user_store.py [--users N] [--threads N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.user_store import SQLiteUserStore  # noqa: E402
+
+
+def run(store, users, threads):
+    """Register users from a thread pool, then wait until all are durable"""
+    def register(i):
+        return store.add(f"user{i}", f"user{i}@example.com", "1990-05-15")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(register, range(users), chunksize=64))
+    store.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'mode':<28}{'seconds':>9}{'inserts/s':>12}{'transactions':>14}")
+    for name, options in (
+        ("transaction per request", {"write_behind": False}),
+        ("write-behind batches", {"write_behind": True}),
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteUserStore(os.path.join(tmp, "users.db"), **options)
+            elapsed = run(store, args.users, args.threads)
+            assert store.count() == args.users
+            transactions = store.batches_written
+            store.close()
+        print(f"{name:<28}{elapsed:>9.3f}{args.users / elapsed:>12,.0f}{transactions:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: NumPy-vectorized birth date validation vs a Python loop
+
+Usage:
+    python benchmarks/bench_vectorized.py [--rows N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.validators import validate_birth_date  # noqa: E402
+from src.vectorized import HAS_NUMPY, validate_birth_dates  # noqa: E402
+
+
+def make_dates(rows, seed=42):
+    """Zero-padded dates in all three formats plus a few rejects"""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(rows):
+        year, month, day = rng.randint(1890, 2030), rng.randint(1, 12), rng.randint(1, 28)
+        values.append(rng.choice([
+            f"{year:04d}-{month:02d}-{day:02d}",
+            f"{month:02d}/{day:02d}/{year:04d}",
+            f"{day:02d}/{month:02d}/{year:04d}",
+            "not-a-date",
+        ]))
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    if not HAS_NUMPY:
+        print("NumPy is not installed; validate_birth_dates uses the Python fallback")
+
+    values = make_dates(args.rows)
+
+    start = time.perf_counter()
+    [validate_birth_date(value)[0] for value in values]
+    loop = time.perf_counter() - start
+
+    if HAS_NUMPY:
+        import numpy as np
+        values = np.array(values)
+    start = time.perf_counter()
+    validate_birth_dates(values)
+    vectorized = time.perf_counter() - start
+
+    scale = 1e9 / args.rows
+    print(f"rows: {args.rows}")
+    print(f"python loop   {loop * scale:8.1f} ns/row")
+    print(f"vectorized    {vectorized * scale:8.1f} ns/row  {loop / vectorized:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
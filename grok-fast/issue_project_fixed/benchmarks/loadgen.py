@@ -0,0 +1,197 @@
+"""
+Load generator for the registration API
+
+Replays the request mix from data/sample_requests.json at a target rate,
+with a per-request suffix on usernames and emails so they stay unique,
+either in-process through app.test_client() or against a running server,
+and reports throughput and latency percentiles. Latency is measured from
+each request's scheduled send time, so a server that falls behind is not
+hidden by the generator slowing down (no coordinated omission).
+
+Usage:
+    python benchmarks/loadgen.py --rps 500 --duration 10 --output results.json
+    python benchmarks/loadgen.py --url http://127.0.0.1:5000 --rps 200 --concurrency 32
+    python benchmarks/loadgen.py --rps 500 --compare results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+SAMPLE_FILE = os.path.join(ROOT, "data", "sample_requests.json")
+
+
+def load_mix(path=SAMPLE_FILE):
+    """Request bodies from the sample file's test cases"""
+    with open(path, encoding="utf-8") as f:
+        cases = json.load(f)["test_cases"]
+    return [case["request"] for case in cases]
+
+
+def unique_body(request, index):
+    """Encode a request with its username and email made unique by index"""
+    body = dict(request)
+    if isinstance(body.get("username"), str) and body["username"]:
+        body["username"] += str(index)
+    email = body.get("email")
+    if isinstance(email, str) and "@" in email:
+        body["email"] = email.replace("@", f"+{index}@", 1)
+    return json.dumps(body).encode()
+
+
+def in_process_sender():
+    from src.app import app, rate_limiter
+
+    # Every request comes from the same address
+    rate_limiter.enabled = False
+    client = app.test_client()
+
+    def send(body):
+        return client.post("/api/register", data=body, content_type="application/json").status_code
+    return send
+
+
+def http_sender(url):
+    endpoint = url.rstrip("/") + "/api/register"
+
+    def send(body):
+        request = urllib.request.Request(
+            endpoint, data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+    return send
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(send, requests, rps, duration, concurrency):
+    """Send requests on an open-loop schedule and collect latencies"""
+    total = int(rps * duration)
+    interval = 1.0 / rps
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def one(index, request):
+        body = unique_body(request, index)
+        scheduled = start + index * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            status = send(body)
+        except OSError:
+            status = "error"
+        latency = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(latency)
+            statuses[status] += 1
+
+    mix = itertools.cycle(requests)
+    if concurrency <= 1:
+        for index in range(total):
+            one(index, next(mix))
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for index in range(total):
+                pool.submit(one, index, next(mix))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "elapsed_seconds": elapsed,
+        "target_rps": rps,
+        "achieved_rps": total / elapsed if elapsed else 0.0,
+        "status_counts": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1e3,
+            "p95": percentile(latencies, 0.95) * 1e3,
+            "p99": percentile(latencies, 0.99) * 1e3,
+            "max": (latencies[-1] if latencies else 0.0) * 1e3,
+            "mean": (sum(latencies) / len(latencies) if latencies else 0.0) * 1e3,
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result, baseline=None):
+    latency = result["latency_ms"]
+    print(f"target {result['target_rps']:.0f} req/s, achieved {result['achieved_rps']:.1f} req/s"
+          f" over {result['requests']} requests")
+    print(f"status codes: {result['status_counts']}")
+    for key in ("p50", "p95", "p99", "max"):
+        line = f"  {key:<4}{latency[key]:>10.3f} ms"
+        if baseline is not None:
+            before = baseline["latency_ms"][key]
+            change = (latency[key] - before) / before * 100 if before else 0.0
+            line += f"   (was {before:.3f} ms, {change:+.1f}%)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="running server; default drives app.test_client()")
+    parser.add_argument("--rps", type=float, default=200.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="sender threads (in-process mode is best left at 1)")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    send = http_sender(args.url) if args.url else in_process_sender()
+    result = run(send, load_mix(), args.rps, args.duration, args.concurrency)
+    result.update({
+        "target": args.url or "in-process",
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    })
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
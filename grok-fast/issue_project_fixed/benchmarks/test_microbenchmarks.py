@@ -0,0 +1,55 @@
+"""
+Validator microbenchmarks (pytest-benchmark)
+
+Usage:
+    pytest benchmarks/test_microbenchmarks.py
+    pytest benchmarks/test_microbenchmarks.py --benchmark-autosave
+    pytest-benchmark compare 0001 0002
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.validators import (  # noqa: E402
+    disable_birth_date_cache,
+    enable_birth_date_cache,
+    validate_birth_date,
+    validate_registration_data,
+)
+
+DATE_CASES = {
+    "iso": "1990-05-15",
+    "us": "05/15/1990",
+    "european": "15/05/1990",
+    "unpadded": "5/1/1990",
+    "invalid_shape": "not-a-date",
+    "future": "2999-01-01",
+    "out_of_range": "1850-01-01",
+    # Matches the slash shape, fails US and European: every candidate tried
+    "worst_case_miss": "31/31/1990",
+}
+
+
+@pytest.mark.parametrize("case", list(DATE_CASES))
+def test_validate_birth_date(benchmark, case):
+    value = DATE_CASES[case]
+    expected = validate_birth_date(value)
+    assert benchmark(validate_birth_date, value) == expected
+
+
+def test_validate_birth_date_cached(benchmark):
+    enable_birth_date_cache()
+    try:
+        validate_birth_date("05/15/1990")
+        assert benchmark(validate_birth_date, "05/15/1990")[0] is True
+    finally:
+        disable_birth_date_cache()
+
+
+@pytest.mark.parametrize("record", [
+    ("testuser", "test@example.com", "1990-05-15"),
+    ("ab", "invalid-email", "not-a-date"),
+], ids=["valid", "all_invalid"])
+def test_validate_registration_data(benchmark, record):
+    result = benchmark(validate_registration_data, *record)
+    assert result["valid"] is (record[0] == "testuser")
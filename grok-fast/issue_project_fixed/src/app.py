@@ -1,23 +1,85 @@
 """
 Flask Application - User Registration API
 """
-from flask import Flask, request, jsonify, render_template
+import os
+from functools import partial
+from flask import Flask, Response, request, jsonify, stream_with_context
+from time import perf_counter
+from typing import Optional
+
 try:
-    from src.validators import validate_registration_data
+    from src.json_provider import FastJSONProvider, encode_response
+    from src.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
+    from src.guard import BATCH_MAX_BODY_BYTES, BATCH_MAX_RECORDS, MAX_BODY_BYTES
+    from src.page import static_page
+    from src.rate_limit import TOO_MANY_REQUESTS, RateLimitMiddleware, open_rate_limiter, retry_after
+    from src.registration import (
+        NDJSON_MIMETYPES,
+        REQUEST_TOO_LARGE,
+        Registrations,
+        default_registrations,
+        wants_codes,
+    )
 except ImportError:
-    from validators import validate_registration_data
+    from json_provider import FastJSONProvider, encode_response
+    from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
+    from guard import BATCH_MAX_BODY_BYTES, BATCH_MAX_RECORDS, MAX_BODY_BYTES
+    from page import static_page
+    from rate_limit import TOO_MANY_REQUESTS, RateLimitMiddleware, open_rate_limiter, retry_after
+    from registration import (
+        NDJSON_MIMETYPES,
+        REQUEST_TOO_LARGE,
+        Registrations,
+        default_registrations,
+        wants_codes,
+    )
+
+HEALTH_BODY = encode_response({"status": "ok"})
+TOO_LARGE_BODY = encode_response(REQUEST_TOO_LARGE)
+
+# Endpoints throttled per IP and per subnet
+RATE_LIMITED_PATHS = ("/api/register", "/api/register/batch")
+
+REGISTER_TEMPLATE = "register.html"
+
+
+def default_config() -> dict:
+    """
+    Settings create_app() starts from
+    
+    The request limits keep one request from pinning a worker. Set
+    RATE_LIMIT_FILE so that all workers share one rate-limit table,
+    RATE_LIMIT=off to turn limiting off and WARM_UP=off to skip warm_up().
+    USER_DB, UNIQUENESS_DB and REGISTRATION_SCHEMA are the SQLite files and
+    schema file the app's Registrations open (see Registrations).
+    """
+    return {
+        "REGISTER_MAX_BODY_BYTES": MAX_BODY_BYTES,
+        "BATCH_MAX_RECORDS": BATCH_MAX_RECORDS,
+        "BATCH_MAX_BODY_BYTES": BATCH_MAX_BODY_BYTES,
+        "USER_DB": os.environ.get("USER_DB"),
+        "UNIQUENESS_DB": os.environ.get("UNIQUENESS_DB"),
+        "REGISTRATION_SCHEMA": os.environ.get("REGISTRATION_SCHEMA"),
+        "RATE_LIMIT_FILE": os.environ.get("RATE_LIMIT_FILE"),
+        "RATE_LIMIT_ENABLED": os.environ.get("RATE_LIMIT") != "off",
+        "WARM_UP": os.environ.get("WARM_UP") != "off",
+    }
+
 
-app = Flask(__name__)
+class PayloadTooLarge(Exception):
+    """Streamed request body exceeded the configured size limit"""
+    pass
 
 
-@app.route("/")
-def index():
-    """Render registration page"""
-    return render_template("register.html")
+def index(app: Flask):
+    """Registration page, negotiated by Accept-Encoding and If-None-Match"""
+    status, headers, body = static_page(REGISTER_TEMPLATE).respond(
+        request.headers.get("Accept-Encoding"), request.headers.get("If-None-Match")
+    )
+    return app.response_class(body, status=status, headers=headers)
 
 
-@app.route("/api/register", methods=["POST"])
-def register():
+def register(app: Flask):
     """
     User registration API endpoint
     
@@ -27,42 +89,231 @@ def register():
         "email": "string",
         "birth_date": "YYYY-MM-DD"
     }
+    
+    ?errors=codes reports validation errors as codes instead of messages.
+    
+    Bodies over REGISTER_MAX_BODY_BYTES are refused with 413 without being
+    read in full, so a reject costs the same whatever the payload size.
     """
-    data = request.get_json()
+    max_bytes = app.config["REGISTER_MAX_BODY_BYTES"]
+    if request.content_length is not None and request.content_length > max_bytes:
+        return app.response_class(TOO_LARGE_BODY, status=413, mimetype="application/json")
+    if not request.is_json:
+        request.on_json_loading_failed(None)  # 415, as request.get_json() would
     
-    if not data:
-        return jsonify({
-            "success": False,
-            "message": "Invalid request data"
-        }), 400
+    start = perf_counter()
+    raw = request.stream.read(max_bytes + 1)
+    if len(raw) > max_bytes:
+        return app.response_class(TOO_LARGE_BODY, status=413, mimetype="application/json")
+    try:
+        data = app.json.loads(raw)
+    except ValueError as exc:
+        request.on_json_loading_failed(exc)
+    if metrics.enabled:
+        metrics.observe("registration_stage_seconds", "parse", perf_counter() - start)
+    # Accept-Language decides how ambiguous dates like 05/06/1990 are read
+    body, status = app.extensions["registrations"].response(
+        data, request.headers.get("Accept-Language"), wants_codes(request.args.get("errors"))
+    )
+    return app.response_class(body, status=status, mimetype="application/json")
+
+
+def _iter_ndjson_records(app: Flask, stream, max_bytes: int):
+    """Yield decoded NDJSON lines, raising PayloadTooLarge past max_bytes"""
+    consumed = 0
+    while True:
+        # Never read more than one byte past the limit, even for one long line
+        line = stream.readline(max_bytes - consumed + 1)
+        if not line:
+            return
+        consumed += len(line)
+        if consumed > max_bytes:
+            raise PayloadTooLarge("Request body too large")
+        if not line.strip():
+            continue
+        try:
+            yield app.json.loads(line)
+        except ValueError:
+            yield None
+
+
+def register_batch(app: Flask):
+    """
+    Bulk registration API endpoint
     
-    username = data.get("username", "")
-    email = data.get("email", "")
-    birth_date = data.get("birth_date", "")
+    Accepts a JSON array of registration objects, or one object per line
+    with an NDJSON content type. Results are streamed back as NDJSON, one
+    line per record in input order:
+    {"index": 0, "status": 201, "success": true, ...}
     
-    # Validate data
-    validation_result = validate_registration_data(username, email, birth_date)
+    Every record past the first costs the client a rate-limit token, as a
+    request of its own would. Once the client is out of tokens the
+    remaining records are not registered and get a status 429 line.
+    """
+    max_records = app.config["BATCH_MAX_RECORDS"]
+    max_bytes = app.config["BATCH_MAX_BODY_BYTES"]
     
-    if not validation_result["valid"]:
+    if request.content_length is not None and request.content_length > max_bytes:
         return jsonify({
             "success": False,
-            "message": "Registration data validation failed",
-            "errors": validation_result["errors"]
-        }), 400
+            "message": "Request body too large"
+        }), 413
+    
+    if request.mimetype in NDJSON_MIMETYPES:
+        # Decode lazily so the body is never buffered as a whole
+        records = _iter_ndjson_records(app, request.stream, max_bytes)
+    else:
+        body = request.stream.read(max_bytes + 1)
+        if len(body) > max_bytes:
+            return jsonify({
+                "success": False,
+                "message": "Request body too large"
+            }), 413
+        try:
+            records = app.json.loads(body)
+        except ValueError:
+            records = None
+        if not isinstance(records, list):
+            return jsonify({
+                "success": False,
+                "message": "Invalid request data"
+            }), 400
+        if len(records) > max_records:
+            return jsonify({
+                "success": False,
+                "message": "Batch size limit exceeded",
+                "max_records": max_records
+            }), 413
+    
+    locale = request.headers.get("Accept-Language")
+    codes = wants_codes(request.args.get("errors"))
+    outcome = app.extensions["registrations"].outcome
+    limiter = app.extensions["rate_limiter"]
+    address = request.environ.get("REMOTE_ADDR") or ""
+    
+    def generate():
+        wait = 0.0
+        try:
+            for index, data in enumerate(records):
+                if index >= max_records:
+                    yield app.json.dumps({
+                        "success": False,
+                        "message": "Batch size limit exceeded",
+                        "max_records": max_records
+                    }) + "\n"
+                    return
+                # The request itself paid for the first record
+                if index and not wait and limiter.enabled:
+                    wait = limiter.check(address)
+                if wait:
+                    yield app.json.dumps(dict(
+                        TOO_MANY_REQUESTS, index=index, status=429, retry_after=retry_after(wait)
+                    )) + "\n"
+                    continue
+                body, status = outcome(data, locale, codes)
+                yield app.json.dumps(dict(body, index=index, status=status)) + "\n"
+        except PayloadTooLarge as exc:
+            yield app.json.dumps({"success": False, "message": str(exc)}) + "\n"
     
-    # Simulate successful registration
-    return jsonify({
-        "success": True,
-        "message": "Registration successful!",
-        "user_id": 12345
-    }), 201
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
-@app.route("/api/health", methods=["GET"])
-def health():
+def health(app: Flask):
     """Health check endpoint"""
-    return jsonify({"status": "ok"})
+    return app.response_class(HEALTH_BODY, mimetype="application/json")
+
+
+def metrics_endpoint(app: Flask):
+    """Prometheus-style metrics for this worker"""
+    return app.response_class(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+ROUTES = (
+    ("/", index, ("GET",)),
+    ("/api/register", register, ("POST",)),
+    ("/api/register/batch", register_batch, ("POST",)),
+    ("/api/health", health, ("GET",)),
+    ("/api/metrics", metrics_endpoint, ("GET",)),
+)
+
+
+def create_app(config: Optional[dict] = None,
+               registrations: Optional[Registrations] = None) -> Flask:
+    """
+    Build the registration app
+    
+    Views get the app passed in rather than looking it up through
+    current_app. Unless WARM_UP is off, the app is warmed up before it is
+    returned, so a worker serves its first request with warm caches.
+    
+    Args:
+        config: Settings overriding default_config()
+        registrations: Rules, index and store to register users with;
+            by default new ones from USER_DB, UNIQUENESS_DB and
+            REGISTRATION_SCHEMA
+        
+    Returns:
+        Configured Flask app; its rate limiter is app.extensions["rate_limiter"]
+        and its Registrations app.extensions["registrations"]
+    """
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config.update(default_config())
+    if config:
+        app.config.update(config)
+    
+    for rule, view, methods in ROUTES:
+        app.add_url_rule(rule, view.__name__, partial(view, app), methods=methods)
+    
+    if registrations is None:
+        # Opened on first use, in the worker that uses them
+        registrations = Registrations(
+            user_db=app.config["USER_DB"],
+            uniqueness_db=app.config["UNIQUENESS_DB"],
+            schema_path=app.config["REGISTRATION_SCHEMA"],
+        )
+    app.extensions["registrations"] = registrations
+    
+    limiter = open_rate_limiter(
+        app.config["RATE_LIMIT_FILE"], enabled=app.config["RATE_LIMIT_ENABLED"]
+    )
+    app.extensions["rate_limiter"] = limiter
+    app.wsgi_app = RateLimitMiddleware(app.wsgi_app, limiter, RATE_LIMITED_PATHS)
+    
+    if app.config["WARM_UP"]:
+        warm_up_app(app)
+    return app
+
+
+def warm_up_app(app: Flask) -> None:
+    """
+    Prime an app before it takes traffic
+    
+    Renders and compresses the registration page, primes the validation
+    path (see registration.warm_up) and sends one request through Flask's
+    routing and response machinery.
+    """
+    static_page(REGISTER_TEMPLATE)
+    app.extensions["registrations"].warm_up()
+    app.test_client().get("/api/health")
+
+
+# Module-level app over the module-level registration functions' stores
+# (see registration.default_registrations). Importing it does no warm-up;
+# servers should load create_app() (gunicorn "src.app:create_app()"),
+# which does
+app = create_app({"WARM_UP": False}, default_registrations())
+rate_limiter = app.extensions["rate_limiter"]
+
+
+def __getattr__(name: str):
+    # The page is only built when first needed (or by warm_up_app)
+    if name == "REGISTER_PAGE":
+        return static_page(REGISTER_TEMPLATE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
+    if default_config()["WARM_UP"]:
+        warm_up_app(app)
     app.run(debug=True, port=5000)
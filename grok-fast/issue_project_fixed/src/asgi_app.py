@@ -0,0 +1,361 @@
+"""
+ASGI Application - User Registration API
+Async flavor of src/app.py for high-concurrency deployments
+
+Serves the same routes with the same response bodies and status codes,
+rate limits included:
+    uvicorn src.asgi_app:app --workers 4
+
+Unlike the Flask app, /api/register/batch reads the whole body (up to
+BATCH_MAX_BODY_BYTES) and sends its NDJSON results in one piece rather
+than streaming them. Registrations that write to SQLite, and every batch,
+run in the default thread pool so the event loop keeps serving.
+"""
+import asyncio
+import os
+from functools import partial
+from time import perf_counter
+from urllib.parse import parse_qs
+from typing import Callable, Dict, List, Optional, Tuple
+
+from werkzeug.exceptions import (
+    BadRequest,
+    HTTPException,
+    MethodNotAllowed,
+    NotFound,
+    UnsupportedMediaType,
+)
+
+try:
+    from src.guard import BATCH_MAX_BODY_BYTES, BATCH_MAX_RECORDS, MAX_BODY_BYTES
+    from src.json_provider import encode_response, loads
+    from src.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
+    from src.page import static_page
+    from src.rate_limit import (
+        TOO_MANY_REQUESTS,
+        TOO_MANY_REQUESTS_BODY,
+        open_rate_limiter,
+        retry_after,
+    )
+    from src.registration import (
+        INVALID_REQUEST,
+        NDJSON_MIMETYPES,
+        REQUEST_TOO_LARGE,
+        default_registrations,
+        registration_outcome,
+        registration_response,
+        wants_codes,
+        warm_up,
+    )
+except ImportError:
+    from guard import BATCH_MAX_BODY_BYTES, BATCH_MAX_RECORDS, MAX_BODY_BYTES
+    from json_provider import encode_response, loads
+    from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
+    from page import static_page
+    from rate_limit import (
+        TOO_MANY_REQUESTS,
+        TOO_MANY_REQUESTS_BODY,
+        open_rate_limiter,
+        retry_after,
+    )
+    from registration import (
+        INVALID_REQUEST,
+        NDJSON_MIMETYPES,
+        REQUEST_TOO_LARGE,
+        default_registrations,
+        registration_outcome,
+        registration_response,
+        wants_codes,
+        warm_up,
+    )
+
+JSON_CONTENT_TYPE = b"application/json"
+HTML_CONTENT_TYPE = b"text/html; charset=utf-8"
+
+Headers = List[Tuple[bytes, bytes]]
+Response = Tuple[int, Headers, bytes]
+
+HEALTH_BODY = encode_response({"status": "ok"})
+TOO_LARGE_BODY = encode_response(REQUEST_TOO_LARGE)
+INVALID_REQUEST_BODY = encode_response(INVALID_REQUEST)
+BATCH_TOO_LARGE = {
+    "success": False,
+    "message": "Batch size limit exceeded",
+    "max_records": BATCH_MAX_RECORDS
+}
+
+# Endpoints throttled per IP and per subnet, as in src.app
+RATE_LIMITED_PATHS = frozenset(("/api/register", "/api/register/batch"))
+
+# Same settings as the Flask app's default_config()
+rate_limiter = open_rate_limiter(
+    os.environ.get("RATE_LIMIT_FILE"), enabled=os.environ.get("RATE_LIMIT") != "off"
+)
+
+
+def _json_response(body: bytes, status: int = 200) -> Response:
+    """Wrap an already encoded JSON body"""
+    return status, [(b"content-type", JSON_CONTENT_TYPE)], body
+
+
+def _error_response(exc: HTTPException) -> Response:
+    """Render an HTTP error the way Flask/Werkzeug does"""
+    headers = [(b"content-type", HTML_CONTENT_TYPE)]
+    if isinstance(exc, MethodNotAllowed) and exc.valid_methods:
+        headers.append((b"allow", ", ".join(exc.valid_methods).encode()))
+    return exc.code, headers, exc.get_body().encode()
+
+
+def _is_json(content_type: str) -> bool:
+    """Same rule as werkzeug's Request.is_json"""
+    mimetype = content_type.split(";", 1)[0].strip().lower()
+    return mimetype == "application/json" or (
+        mimetype.startswith("application/") and mimetype.endswith("+json")
+    )
+
+
+# The registration page is static: rendered and compressed once, at
+# startup or on first use
+REGISTER_TEMPLATE = "register.html"
+
+# StaticPage header lists -> the same headers as ASGI byte pairs
+_raw_headers: Dict[int, Headers] = {}
+
+
+async def index(scope: dict, body: bytes) -> Response:
+    """Registration page (see src.app.index)"""
+    headers = dict(scope.get("headers") or [])
+    accept_encoding = headers.get(b"accept-encoding")
+    if_none_match = headers.get(b"if-none-match")
+    status, page_headers, page = static_page(REGISTER_TEMPLATE).respond(
+        accept_encoding and accept_encoding.decode("latin-1"),
+        if_none_match and if_none_match.decode("latin-1"),
+    )
+    raw = _raw_headers.get(id(page_headers))
+    if raw is None:
+        raw = _raw_headers[id(page_headers)] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in page_headers
+        ]
+    return status, list(raw), page
+
+
+async def register(scope: dict, body: bytes) -> Response:
+    """User registration API endpoint (see src.app.register)"""
+    headers = dict(scope.get("headers") or [])
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    if not _is_json(content_type):
+        return _error_response(UnsupportedMediaType(
+            "Did not attempt to load JSON data because the request"
+            " Content-Type was not 'application/json'."
+        ))
+    start = perf_counter()
+    try:
+        data = loads(body)
+    except ValueError:
+        return _error_response(BadRequest())
+    if metrics.enabled:
+        metrics.observe("registration_stage_seconds", "parse", perf_counter() - start)
+
+    locale = headers.get(b"accept-language")
+    locale = locale and locale.decode("latin-1")
+    codes = _wants_codes(scope)
+    if default_registrations().blocking:
+        response_body, status = await _in_thread(registration_response, data, locale, codes)
+    else:
+        response_body, status = registration_response(data, locale, codes)
+    return _json_response(response_body, status)
+
+
+def _wants_codes(scope: dict) -> bool:
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return wants_codes(query.get("errors", [None])[0])
+
+
+async def _in_thread(function: Callable, *args):
+    """Run blocking work in the loop's default executor"""
+    return await asyncio.get_running_loop().run_in_executor(None, partial(function, *args))
+
+
+def _ndjson_records(body: bytes) -> List:
+    """Decode one record per non-blank line; bad lines become None"""
+    records = []
+    for line in body.split(b"\n"):
+        if not line.strip():
+            continue
+        try:
+            records.append(loads(line))
+        except ValueError:
+            records.append(None)
+    return records
+
+
+def _batch_results(records: List, locale: Optional[str], codes: bool, address: str) -> bytes:
+    """NDJSON lines of src.app.register_batch for decoded records"""
+    lines = []
+    wait = 0.0
+    for index, data in enumerate(records):
+        if index >= BATCH_MAX_RECORDS:
+            lines.append(encode_response(BATCH_TOO_LARGE))
+            break
+        # Charged per record like the Flask app; the request paid for the first
+        if index and not wait and rate_limiter.enabled:
+            wait = rate_limiter.check(address)
+        if wait:
+            lines.append(encode_response(dict(
+                TOO_MANY_REQUESTS, index=index, status=429, retry_after=retry_after(wait)
+            )))
+            continue
+        body, status = registration_outcome(data, locale, codes)
+        lines.append(encode_response(dict(body, index=index, status=status)))
+    return b"".join(lines)
+
+
+async def register_batch(scope: dict, body: bytes) -> Response:
+    """Bulk registration API endpoint (see src.app.register_batch)"""
+    headers = dict(scope.get("headers") or [])
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    if content_type.split(";", 1)[0].strip().lower() in NDJSON_MIMETYPES:
+        records = _ndjson_records(body)
+    else:
+        try:
+            records = loads(body)
+        except ValueError:
+            records = None
+        if not isinstance(records, list):
+            return _json_response(INVALID_REQUEST_BODY, 400)
+        if len(records) > BATCH_MAX_RECORDS:
+            return _json_response(encode_response(BATCH_TOO_LARGE), 413)
+
+    locale = headers.get(b"accept-language")
+    client = scope.get("client")
+    results = await _in_thread(
+        _batch_results, records, locale and locale.decode("latin-1"), _wants_codes(scope),
+        client[0] if client else "",
+    )
+    return 200, [(b"content-type", b"application/x-ndjson")], results
+
+
+async def health(scope: dict, body: bytes) -> Response:
+    """Health check endpoint"""
+    return _json_response(HEALTH_BODY)
+
+
+async def metrics_endpoint(scope: dict, body: bytes) -> Response:
+    """Prometheus-style metrics for this worker"""
+    return 200, [(b"content-type", METRICS_CONTENT_TYPE.encode())], metrics.render().encode()
+
+
+# path -> {method: handler}; HEAD is served by the GET handler
+ROUTES: Dict[str, Dict[str, Callable]] = {
+    "/": {"GET": index},
+    "/api/register": {"POST": register},
+    "/api/register/batch": {"POST": register_batch},
+    "/api/health": {"GET": health},
+    "/api/metrics": {"GET": metrics_endpoint},
+}
+
+
+# Largest request body read per path; larger ones are refused with 413
+BODY_LIMITS: Dict[str, int] = {
+    "/api/register": MAX_BODY_BYTES,
+    "/api/register/batch": BATCH_MAX_BODY_BYTES,
+}
+
+
+async def _read_body(receive: Callable, limit: Optional[int] = None) -> Optional[bytes]:
+    """Read the whole request body, or return None once it exceeds limit"""
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if limit is not None and size > limit:
+            return None
+        chunks.append(chunk)
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _declared_length(scope: dict) -> Optional[int]:
+    for name, value in scope.get("headers") or ():
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+def _too_many_requests(scope: dict) -> Optional[Response]:
+    """429 response if the client is over its rate limit (see RateLimitMiddleware)"""
+    client = scope.get("client")
+    wait = rate_limiter.check(client[0] if client else "")
+    if not wait:
+        return None
+    return 429, [(b"content-type", JSON_CONTENT_TYPE),
+                 (b"retry-after", str(retry_after(wait)).encode())], TOO_MANY_REQUESTS_BODY
+
+
+async def _dispatch(scope: dict, receive: Callable) -> Response:
+    if rate_limiter.enabled and scope["path"] in RATE_LIMITED_PATHS:
+        limited = _too_many_requests(scope)
+        if limited is not None:
+            return limited
+    methods = ROUTES.get(scope["path"])
+    if methods is None:
+        return _error_response(NotFound())
+
+    method = scope["method"]
+    allowed = sorted(set(methods) | {"OPTIONS"} | ({"HEAD"} if "GET" in methods else set()))
+    if method == "OPTIONS":
+        return 200, [(b"content-type", HTML_CONTENT_TYPE),
+                     (b"allow", ", ".join(allowed).encode())], b""
+    handler = methods.get("GET" if method == "HEAD" else method)
+    if handler is None:
+        return _error_response(MethodNotAllowed(valid_methods=allowed))
+
+    limit = BODY_LIMITS.get(scope["path"])
+    if limit is not None:
+        declared = _declared_length(scope)
+        if declared is not None and declared > limit:
+            return _json_response(TOO_LARGE_BODY, 413)
+    body = await _read_body(receive, limit)
+    if body is None:
+        return _json_response(TOO_LARGE_BODY, 413)
+    return await handler(scope, body)
+
+
+async def app(scope: dict, receive: Callable, send: Callable) -> None:
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Prime caches before the server starts accepting requests
+                static_page(REGISTER_TEMPLATE)
+                warm_up()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    status, headers, body = await _dispatch(scope, receive)
+    headers.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({
+        "type": "http.response.body",
+        "body": b"" if scope["method"] == "HEAD" else body,
+    })
+
+
+def __getattr__(name: str):
+    if name == "REGISTER_PAGE":
+        return static_page(REGISTER_TEMPLATE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
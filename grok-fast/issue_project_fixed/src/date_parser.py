@@ -0,0 +1,88 @@
+"""
+Date parsing engine
+Single-pass replacement for the strptime format loop used by the validators
+"""
+import re
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+# Field patterns copied from the stdlib strptime implementation so that every
+# string accepted (or rejected) by datetime.strptime is treated the same way
+_YEAR = r"(\d\d\d\d)"
+_MONTH = r"(1[0-2]|0[1-9]|[1-9])"
+_DAY = r"(3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])"
+
+ISO_FORMAT = "%Y-%m-%d"  # ISO 8601 format (Chrome default)
+US_FORMAT = "%m/%d/%Y"  # US format (Safari may input)
+EU_FORMAT = "%d/%m/%Y"  # European format (some regions)
+
+# Order in which formats are tried, kept identical to the original loop
+DATE_FORMATS = (ISO_FORMAT, US_FORMAT, EU_FORMAT)
+
+# Compiled pattern for each format and the group index of (year, month, day)
+_FORMAT_PATTERNS: Dict[str, Tuple["re.Pattern", Tuple[int, int, int]]] = {
+    ISO_FORMAT: (re.compile(_YEAR + "-" + _MONTH + "-" + _DAY), (1, 2, 3)),
+    US_FORMAT: (re.compile(_MONTH + "/" + _DAY + "/" + _YEAR), (3, 1, 2)),
+    EU_FORMAT: (re.compile(_DAY + "/" + _MONTH + "/" + _YEAR), (3, 2, 1)),
+}
+
+# Dispatch table keyed on the field separator: a string containing "-" can
+# only ever match the ISO pattern and one containing "/" only the slash ones
+_DISPATCH: Dict[str, Tuple[str, ...]] = {
+    "-": (ISO_FORMAT,),
+    "/": (US_FORMAT, EU_FORMAT),
+}
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def is_leap_year(year: int) -> bool:
+    """Return True if year is a Gregorian leap year"""
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year: int, month: int) -> int:
+    """Return the number of days in the given month"""
+    if month == 2 and is_leap_year(year):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+
+def parse_date(date_string: str,
+               slash_formats: Optional[Tuple[str, ...]] = None) -> Optional[Tuple[date, str]]:
+    """
+    Parse a date string in one of the supported formats
+
+    The input shape is classified by its separator, so at most the patterns
+    that can possibly match are tried and no exception is raised on a miss.
+
+    Args:
+        date_string: Date string in one of DATE_FORMATS
+        slash_formats: Order to try US_FORMAT and EU_FORMAT in; decides
+            how ambiguous dates like 05/06/1990 are read (default US first)
+
+    Returns:
+        (date, matched_format) or None if no format matches
+    """
+    if "-" in date_string:
+        candidates = _DISPATCH["-"]
+    elif "/" in date_string:
+        candidates = slash_formats or _DISPATCH["/"]
+    else:
+        return None
+
+    for fmt in candidates:
+        pattern, (y, m, d) = _FORMAT_PATTERNS[fmt]
+        match = pattern.fullmatch(date_string)
+        if match is None:
+            continue
+        year = int(match.group(y))
+        month = int(match.group(m))
+        day = int(match.group(d))
+        # Year 0000 and days past the end of the month are rejected by
+        # strptime as well, so move on to the next format
+        if year < 1 or day > days_in_month(year, month):
+            continue
+        return date(year, month, day), fmt
+
+    return None
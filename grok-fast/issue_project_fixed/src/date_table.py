@@ -0,0 +1,119 @@
+"""
+Precomputed birth date table
+Every accepted spelling of every date from MIN_YEAR on, for parse-free lookups
+"""
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from src.date_parser import DATE_FORMATS, EU_FORMAT, ISO_FORMAT, US_FORMAT, days_in_month
+except ImportError:
+    from date_parser import DATE_FORMATS, EU_FORMAT, ISO_FORMAT, US_FORMAT, days_in_month
+
+# Values pack a date ordinal with the index of the format that read it
+_FORMAT_BITS = 2
+_FORMAT_MASK = (1 << _FORMAT_BITS) - 1
+_ISO, _US, _EU = (DATE_FORMATS.index(fmt) for fmt in (ISO_FORMAT, US_FORMAT, EU_FORMAT))
+
+
+def _spellings(value: int, space_padded: bool) -> Tuple[str, ...]:
+    # Same field spellings the parser accepts: "5", "05" and, for days,
+    # " 5" (strptime's %d allows a leading space)
+    if value >= 10:
+        return (str(value),)
+    if space_padded:
+        return (str(value), "0%d" % value, " %d" % value)
+    return (str(value), "0%d" % value)
+
+
+_MONTHS: List[Tuple[str, ...]] = [()] + [_spellings(month, False) for month in range(1, 13)]
+_DAYS: List[Tuple[str, ...]] = [()] + [_spellings(day, True) for day in range(1, 32)]
+
+
+class DateTable:
+    """
+    Lookup table from date strings to the date they denote
+
+    Covers whole calendar years from min_year through the latest year
+    requested, so both readings of an ambiguous slash date (05/06/1990) are
+    always present together. Entries hold the date's ordinal, and a lookup
+    only succeeds for dates on or before the given day; anything else
+    (invalid, future or too old) misses and is left to the parser, which
+    also produces the error.
+
+    Readings follow parse_date with month-first slash dates; the few
+    strings that a day-first locale reads differently are kept separately.
+    """
+
+    def __init__(self, min_year: int):
+        self.min_year = min_year
+        self.max_year = min_year - 1
+        self._entries: Dict[str, int] = {}
+        self._day_first: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _add_year(self, year: int) -> None:
+        entries, day_first = self._entries, self._day_first
+        yyyy = "%04d" % year
+        ordinal = date(year, 1, 1).toordinal() << _FORMAT_BITS
+        for month in range(1, 13):
+            month_spellings = _MONTHS[month]
+            for day in range(1, days_in_month(year, month) + 1):
+                day_spellings = _DAYS[day]
+                iso, us, eu = ordinal | _ISO, ordinal | _US, ordinal | _EU
+                # Is "month/day" also a valid date read day first?
+                swapped = None
+                if day <= 12 and month <= days_in_month(year, day):
+                    swapped = date(year, day, month).toordinal() << _FORMAT_BITS | _EU
+                for m in month_spellings:
+                    for d in day_spellings:
+                        entries[yyyy + "-" + m + "-" + d] = iso
+                        us_string = m + "/" + d + "/" + yyyy
+                        entries[us_string] = us
+                        if swapped is not None and d[0] != " ":
+                            # Day first, this string is another date; the
+                            # EU spelling of this one is then the US
+                            # spelling of that one and is added with it
+                            day_first[us_string] = swapped
+                        else:
+                            # Nothing reads this month first
+                            entries[d + "/" + m + "/" + yyyy] = eu
+                ordinal += 1 << _FORMAT_BITS
+
+    def extend_to(self, year: int) -> None:
+        """Add every year up to and including year"""
+        if year <= self.max_year:
+            return
+        with self._lock:
+            while self.max_year < year:
+                self._add_year(self.max_year + 1)
+                self.max_year += 1
+
+    def lookup(self, date_string: str, today: date,
+               day_first: bool = False) -> Optional[str]:
+        """
+        Return the format of a valid birth date, or None on a miss
+
+        Args:
+            date_string: Raw date string
+            today: Latest acceptable date
+            day_first: Read ambiguous slash dates day first
+
+        Returns:
+            The matching format if date_string denotes a date from min_year
+            up to today, else None
+        """
+        if today.year > self.max_year:
+            self.extend_to(today.year)
+        value = None
+        if day_first:
+            value = self._day_first.get(date_string)
+        if value is None:
+            value = self._entries.get(date_string)
+        if value is None or value >> _FORMAT_BITS > today.toordinal():
+            return None
+        return DATE_FORMATS[value & _FORMAT_MASK]
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._day_first)
@@ -0,0 +1,142 @@
+"""
+Email address validation
+Precompiled syntax checks with cached per-domain verdicts
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+try:
+    from src.errors import EMAIL_DISPOSABLE_ERROR, EMAIL_INVALID_ERROR, ValidationError
+except ImportError:
+    from errors import EMAIL_DISPOSABLE_ERROR, EMAIL_INVALID_ERROR, ValidationError
+
+# RFC 5321 length limits
+EMAIL_MAX_LENGTH = 254
+LOCAL_MAX_LENGTH = 64
+DOMAIN_MAX_LENGTH = 253
+
+# Distinct domains whose verdicts are kept
+DOMAIN_CACHE_SIZE = 10000
+
+INVALID_EMAIL = EMAIL_INVALID_ERROR.message
+DISPOSABLE_EMAIL = EMAIL_DISPOSABLE_ERROR.message
+
+# Throwaway-mailbox providers; subdomains are blocked as well
+DISPOSABLE_DOMAINS = frozenset((
+    "10minutemail.com",
+    "dispostable.com",
+    "fakeinbox.com",
+    "getnada.com",
+    "guerrillamail.com",
+    "guerrillamail.net",
+    "mailinator.com",
+    "maildrop.cc",
+    "mintemail.com",
+    "sharklasers.com",
+    "temp-mail.org",
+    "tempmail.com",
+    "throwawaymail.com",
+    "trashmail.com",
+    "yopmail.com",
+))
+
+# RFC 5322 dot-atom local part; quoted strings and comments are not accepted
+_LOCAL_PART = re.compile(r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*")
+
+# Lowercase ASCII host name with at least two labels and an alphabetic or
+# punycode (xn--p1ai) TLD
+_DOMAIN = re.compile(
+    r"(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+(?:[a-z]{2,63}|xn--[a-z0-9-]{1,59})"
+)
+
+
+def normalize_domain(domain: str) -> Optional[str]:
+    """
+    Lowercase a domain and convert internationalized names to punycode
+
+    Args:
+        domain: Domain part of an address, e.g. "Bücher.example"
+
+    Returns:
+        ASCII domain ("xn--bcher-kva.example") or None if it cannot be encoded
+    """
+    if domain.isascii():
+        return domain.lower()
+    try:
+        return domain.encode("idna").decode("ascii").lower()
+    except UnicodeError:
+        return None
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _domain_verdict(domain: str) -> Tuple[Optional[str], Optional[ValidationError]]:
+    """(normalized domain, None) for acceptable domains, else (None, error)"""
+    ascii_domain = normalize_domain(domain)
+    if (ascii_domain is None or len(ascii_domain) > DOMAIN_MAX_LENGTH
+            or not _DOMAIN.fullmatch(ascii_domain)):
+        return None, EMAIL_INVALID_ERROR
+    # mailinator.com, eu.mailinator.com, ...
+    labels = ascii_domain.split(".")
+    for start in range(len(labels) - 1):
+        if ".".join(labels[start:]) in DISPOSABLE_DOMAINS:
+            return None, EMAIL_DISPOSABLE_ERROR
+    return ascii_domain, None
+
+
+def _check(email) -> Tuple[Optional[str], Optional[ValidationError]]:
+    """(normalized address, None) or (None, error)"""
+    # Cheap structural checks turn away most junk before any regex runs
+    if not email or not isinstance(email, str) or len(email) > EMAIL_MAX_LENGTH:
+        return None, EMAIL_INVALID_ERROR
+    local, at, domain = email.rpartition("@")
+    if (not at or not local or not domain or len(local) > LOCAL_MAX_LENGTH
+            or "." not in domain or "@" in local):
+        return None, EMAIL_INVALID_ERROR
+    if not _LOCAL_PART.fullmatch(local):
+        return None, EMAIL_INVALID_ERROR
+    ascii_domain, error = _domain_verdict(domain)
+    if error is not None:
+        return None, error
+    return local + "@" + ascii_domain, None
+
+
+def check_email(email: str) -> Optional[ValidationError]:
+    """Return the reason email is rejected, or None if it is acceptable"""
+    return _check(email)[1]
+
+
+def validate_email(email: str) -> Tuple[bool, str]:
+    """
+    Validate email address syntax and reject disposable domains
+
+    Args:
+        email: Email address
+
+    Returns:
+        (is_valid, error_message or success_message)
+    """
+    _, error = _check(email)
+    if error is not None:
+        return False, error.message
+    return True, "Email format is valid"
+
+
+def normalize_email(email: str) -> Optional[str]:
+    """
+    Return the address with its domain lowercased and IDNA-encoded
+
+    The local part is kept as is, since it may be case sensitive.
+
+    Args:
+        email: Email address
+
+    Returns:
+        Normalized address, or None if the address is not valid
+    """
+    return _check(email)[0]
+
+
+def domain_cache_info():
+    """Return hit/miss statistics of the per-domain verdict cache"""
+    return _domain_verdict.cache_info()
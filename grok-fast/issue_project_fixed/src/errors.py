@@ -0,0 +1,72 @@
+"""
+Validation error codes
+Validators report codes with parameters; messages are rendered on demand
+"""
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Error codes; identifier-like literals, so interned and compared by identity
+USERNAME_TOO_SHORT = "username_too_short"
+USERNAME_TOO_LONG = "username_too_long"
+EMAIL_INVALID = "email_invalid"
+EMAIL_DISPOSABLE = "email_disposable"
+DATE_EMPTY = "date_empty"
+DATE_INVALID_FORMAT = "date_invalid_format"
+DATE_FUTURE = "date_future"
+DATE_OUT_OF_RANGE = "date_out_of_range"
+
+# Human-readable message per code, formatted with the error's params
+MESSAGES = {
+    USERNAME_TOO_SHORT: "Username must be at least 3 characters",
+    USERNAME_TOO_LONG: "Username must be at most 64 characters",
+    EMAIL_INVALID: "Invalid email format",
+    EMAIL_DISPOSABLE: "Disposable email addresses are not allowed",
+    DATE_EMPTY: "Date cannot be empty",
+    DATE_INVALID_FORMAT: (
+        "Invalid date format. Supported formats: YYYY-MM-DD, MM/DD/YYYY, DD/MM/YYYY."
+        " Received: {received}"
+    ),
+    DATE_FUTURE: "Birth date cannot be in the future",
+    DATE_OUT_OF_RANGE: "Birth year must be between {min_year} and {max_year}",
+}
+
+# Error codes by position, for compact integer arrays of verdicts (see
+# vectorized.validate_birth_dates); position 0, NO_ERROR, is a pass
+NO_ERROR = 0
+CODES = (None,) + tuple(MESSAGES)
+CODE_INDEX = {code: index for index, code in enumerate(CODES) if code is not None}
+
+
+class ValidationError(NamedTuple):
+    """A validation failure: error code plus the values its message needs"""
+
+    code: str
+    params: Optional[dict] = None
+
+    @property
+    def message(self) -> str:
+        """Render the human-readable message"""
+        template = MESSAGES[self.code]
+        if self.params:
+            return template.format(**self.params)
+        return template
+
+
+# Shared instances for errors without parameters; rejecting allocates nothing
+USERNAME_TOO_SHORT_ERROR = ValidationError(USERNAME_TOO_SHORT)
+USERNAME_TOO_LONG_ERROR = ValidationError(USERNAME_TOO_LONG)
+EMAIL_INVALID_ERROR = ValidationError(EMAIL_INVALID)
+EMAIL_DISPOSABLE_ERROR = ValidationError(EMAIL_DISPOSABLE)
+DATE_EMPTY_ERROR = ValidationError(DATE_EMPTY)
+DATE_FUTURE_ERROR = ValidationError(DATE_FUTURE)
+
+
+def invalid_date_format(received: str) -> ValidationError:
+    """Error for a date string that matches none of the supported formats"""
+    return ValidationError(DATE_INVALID_FORMAT, {"received": received})
+
+
+@lru_cache(maxsize=4)
+def date_out_of_range(min_year: int, max_year: int) -> ValidationError:
+    """Error for a birth year outside [min_year, max_year]; one per window"""
+    return ValidationError(DATE_OUT_OF_RANGE, {"min_year": min_year, "max_year": max_year})
@@ -0,0 +1,50 @@
+"""
+Early-reject guard for /api/register
+Size and shape limits, and the schema's cheap rules, run before any check
+"""
+from typing import Callable, List, Optional, Union
+
+# Largest accepted /api/register body; a complete request is ~100 bytes
+MAX_BODY_BYTES = 4 * 1024
+
+# Largest /api/register/batch body and most records in one batch
+BATCH_MAX_BODY_BYTES = 1024 * 1024
+BATCH_MAX_RECORDS = 1000
+
+# Most keys a request object may have; only three are used
+MAX_FIELDS = 16
+
+# Longer than any supported date spelling plus some whitespace slack
+DATE_MAX_LENGTH = 32
+
+# screen() result for bodies that are not a plausible registration at all
+MALFORMED = "malformed"
+
+
+def screen(data, prescreen: Optional[Callable[[dict], List]] = None) -> Union[None, str, List]:
+    """
+    Cheap checks on a decoded request body
+
+    Looks at the body's type, its number of keys and the size of the date,
+    then runs the registration schema's cheap rules (types, lengths, a
+    required "@"; see compile_schema), so its cost does not depend on the
+    payload and the date parser and email patterns do not run. Bodies that
+    pass may still fail full validation.
+
+    Args:
+        data: Decoded JSON request body
+        prescreen: The active compiled schema's validate.prescreen
+
+    Returns:
+        None if the body passes, MALFORMED for a non-object, too many
+        fields or an oversized date, else the (shared, parameterless)
+        ValidationErrors found
+    """
+    if not data or not isinstance(data, dict) or len(data) > MAX_FIELDS:
+        return MALFORMED
+    birth_date = data.get("birth_date")
+    if isinstance(birth_date, str) and len(birth_date) > DATE_MAX_LENGTH:
+        return MALFORMED
+    if prescreen is None:
+        return None
+    return prescreen(data) or None
@@ -0,0 +1,78 @@
+"""
+JSON encoding for request and response bodies
+Uses orjson when it is installed and falls back to the stdlib json module
+"""
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# Same layout Flask's jsonify produces outside debug mode
+_COMPACT_SEPARATORS = (",", ":")
+
+# Flask's serializer for dates, UUIDs, dataclasses and __html__ objects
+_default = DefaultJSONProvider.default
+
+if orjson is not None:
+    # Hand dates and dataclasses to Flask's serializer so both encoders agree
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode obj as compact JSON with sorted keys"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass  # e.g. non-string keys; let the stdlib handle or reject it
+    return json.dumps(
+        obj, default=_default, sort_keys=True, separators=_COMPACT_SEPARATORS
+    ).encode()
+
+
+def encode_response(obj: Any) -> bytes:
+    """Encode a response body the way jsonify lays it out (trailing newline)"""
+    return dumps_bytes(obj) + b"\n"
+
+
+def loads(data) -> Any:
+    """Decode JSON from str or bytes; raises ValueError on bad input"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson when available
+
+    Compact responses and plain loads/dumps calls go through the fast
+    encoder; anything needing stdlib-only options (indent, custom
+    separators, debug pretty-printing) is delegated to the default provider.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        compact = not kwargs or kwargs == {"separators": _COMPACT_SEPARATORS}
+        if orjson is not None and compact:
+            return dumps_bytes(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(encode_response(obj), mimetype=self.mimetype)
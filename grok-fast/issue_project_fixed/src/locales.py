@@ -0,0 +1,90 @@
+"""
+Locale hints for ambiguous dates
+Maps a locale or Accept-Language value to the order slash dates are tried in
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+try:
+    from src.date_parser import EU_FORMAT, US_FORMAT
+except ImportError:
+    from date_parser import EU_FORMAT, US_FORMAT
+
+MONTH_FIRST = (US_FORMAT, EU_FORMAT)
+DAY_FIRST = (EU_FORMAT, US_FORMAT)
+
+# Index key used when no hint is given or nothing in it is known; keeps the
+# original US-first behavior
+DEFAULT_LOCALE = "default"
+DEFAULT_ORDER = MONTH_FIRST
+
+# Languages whose speakers mostly write slash dates day first. Bare "en" is
+# left out: browsers send a region with it and US is the historic default.
+_DAY_FIRST_LANGUAGES = (
+    "ar", "bg", "ca", "cs", "cy", "da", "de", "el", "es", "et", "fi", "fr",
+    "ga", "he", "hi", "hr", "id", "is", "it", "lt", "lv", "ms", "nb", "nl",
+    "nn", "no", "pl", "pt", "ro", "ru", "sk", "sl", "sr", "sv", "th", "tr",
+    "uk", "vi",
+)
+
+# Region overrides for languages spoken on both sides of the split
+_DAY_FIRST_TAGS = (
+    "en-au", "en-gb", "en-ie", "en-in", "en-nz", "en-sg", "en-za",
+)
+_MONTH_FIRST_TAGS = (
+    "en-us", "en-ph", "es-us",
+)
+
+# Precomputed index: lowercase language or language-region -> format order
+FORMAT_ORDER_INDEX: Dict[str, Tuple[str, ...]] = {
+    **{language: DAY_FIRST for language in _DAY_FIRST_LANGUAGES},
+    **{tag: DAY_FIRST for tag in _DAY_FIRST_TAGS},
+    **{tag: MONTH_FIRST for tag in _MONTH_FIRST_TAGS},
+    "en": MONTH_FIRST,
+}
+
+
+def _preferred_tags(hint: str):
+    """Language tags from an Accept-Language value, most preferred first"""
+    weighted = []
+    for position, item in enumerate(hint.split(",")):
+        tag, _, params = item.partition(";")
+        tag = tag.strip().replace("_", "-").lower()
+        if not tag or tag == "*":
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if quality > 0:
+            weighted.append((-quality, position, tag))
+    weighted.sort()
+    return [tag for _, _, tag in weighted]
+
+
+@lru_cache(maxsize=1024)
+def resolve_locale(hint: Optional[str]) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Look up the slash-date format order for a locale hint
+
+    Args:
+        hint: Locale tag ("en-GB", "de_DE") or Accept-Language header
+            value ("fr-CH, fr;q=0.9, en;q=0.8")
+
+    Returns:
+        (index_key, formats) where index_key is the FORMAT_ORDER_INDEX entry
+        that matched, or DEFAULT_LOCALE
+    """
+    if hint:
+        for tag in _preferred_tags(hint):
+            order = FORMAT_ORDER_INDEX.get(tag)
+            if order is not None:
+                return tag, order
+            language = tag.split("-", 1)[0]
+            order = FORMAT_ORDER_INDEX.get(language)
+            if order is not None:
+                return language, order
+    return DEFAULT_LOCALE, DEFAULT_ORDER
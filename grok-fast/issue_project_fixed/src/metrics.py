@@ -0,0 +1,169 @@
+"""
+Hot-path instrumentation
+Per-thread counters and fixed-bucket histograms, exposed in the Prometheus
+text exposition format
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Upper bounds in seconds; chosen for stages that take microseconds
+DEFAULT_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025,
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05,
+)
+
+# name -> (label name, help text)
+COUNTERS = {
+    "registration_requests_total": ("outcome", "Registration requests by outcome"),
+    "registration_errors_total": ("error", "Registration validation errors by code"),
+    "birth_date_formats_total": ("format", "Parsed birth dates by detected format"),
+    "birth_date_locale_hits_total": ("locale", "Slash dates matching the locale's first format"),
+    "birth_date_locale_misses_total": ("locale", "Slash dates needing the locale's second format"),
+}
+HISTOGRAMS = {
+    "registration_stage_seconds": ("stage", "Time spent per /api/register stage"),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Shard:
+    """Metrics written by a single thread; never shared for writing"""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, str], int] = {}
+        # (name, label) -> [bucket counts..., +Inf count, sum]
+        self.histograms: Dict[Tuple[str, str], List[float]] = {}
+
+    def merge(self, other: "_Shard") -> None:
+        """Add another shard's values into this one"""
+        for key, value in list(other.counters.items()):
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, values in list(other.histograms.items()):
+            total = self.histograms.get(key)
+            if total is None:
+                self.histograms[key] = list(values)
+            else:
+                for index, value in enumerate(values):
+                    total[index] += value
+
+
+class MetricsRegistry:
+    """
+    Lock-free metrics aggregation
+
+    Each thread writes to its own shard, so recording never takes a lock or
+    contends with other threads; shards are only summed when rendered, and
+    shards of finished threads are folded together so thread-per-request
+    servers do not accumulate them. The registry is per process, i.e. per
+    worker.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, _Shard]] = []
+        self._retired = _Shard()
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._retire_finished()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_finished(self) -> None:
+        # Caller holds the lock; finished threads can no longer write
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._retired.merge(shard)
+        self._shards = live
+
+    def inc(self, name: str, label: str, amount: int = 1) -> None:
+        """Increment a counter declared in COUNTERS"""
+        if not self.enabled:
+            return
+        try:
+            counters = self._local.shard.counters
+        except AttributeError:
+            counters = self._shard().counters
+        key = (name, label)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name: str, label: str, seconds: float) -> None:
+        """Record a duration in a histogram declared in HISTOGRAMS"""
+        if not self.enabled:
+            return
+        try:
+            histograms = self._local.shard.histograms
+        except AttributeError:
+            histograms = self._shard().histograms
+        key = (name, label)
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        values[bisect_left(self.buckets, seconds)] += 1
+        values[-1] += seconds
+
+    def reset(self) -> None:
+        """Drop everything recorded so far"""
+        with self._shards_lock:
+            self._retired = _Shard()
+            for _, shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+    def _collect(self) -> _Shard:
+        total = _Shard()
+        with self._shards_lock:
+            self._retire_finished()
+            total.merge(self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            total.merge(shard)
+        return total
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        total = self._collect()
+        counters, histograms = total.counters, total.histograms
+        lines = []
+        for name, (label_name, help_text) in COUNTERS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (metric, label), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{{{label_name}="{_escape(label)}"}} {value}')
+        for name, (label_name, help_text) in HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, label), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                selector = f'{label_name}="{_escape(label)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), values):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{selector},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{selector}}} {values[-1]!r}")
+                lines.append(f"{name}_count{{{selector}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide registry used by the validators and both apps
+metrics = MetricsRegistry()
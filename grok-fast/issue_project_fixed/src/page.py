@@ -0,0 +1,145 @@
+"""
+Static pages
+Rendered once, pre-compressed, and served with validators for caching
+"""
+import gzip
+import hashlib
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+
+# Browsers may reuse the page for five minutes, then revalidate with the ETag
+CACHE_CONTROL = "public, max-age=300"
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+# Server preference when the client accepts several encodings equally
+_PREFERENCE = (BROTLI, GZIP, IDENTITY)
+
+Headers = List[Tuple[str, str]]
+
+_NOT_ACCEPTABLE = (406, [("Content-Type", "text/plain; charset=utf-8")], b"Not Acceptable")
+
+
+def render_static(template_name: str) -> bytes:
+    """Render a template that takes no context"""
+    # Only needed once per page, so not at import time
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape())
+    return env.get_template(template_name).render().encode()
+
+
+@lru_cache(maxsize=256)
+def _accepted(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding header -> {coding: q}"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    return weights
+
+
+class StaticPage:
+    """
+    One document with every encoding prepared up front
+
+    Each encoding is a separate representation with its own strong ETag.
+    respond() picks the encoding from Accept-Encoding and answers 304 when
+    If-None-Match names the ETag of the representation that would be sent.
+    """
+
+    def __init__(self, body: bytes, content_type: str = HTML_CONTENT_TYPE,
+                 cache_control: str = CACHE_CONTROL):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.bodies = {IDENTITY: body, GZIP: gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            self.bodies[BROTLI] = brotli.compress(body, quality=11)
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == IDENTITY else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+        base = [
+            ("Content-Type", content_type),
+            ("Cache-Control", cache_control),
+            ("Vary", "Accept-Encoding"),
+        ]
+        self._headers: Dict[str, Headers] = {}
+        self._not_modified: Dict[str, Headers] = {}
+        for encoding in self.bodies:
+            etag = [("ETag", self.etags[encoding])]
+            coding = [] if encoding == IDENTITY else [("Content-Encoding", encoding)]
+            self._headers[encoding] = base + etag + coding
+            self._not_modified[encoding] = base[1:] + etag
+        self._negotiate = lru_cache(maxsize=256)(self._choose)
+
+    def _choose(self, accept_encoding: str) -> Optional[str]:
+        weights = _accepted(accept_encoding)
+        best, best_q = None, 0.0
+        for encoding in _PREFERENCE:
+            if encoding not in self.bodies:
+                continue
+            if encoding in weights:
+                q = weights[encoding]
+            elif encoding == IDENTITY:
+                # identity stays acceptable unless refused outright (RFC 9110)
+                q = weights.get("*", 1.0)
+            else:
+                q = weights.get("*", 0.0)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def encoding_for(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Encoding to send for this Accept-Encoding, or None if nothing is acceptable"""
+        if not accept_encoding:
+            return IDENTITY
+        return self._negotiate(accept_encoding)
+
+    def respond(self, accept_encoding: Optional[str] = None,
+                if_none_match: Optional[str] = None) -> Tuple[int, Headers, bytes]:
+        """
+        Pick the representation for one request
+
+        Args:
+            accept_encoding: Accept-Encoding request header
+            if_none_match: If-None-Match request header
+
+        Returns:
+            (status, headers, body): 200 with the encoded page, 304 with no
+            body, or 406 when every encoding is refused
+        """
+        encoding = self.encoding_for(accept_encoding)
+        if encoding is None:
+            return _NOT_ACCEPTABLE
+        if if_none_match and (if_none_match.strip() == "*"
+                              or self.etags[encoding] in if_none_match):
+            return 304, self._not_modified[encoding], b""
+        return 200, self._headers[encoding], self.bodies[encoding]
+
+
+@lru_cache(maxsize=None)
+def static_page(template_name: str) -> StaticPage:
+    """The StaticPage for a template, rendered and compressed on first use"""
+    return StaticPage(render_static(template_name))
@@ -0,0 +1,150 @@
+"""
+Multi-core execution mode for bulk validation
+Chunks records across a process pool and reassembles results in order
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    from src.validators import ValidationResult, validate_registration_batch
+except ImportError:
+    from validators import ValidationResult, validate_registration_batch
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Modules the forkserver imports once, so forked workers start warm
+_PRELOAD = ["src.validators"]
+
+
+def validate_records(records: Sequence[dict]) -> List[ValidationResult]:
+    """
+    Validate one chunk of registration records
+
+    Args:
+        records: {"username", "email", "birth_date"} dicts
+
+    Returns:
+        One validate_registration_data style result per record
+    """
+    result = validate_registration_batch(records=records)
+    return [result.result(index) for index in range(len(result))]
+
+
+def _mp_context():
+    """Prefer forkserver workers that have already imported the validators"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(_PRELOAD)
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class ParallelValidator:
+    """
+    Ordered, chunked process-pool executor for bulk validation
+
+    Inputs no larger than inline_threshold are validated in the calling
+    process, so small jobs never pay for starting the pool. The pool is
+    created on first use and reused until close().
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 inline_threshold: Optional[int] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.inline_threshold = chunk_size * 2 if inline_threshold is None else inline_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=_mp_context()
+            )
+        return self._executor
+
+    def imap(self, records: Iterable,
+             chunk_func: Callable[[List], List] = validate_records) -> Iterator:
+        """
+        Yield chunk_func results for every record, in input order
+
+        At most two chunks per worker are in flight, so memory stays bounded
+        for arbitrarily long inputs.
+
+        Args:
+            records: Any iterable of records
+            chunk_func: Picklable function mapping a list of records to a
+                list of results of the same length
+        """
+        source = iter(records)
+        head = list(islice(source, self.inline_threshold + 1))
+        if self.workers <= 1 or len(head) <= self.inline_threshold:
+            # Small or single-worker job: no pool, no pickling
+            for start in range(0, len(head), self.chunk_size):
+                yield from chunk_func(head[start:start + self.chunk_size])
+            for chunk in _chunks(source, self.chunk_size):
+                yield from chunk_func(chunk)
+            return
+
+        pool = self._pool()
+        pending = deque()
+        for chunk in _chunks(_chain(head, source), self.chunk_size):
+            pending.append(pool.submit(chunk_func, chunk))
+            if len(pending) >= self.workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def validate(self, records: Iterable) -> List[ValidationResult]:
+        """Validate all records and return results in input order"""
+        return list(self.imap(records))
+
+    def close(self) -> None:
+        """Shut down the worker pool, if it was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ParallelValidator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _chain(head: List, rest: Iterator) -> Iterator:
+    yield from head
+    yield from rest
+
+
+def _chunks(records: Iterable, size: int) -> Iterator[List]:
+    source = iter(records)
+    while True:
+        chunk = list(islice(source, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_registration_parallel(records: Iterable,
+                                   workers: Optional[int] = None,
+                                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[ValidationResult]:
+    """
+    Validate registration records across all cores
+
+    Args:
+        records: Iterable of {"username", "email", "birth_date"} dicts
+        workers: Worker processes (default: CPU count)
+        chunk_size: Records per work unit
+
+    Returns:
+        validate_registration_data style results, in input order
+    """
+    with ParallelValidator(workers, chunk_size) as validator:
+        return validator.validate(records)
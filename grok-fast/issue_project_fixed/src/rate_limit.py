@@ -0,0 +1,257 @@
+"""
+Per-client rate limiting
+Token buckets per IP and per subnet in a fixed-size table shared through mmap
+"""
+import hashlib
+import ipaddress
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are per process
+    fcntl = None
+
+try:
+    from src.json_provider import encode_response
+except ImportError:
+    from json_provider import encode_response
+
+# Requests per second and burst size per client IP, and per /24 (IPv4) or
+# /64 (IPv6) subnet
+IP_RATE = 10.0
+IP_BURST = 20.0
+SUBNET_RATE = 50.0
+SUBNET_BURST = 100.0
+
+# Buckets kept; a power of two. Each slot is 24 bytes, so 1.5 MB by default
+DEFAULT_SLOTS = 1 << 16
+# Slots probed per key before the least recently used one is reused
+MAX_PROBE = 8
+
+# Slot layout: key hash (0 = free), tokens left, last update (epoch seconds)
+_SLOT = struct.Struct("<Qdd")
+
+TOO_MANY_REQUESTS = {
+    "success": False,
+    "message": "Too many requests"
+}
+TOO_MANY_REQUESTS_BODY = encode_response(TOO_MANY_REQUESTS)
+
+# Longest Retry-After with a prebuilt header list; longer waits are capped
+_MAX_RETRY_AFTER = 60
+_TOO_MANY_HEADERS = [
+    [("Content-Type", "application/json"),
+     ("Content-Length", str(len(TOO_MANY_REQUESTS_BODY))),
+     ("Retry-After", str(seconds))]
+    for seconds in range(_MAX_RETRY_AFTER + 1)
+]
+
+
+def retry_after(wait: float) -> int:
+    """Retry-After seconds for a wait returned by RateLimiter.check"""
+    return min(math.ceil(wait), _MAX_RETRY_AFTER)
+
+
+def _key_hash(key: str) -> int:
+    # Stable across processes, unlike hash(); 0 marks a free slot
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+@lru_cache(maxsize=65536)
+def client_keys(address: str) -> Tuple[int, int]:
+    """(IP bucket key, subnet bucket key) for a client address"""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return _key_hash("ip:" + address), _key_hash("net:" + address)
+    prefix = 24 if ip.version == 4 else 64
+    subnet = ipaddress.ip_network(f"{ip}/{prefix}", strict=False)
+    return _key_hash(f"ip:{ip}"), _key_hash(f"net:{subnet}")
+
+
+class SharedBucketTable:
+    """
+    Token buckets in an open-addressing hash table over an mmap'd file
+
+    Every process mapping the same file sees the same buckets. Without a
+    path the table lives in an unlinked temporary file, which workers forked
+    afterwards (gunicorn --preload) still share. Updates take a thread lock
+    plus, where fcntl exists, a POSIX record lock on the file, so checks
+    are atomic across workers.
+
+    Buckets are looked up with linear probing over at most MAX_PROBE slots;
+    when all of them belong to other keys the least recently updated one is
+    taken over. An evicted client restarts with a full bucket, so a full
+    table lets some extra requests through but never blocks anyone.
+    """
+
+    def __init__(self, path: Optional[str] = None, slots: int = DEFAULT_SLOTS):
+        if slots < MAX_PROBE or slots & (slots - 1):
+            raise ValueError("slots must be a power of two of at least %d" % MAX_PROBE)
+        self.path = path
+        self.slots = slots
+        size = slots * _SLOT.size
+        if path:
+            self._file = open(path, "a+b")
+        else:
+            self._file = tempfile.TemporaryFile()
+        if os.fstat(self._file.fileno()).st_size != size:
+            self._file.truncate(size)
+        self._fd = self._file.fileno()
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> None:
+        self._lock.acquire()
+        if fcntl is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+
+    def _release(self) -> None:
+        if fcntl is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def _find(self, key: int) -> Tuple[int, float, float]:
+        """(offset, tokens, updated) of key's slot; tokens is -1 for a new bucket"""
+        data, mask, size = self._map, self.slots - 1, _SLOT.size
+        index = key & mask
+        victim, oldest = index * size, math.inf
+        for step in range(MAX_PROBE):
+            offset = ((index + step) & mask) * size
+            slot_key, tokens, updated = _SLOT.unpack_from(data, offset)
+            if slot_key == key:
+                return offset, tokens, updated
+            if slot_key == 0:
+                return offset, -1.0, 0.0
+            if updated < oldest:
+                victim, oldest = offset, updated
+        return victim, -1.0, 0.0
+
+    def take(self, ip_key: int, subnet_key: int, now: Optional[float] = None,
+             ip_rate: float = IP_RATE, ip_burst: float = IP_BURST,
+             subnet_rate: float = SUBNET_RATE, subnet_burst: float = SUBNET_BURST) -> float:
+        """
+        Spend one token from both buckets if both have one
+
+        Returns:
+            0.0 if the request is allowed, else seconds until it would be
+        """
+        if now is None:
+            now = time.time()
+        data = self._map
+        self._acquire()
+        try:
+            # New buckets start full; clocks stepping back refill nothing
+            ip_offset, ip_tokens, ip_updated = self._find(ip_key)
+            if ip_tokens < 0:
+                ip_tokens = ip_burst
+            else:
+                ip_tokens = min(ip_burst, ip_tokens + max(0.0, now - ip_updated) * ip_rate)
+            # Claim the IP's slot before probing, so the subnet cannot pick it
+            _SLOT.pack_into(data, ip_offset, ip_key, ip_tokens, now)
+            net_offset, net_tokens, net_updated = self._find(subnet_key)
+            if net_tokens < 0:
+                net_tokens = subnet_burst
+            else:
+                net_tokens = min(subnet_burst,
+                                 net_tokens + max(0.0, now - net_updated) * subnet_rate)
+            wait = max((1.0 - ip_tokens) / ip_rate, (1.0 - net_tokens) / subnet_rate, 0.0)
+            if wait == 0.0:
+                ip_tokens -= 1.0
+                net_tokens -= 1.0
+                _SLOT.pack_into(data, ip_offset, ip_key, ip_tokens, now)
+            if net_offset != ip_offset:
+                _SLOT.pack_into(data, net_offset, subnet_key, net_tokens, now)
+        finally:
+            self._release()
+        return wait
+
+    def clear(self) -> None:
+        """Forget every bucket"""
+        self._acquire()
+        try:
+            self._map[:] = bytes(len(self._map))
+        finally:
+            self._release()
+
+    def used(self) -> int:
+        """Number of occupied slots"""
+        return sum(
+            1 for offset in range(0, len(self._map), _SLOT.size)
+            if _SLOT.unpack_from(self._map, offset)[0]
+        )
+
+    def close(self) -> None:
+        """Unmap the table and close its file"""
+        self._map.close()
+        self._file.close()
+
+
+class RateLimiter:
+    """Per-IP and per-subnet limits on top of a SharedBucketTable"""
+
+    def __init__(self, table: SharedBucketTable, ip_rate: float = IP_RATE,
+                 ip_burst: float = IP_BURST, subnet_rate: float = SUBNET_RATE,
+                 subnet_burst: float = SUBNET_BURST, enabled: bool = True):
+        if min(ip_rate, ip_burst, subnet_rate, subnet_burst) < 1:
+            raise ValueError("rates and bursts must be at least 1")
+        self.table = table
+        self.ip_rate = ip_rate
+        self.ip_burst = ip_burst
+        self.subnet_rate = subnet_rate
+        self.subnet_burst = subnet_burst
+        self.enabled = enabled
+
+    def check(self, address: str, now: Optional[float] = None) -> float:
+        """
+        Count one request from address against its limits
+
+        Returns:
+            0.0 if allowed, else the seconds the client should wait
+        """
+        ip_key, subnet_key = client_keys(address)
+        return self.table.take(ip_key, subnet_key, now, self.ip_rate, self.ip_burst,
+                               self.subnet_rate, self.subnet_burst)
+
+
+class RateLimitMiddleware:
+    """
+    WSGI middleware answering over-limit clients with 429
+
+    Only requests to the given paths are counted. Clients are identified by
+    REMOTE_ADDR; behind a reverse proxy, apply werkzeug's ProxyFix first.
+    """
+
+    def __init__(self, wsgi_app: Callable, limiter: RateLimiter, paths: Iterable[str]):
+        self.wsgi_app = wsgi_app
+        self.limiter = limiter
+        self.paths = frozenset(paths)
+
+    def __call__(self, environ: dict, start_response: Callable) -> List[bytes]:
+        limiter = self.limiter
+        if limiter.enabled and environ.get("PATH_INFO") in self.paths:
+            wait = limiter.check(environ.get("REMOTE_ADDR") or "")
+            if wait:
+                start_response("429 Too Many Requests", _TOO_MANY_HEADERS[retry_after(wait)])
+                return [TOO_MANY_REQUESTS_BODY]
+        return self.wsgi_app(environ, start_response)
+
+
+def open_rate_limiter(path: Optional[str] = None, enabled: bool = True) -> RateLimiter:
+    """
+    Build a limiter over a bucket table at path, or a private one
+
+    Args:
+        path: File holding the table, shared by every worker that opens it;
+            None shares it only with workers forked after this call
+        enabled: False lets every request through
+    """
+    return RateLimiter(SharedBucketTable(path), enabled=enabled)
@@ -0,0 +1,476 @@
+"""
+Registration service
+Framework-independent request handling shared by the WSGI and ASGI apps
+"""
+import atexit
+import os
+import threading
+import weakref
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from src.json_provider import encode_response
+    from src.metrics import metrics
+    from src.uniqueness import USERNAME, SQLiteStore, UniquenessIndex, open_uniqueness_index
+    from src.user_store import SQLiteUserStore, UserStore, open_user_store
+    from src.errors import ValidationError
+    from src.guard import MALFORMED, screen
+    from src.schema import SchemaFile, Validator, get_schema
+    from src.validators import normalize_birth_date
+except ImportError:
+    from json_provider import encode_response
+    from metrics import metrics
+    from uniqueness import USERNAME, SQLiteStore, UniquenessIndex, open_uniqueness_index
+    from user_store import SQLiteUserStore, UserStore, open_user_store
+    from errors import ValidationError
+    from guard import MALFORMED, screen
+    from schema import SchemaFile, Validator, get_schema
+    from validators import normalize_birth_date
+
+# Constant response bodies; shared objects, never mutate them
+INVALID_REQUEST = {
+    "success": False,
+    "message": "Invalid request data"
+}
+USERNAME_TAKEN = {
+    "success": False,
+    "message": "Username is already taken"
+}
+EMAIL_TAKEN = {
+    "success": False,
+    "message": "Email is already registered"
+}
+REQUEST_TOO_LARGE = {
+    "success": False,
+    "message": "Request body too large"
+}
+
+# Constant bodies are serialized once and reused
+_PREENCODED = {
+    id(body): encode_response(body)
+    for body in (INVALID_REQUEST, USERNAME_TAKEN, EMAIL_TAKEN, REQUEST_TOO_LARGE)
+}
+
+
+# Content types /api/register/batch reads as one object per line
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+# Values of the ?errors= query parameter: full messages (default) or only
+# the error codes, which are smaller and never need rendering
+ERROR_MESSAGES = "messages"
+ERROR_CODES = "codes"
+
+# Failure bodies by (codes, error code combination); only combinations of
+# parameterless errors are kept, and there are few of them
+_FAILURES: Dict[Tuple[bool, Tuple[str, ...]], dict] = {}
+
+
+def wants_codes(error_format: Optional[str]) -> bool:
+    """True if the client asked for error codes instead of messages"""
+    return error_format == ERROR_CODES
+
+
+def validation_failure(errors: List[ValidationError], codes: bool = False) -> dict:
+    """
+    Response body for data that failed validation
+    
+    Args:
+        errors: ValidationErrors from the registration schema
+        codes: Report error codes only, e.g. {"success": false,
+            "errors": ["email_invalid"]}, instead of rendered messages
+    """
+    key = (codes, tuple(error.code for error in errors))
+    body = _FAILURES.get(key)
+    if body is not None:
+        return body
+    if codes:
+        body = {"success": False, "errors": list(key[1])}
+    else:
+        body = {
+            "success": False,
+            "message": "Registration data validation failed",
+            "errors": [error.message for error in errors]
+        }
+    # Messages with parameters (the received date) differ per request
+    if codes or not any(error.params for error in errors):
+        _PREENCODED[id(body)] = encode_response(body)
+        _FAILURES[key] = body
+    return body
+
+
+def registration_success(user_id: int) -> dict:
+    """Response body for a stored registration"""
+    return {
+        "success": True,
+        "message": "Registration successful!",
+        "user_id": user_id
+    }
+
+
+# The success body only varies in the ID, so it is encoded once around a
+# placeholder and the ID is spliced in per response
+_SUCCESS_PREFIX, _SUCCESS_SUFFIX = encode_response(
+    registration_success(987654321)
+).split(b"987654321")
+
+
+def encode_success(user_id: int) -> bytes:
+    """Same bytes as encode_response(registration_success(user_id))"""
+    return _SUCCESS_PREFIX + str(user_id).encode() + _SUCCESS_SUFFIX
+
+
+# Stands for "not opened in this process yet"; None is a valid setting
+_UNOPENED = object()
+
+
+class Registrations:
+    """
+    The rules, uniqueness index and user store registrations go through
+
+    The schema, index and store are opened on first use, in the process
+    that uses them. A worker forked after they were opened (e.g. by
+    gunicorn --preload) drops the inherited ones and opens its own, since
+    SQLite connections and the store's writer thread do not survive a
+    fork; an index or store installed by assignment is dropped there too.
+    """
+
+    def __init__(self, user_db: Optional[str] = None, uniqueness_db: Optional[str] = None,
+                 schema_path: Optional[str] = None, check_uniqueness: bool = True):
+        """
+        Args:
+            user_db: SQLite file users are saved to and IDs allocated from;
+                None keeps users in this process only
+            uniqueness_db: SQLite file of claimed usernames and emails,
+                shared by all workers; None keeps claims in this process
+            schema_path: Registration schema file; None uses the
+                process-wide schema (see schema.get_schema)
+            check_uniqueness: False skips the uniqueness check
+        """
+        self.user_db = user_db
+        self.uniqueness_db = uniqueness_db
+        self.schema_path = schema_path
+        self.check_uniqueness = check_uniqueness
+        self._schema: Optional[SchemaFile] = None
+        self._reset()
+        _instances.add(self)
+
+    def _reset(self) -> None:
+        """Forget the index and store; the next use opens new ones"""
+        self._uniqueness = _UNOPENED
+        self._users = _UNOPENED
+
+    @property
+    def schema(self) -> SchemaFile:
+        """Field rules, compiled from the schema file and reloaded when it changes"""
+        schema = self._schema
+        if schema is None:
+            if self.schema_path is None:
+                return get_schema()
+            schema = self._schema = SchemaFile(self.schema_path)
+        return schema
+
+    @schema.setter
+    def schema(self, schema: SchemaFile) -> None:
+        self._schema = schema
+
+    @property
+    def uniqueness(self) -> Optional[UniquenessIndex]:
+        """Index of claimed usernames and emails, or None to skip the check"""
+        index = self._uniqueness
+        if index is _UNOPENED:
+            with _open_lock:
+                if self._uniqueness is _UNOPENED:
+                    self._uniqueness = (open_uniqueness_index(self.uniqueness_db)
+                                        if self.check_uniqueness else None)
+                index = self._uniqueness
+        return index
+
+    @uniqueness.setter
+    def uniqueness(self, index: Optional[UniquenessIndex]) -> None:
+        self._uniqueness = index
+
+    @property
+    def users(self) -> UserStore:
+        """Store new users are saved to"""
+        store = self._users
+        if store is _UNOPENED:
+            with _open_lock:
+                if self._users is _UNOPENED:
+                    self._users = open_user_store(self.user_db, on_failure=self._unsaved)
+                store = self._users
+        return store
+
+    @users.setter
+    def users(self, store: UserStore) -> None:
+        self._users = store
+
+    @property
+    def blocking(self) -> bool:
+        """True if a registration can wait on disk: the store or index is SQLite"""
+        index = self.uniqueness
+        return isinstance(self.users, SQLiteUserStore) or (
+            index is not None and isinstance(index.store, SQLiteStore)
+        )
+
+    def _unsaved(self, rows: List[tuple]) -> None:
+        """Free the names of users the store failed to write"""
+        index = self._uniqueness
+        if index is not _UNOPENED and index is not None:
+            for _, username, email, _, _ in rows:
+                index.release(username, email)
+
+    def close(self) -> None:
+        """Flush and close the store and index opened by this process"""
+        store, index = self._users, self._uniqueness
+        self._reset()
+        if store is not _UNOPENED:
+            store.close()
+        if index is not _UNOPENED and index is not None:
+            close = getattr(index.store, "close", None)
+            if close is not None:
+                close()
+
+    def _evaluate(self, data, locale: Optional[str]) -> Tuple[Optional[dict], List[ValidationError], int]:
+        """(body, [], status), or (None, errors, 400) when validation fails"""
+        # Turn away malformed and obviously invalid bodies before any parsing
+        validate = self.schema.validator()
+        rejected = screen(data, validate.prescreen)
+        if rejected is MALFORMED:
+            return INVALID_REQUEST, [], 400
+        if rejected:
+            return None, rejected, 400
+        return self._validate(data, locale, validate)
+
+    def _validate(self, data: dict, locale: Optional[str],
+                  validate: Validator) -> Tuple[Optional[dict], List[ValidationError], int]:
+        """_evaluate for a body that passed screen()"""
+        username = data.get("username", "")
+        email = data.get("email", "")
+        birth_date = data.get("birth_date", "")
+        
+        # Validate data
+        errors = validate(data, locale)
+        if errors:
+            return None, errors, 400
+        
+        # Reserve the username and email; taken ones are a conflict
+        index = self.uniqueness
+        if index is not None:
+            taken = index.claim(username, email)
+            if taken is not None:
+                return (USERNAME_TAKEN if taken == USERNAME else EMAIL_TAKEN), [], 409
+        
+        try:
+            user_id = self.users.add(username, email, normalize_birth_date(birth_date, locale))
+        except BaseException:
+            # Nothing was saved, so the names are still free
+            if index is not None:
+                index.release(username, email)
+            raise
+        return registration_success(user_id), [], 201
+
+    def outcome(self, data, locale: Optional[str] = None, codes: bool = False) -> tuple:
+        """See registration_outcome"""
+        body, errors, status = self._evaluate(data, locale)
+        if body is None:
+            body = validation_failure(errors, codes)
+        return body, status
+
+    def response(self, data, locale: Optional[str] = None,
+                 codes: bool = False) -> Tuple[bytes, int]:
+        """See registration_response"""
+        if not metrics.enabled:
+            body, status = self.outcome(data, locale, codes)
+            return _encode(body, status), status
+        
+        start = perf_counter()
+        validate = self.schema.validator()
+        rejected = screen(data, validate.prescreen)
+        if rejected is MALFORMED:
+            body, errors, status = INVALID_REQUEST, [], 400
+        elif rejected:
+            body, errors, status = None, rejected, 400
+        else:
+            body, errors, status = self._validate(data, locale, validate)
+        if body is None:
+            body = validation_failure(errors, codes)
+        validated = perf_counter()
+        encoded = _encode(body, status)
+        metrics.observe("registration_stage_seconds", "validate", validated - start)
+        metrics.observe("registration_stage_seconds", "serialize", perf_counter() - validated)
+        
+        if status == 201:
+            metrics.inc("registration_requests_total", "success")
+        elif body is INVALID_REQUEST:
+            metrics.inc("registration_requests_total", "invalid_request")
+        elif status == 409:
+            metrics.inc("registration_requests_total", "conflict")
+        elif rejected:
+            metrics.inc("registration_requests_total", "early_reject")
+            for error in errors:
+                metrics.inc("registration_errors_total", error.code)
+        else:
+            metrics.inc("registration_requests_total", "validation_failed")
+            for error in errors:
+                metrics.inc("registration_errors_total", error.code)
+        return encoded, status
+
+    def warm_up(self) -> None:
+        """See warm_up"""
+        enabled = metrics.enabled
+        metrics.enabled = False
+        try:
+            validate = self.schema.validator()
+            for locale in _WARM_UP_LOCALES:
+                for birth_date in _WARM_UP_DATES:
+                    validate({"username": "warmup", "email": "warmup@example.com",
+                              "birth_date": birth_date}, locale)
+                for data in _WARM_UP_BODIES:
+                    self.response(data, locale)
+                    self.response(data, locale, codes=True)
+            encode_success(1)
+        finally:
+            metrics.enabled = enabled
+
+
+# Every Registrations in this process, so a forked child can reset them
+_instances: "weakref.WeakSet[Registrations]" = weakref.WeakSet()
+_open_lock = threading.Lock()
+
+
+# Index and stores a forked child inherited; kept referenced so they are
+# never closed (or garbage collected) under the parent's feet
+_inherited: list = []
+
+
+def _after_fork_in_child() -> None:
+    global _open_lock
+    _open_lock = threading.Lock()
+    for registrations in list(_instances):
+        _inherited.append((registrations._uniqueness, registrations._users))
+        registrations._reset()
+
+
+def _close_all() -> None:
+    for registrations in list(_instances):
+        registrations.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_close_all)
+
+
+# Request bodies for warm_up(): each fails at a different stage, so none
+# of them claims a name or stores a user
+_WARM_UP_BODIES = (
+    [],
+    {"username": "ab", "email": "warm-up", "birth_date": ""},
+    {"username": "warmup", "email": "warmup@example.com", "birth_date": "not-a-date"},
+    {"username": "warmup", "email": "warmup@mailinator.com", "birth_date": "1990-05-15"},
+    {"username": "warmup", "email": "warmup@example.com", "birth_date": "2999-01-01"},
+    {"username": "warmup", "email": "warmup@example.com", "birth_date": "1850-01-01"},
+)
+# Valid bodies, only run through the validator
+_WARM_UP_DATES = ("1990-05-15", "05/15/1990", "15/05/1990")
+_WARM_UP_LOCALES = (None, "en-US,en;q=0.9", "en-GB,en;q=0.9", "de-DE,de;q=0.9")
+
+
+# Used by the module-level functions. Set UNIQUENESS_DB and USER_DB to
+# SQLite files to share claims, users and ID allocation between workers;
+# the rules are those of schema.get_schema()
+_default = Registrations(
+    user_db=os.environ.get("USER_DB"),
+    uniqueness_db=os.environ.get("UNIQUENESS_DB"),
+)
+
+
+def default_registrations() -> Registrations:
+    """Return the Registrations the module-level functions use"""
+    return _default
+
+
+def set_uniqueness_index(index: Optional[UniquenessIndex]) -> None:
+    """
+    Replace the index registrations are checked against
+    
+    Args:
+        index: New index, e.g. UniquenessIndex(SQLiteStore(path)) so that
+            all workers share one store, or None to skip the check
+    """
+    _default.uniqueness = index
+
+
+def get_uniqueness_index() -> Optional[UniquenessIndex]:
+    """Return the active uniqueness index, if any"""
+    return _default.uniqueness
+
+
+def set_user_store(store: UserStore) -> None:
+    """
+    Replace the store new users are saved to
+    
+    Args:
+        store: e.g. SQLiteUserStore(path)
+    """
+    _default.users = store
+
+
+def get_user_store() -> UserStore:
+    """Return the active user store"""
+    return _default.users
+
+
+def registration_outcome(data, locale: Optional[str] = None, codes: bool = False) -> tuple:
+    """
+    Validate one registration request body
+    
+    Args:
+        data: Decoded JSON request body
+        locale: Optional locale hint, e.g. the Accept-Language header
+        codes: Report validation errors as codes (see validation_failure)
+        
+    Returns:
+        (response_body, status_code)
+    """
+    return _default.outcome(data, locale, codes)
+
+
+def _encode(body: dict, status: int) -> bytes:
+    if status == 201:
+        return encode_success(body["user_id"])
+    encoded = _PREENCODED.get(id(body))
+    if encoded is None:
+        encoded = encode_response(body)
+    return encoded
+
+
+def registration_response(data, locale: Optional[str] = None,
+                          codes: bool = False) -> Tuple[bytes, int]:
+    """
+    Validate one registration request body and encode the response
+    
+    Args:
+        data: Decoded JSON request body
+        locale: Optional locale hint, e.g. the Accept-Language header
+        codes: Report validation errors as codes (see validation_failure)
+        
+    Returns:
+        (encoded_json_body, status_code)
+    """
+    return _default.response(data, locale, codes)
+
+
+def warm_up() -> None:
+    """
+    Prime this worker's caches before it takes traffic
+    
+    Runs sample bodies through screening, the compiled schema, the date
+    parser, email checks, locale resolution and response encoding, in
+    both error formats, so the first real requests do not pay for cold
+    caches and unspecialized code. Nothing is claimed or stored, and
+    metrics are paused meanwhile.
+    """
+    _default.warm_up()
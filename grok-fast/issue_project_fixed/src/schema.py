@@ -0,0 +1,311 @@
+"""
+Declarative registration rules
+JSON schemas compiled into specialized validator functions, reloaded on change
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from src.email_validation import check_email
+    from src.errors import MESSAGES, ValidationError
+    from src.validators import check_birth_date, normalize_text
+except ImportError:
+    from email_validation import check_email
+    from errors import MESSAGES, ValidationError
+    from validators import check_birth_date, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# The rules validate_registration_data has always applied
+DEFAULT_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "registration_schema.json")
+
+# Named checks a rule can call: name -> (function, takes the locale)
+CHECKS: Dict[str, Tuple[Callable, bool]] = {
+    "email": (check_email, False),
+    "birth_date": (check_birth_date, True),
+}
+
+# (data, locale) -> errors in field order
+Validator = Callable[[dict, Optional[str]], List[ValidationError]]
+
+
+class SchemaError(ValueError):
+    """The schema is malformed or refers to unknown codes or checks"""
+    pass
+
+
+def _length(rule: dict, key: str) -> int:
+    value = rule[key]
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise SchemaError(f"{key} must be a non-negative integer, got {value!r}")
+    return value
+
+
+def compile_schema(schema: dict, name: str = "<schema>") -> Validator:
+    """
+    Generate a validator function for a schema
+
+    A schema lists fields in the order their errors are reported:
+
+        {"fields": [
+            {"name": "username", "type": "string", "type_error": "username_too_short",
+             "rules": [{"min_length": 3, "error": "username_too_short"},
+                       {"max_length": 64, "error": "username_too_long"}]},
+            {"name": "email", "rules": [{"check": "email"}]}
+        ]}
+
+    A field's rules run in order and the first one that fails reports its
+    error code, so each field adds at most one error. Rules are
+    min_length, max_length, pattern (full match) and contains, which need a
+    string value, or check, which calls a function from CHECKS that
+    returns its own error. Missing fields read as "" unless a default is
+    given. With "normalize": true, string values are put in NFKC form
+    (normalize_text) before any rule sees them.
+
+    The fields and rules are unrolled into straight-line Python with every
+    constant inlined, so a call does no per-field interpretation.
+
+    A second function, validate.prescreen(data), runs only the rules that
+    come before a field's first check. They cost a length test or a
+    substring search at most, and the errors they find are the ones the
+    full validator would report for those fields, so a body failing them
+    can be rejected without calling any check (e.g. the date parser).
+
+    A third, validate.batch(rows, locale=None), validates many records and
+    calls each check once per distinct value of a string-typed field, so a
+    bulk import with few distinct birth dates parses each of them once.
+
+    Args:
+        schema: Decoded schema
+        name: Label for the generated code in tracebacks
+
+    Returns:
+        validate(data, locale=None) -> [ValidationError, ...]; its source
+        is kept as validate.source, the cheap rules as
+        validate.prescreen(data) -> [ValidationError, ...] and the bulk
+        form as validate.batch(rows, locale=None) -> [(index, errors), ...]
+        for the invalid rows
+
+    Raises:
+        SchemaError: for unknown rules, error codes or checks
+    """
+    fields = schema.get("fields") if isinstance(schema, dict) else None
+    if not isinstance(fields, list) or not fields:
+        raise SchemaError("schema needs a non-empty list of fields")
+
+    namespace: Dict[str, object] = {}
+
+    def constant(prefix: str, value: object) -> str:
+        symbol = f"_{prefix}{len(namespace)}"
+        namespace[symbol] = value
+        return symbol
+
+    def error(code: object) -> str:
+        if not isinstance(code, str) or code not in MESSAGES:
+            raise SchemaError(f"unknown error code {code!r}")
+        return constant("error", ValidationError(code))
+
+    def emit(target: List[str], reads: List[str], branches: List[Tuple[str, str, str]],
+             indent: str = "    ", batch: bool = False) -> None:
+        target.extend(indent + read for read in reads)
+        for index, (condition, action, batch_condition) in enumerate(branches):
+            condition = batch_condition if batch else condition
+            target.append(f"{indent}{'if' if index == 0 else 'elif'} {condition}:")
+            target.append(f"{indent}    {action}")
+
+    lines = ["def validate(data, locale=None):", "    errors = []"]
+    prescreen = ["def prescreen(data):", "    errors = []"]
+    batch: List[str] = []
+    memos: List[str] = []
+    for field in fields:
+        if not isinstance(field, dict) or not isinstance(field.get("name"), str):
+            raise SchemaError(f"field needs a name: {field!r}")
+        rules = field.get("rules", [])
+        if not isinstance(rules, list):
+            raise SchemaError(f"{field['name']}: rules must be a list, got {rules!r}")
+        default = field.get("default", "")
+        # Other defaults are bound rather than spelled out: repr(nan) is no literal
+        default = repr(default) if isinstance(default, str) else constant("default", default)
+        reads = [f"value = data.get({field['name']!r}, {default})"]
+        if field.get("normalize"):
+            reads.append("if isinstance(value, str):")
+            reads.append(f"    value = {constant('normalize', normalize_text)}(value)")
+        # (condition, action, condition in batch)
+        branches: List[Tuple[str, str, str]] = []
+        # Branches before the first check, which prescreen runs
+        cheap: Optional[int] = None
+        field_type = field.get("type")
+        if field_type is not None:
+            if field_type != "string":
+                raise SchemaError(f"unsupported type {field_type!r}")
+            type_error = field.get("type_error")
+            if type_error is None and rules and isinstance(rules[0], dict):
+                type_error = rules[0].get("error")
+            if type_error is None:
+                raise SchemaError(f"{field['name']}: type needs a type_error or a first rule error")
+            condition = "not isinstance(value, str)"
+            branches.append((condition, f"errors.append({error(type_error)})", condition))
+        for rule in rules:
+            if not isinstance(rule, dict):
+                raise SchemaError(f"rule must be an object: {rule!r}")
+            if "check" in rule:
+                check = CHECKS.get(rule["check"]) if isinstance(rule["check"], str) else None
+                if check is None:
+                    raise SchemaError(f"unknown check {rule['check']!r}")
+                function, takes_locale = check
+                if cheap is None:
+                    cheap = len(branches)
+                call = f"{constant('check', function)}(value{', locale' if takes_locale else ''})"
+                condition = f"(error := {call}) is not None"
+                batch_condition = condition
+                if field_type == "string":
+                    # Typed values are strings by now, so a batch can remember
+                    # the verdict for each distinct one
+                    memo = f"memo{len(memos)}"
+                    memos.append(f"    {memo} = {{}}")
+                    batch_condition = (f"(error := {memo}[value] if value in {memo} "
+                                       f"else {memo}.setdefault(value, {call})) is not None")
+                branches.append((condition, "errors.append(error)", batch_condition))
+                continue
+            if field_type != "string":
+                raise SchemaError(f"{field['name']}: {sorted(rule)} needs type string")
+            append = f"errors.append({error(rule.get('error'))})"
+            if "min_length" in rule:
+                condition = f"len(value) < {_length(rule, 'min_length')}"
+            elif "max_length" in rule:
+                condition = f"len(value) > {_length(rule, 'max_length')}"
+            elif "pattern" in rule:
+                try:
+                    pattern = re.compile(rule["pattern"])
+                except (re.error, TypeError) as exc:
+                    raise SchemaError(f"bad pattern {rule['pattern']!r}: {exc}") from None
+                condition = f"{constant('pattern', pattern)}.fullmatch(value) is None"
+            elif "contains" in rule:
+                if not isinstance(rule["contains"], str):
+                    raise SchemaError("contains needs a string")
+                condition = f"{rule['contains']!r} not in value"
+            else:
+                raise SchemaError(f"unknown rule {rule!r}")
+            branches.append((condition, append, condition))
+        emit(lines, reads, branches)
+        emit(batch, reads, branches, indent="        ", batch=True)
+        if cheap is None:
+            cheap = len(branches)
+        if cheap:
+            emit(prescreen, reads, branches[:cheap])
+    lines.append("    return errors")
+    prescreen.append("    return errors")
+    batch = (["def batch(rows, locale=None):", "    invalid = []"] + memos
+             + ["    for index, data in enumerate(rows):", "        errors = []"] + batch
+             + ["        if errors:", "            invalid.append((index, errors))", "    return invalid"])
+
+    source = "\n".join(lines + [""] + prescreen + [""] + batch) + "\n"
+    exec(compile(source, name, "exec"), namespace)
+    validate = namespace["validate"]
+    validate.source = source
+    validate.prescreen = namespace["prescreen"]
+    validate.batch = namespace["batch"]
+    return validate
+
+
+def load_schema(path: str) -> Validator:
+    """Read and compile a schema file"""
+    with open(path, "rb") as schema_file:
+        try:
+            schema = json.loads(schema_file.read())
+        except ValueError as exc:
+            raise SchemaError(f"{path}: {exc}") from None
+    return compile_schema(schema, f"<schema {os.path.basename(path)}>")
+
+
+class SchemaFile:
+    """
+    Compiled validator for a schema file, recompiled when the file changes
+
+    The file's modification time and size are checked at most once per
+    check_interval seconds, so every worker picks up an edited schema
+    without a restart. The new validator replaces the old one in a single
+    assignment; a request uses either the old or the new rules, never a
+    mix. A schema that fails to load is logged and the previous validator
+    kept.
+    """
+
+    def __init__(self, path: str = DEFAULT_SCHEMA_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._validator = load_schema(path)
+        self._next_check = time.monotonic() + check_interval
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> bool:
+        """
+        Recompile the schema if the file changed
+
+        Returns:
+            True if a new validator was installed
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp is None or stamp == self._stamp:
+                return False
+            try:
+                validator = load_schema(self.path)
+            except Exception:
+                # Whatever is wrong with the file, requests keep the old rules
+                logger.exception("Keeping the previous rules; cannot load %s", self.path)
+                self._stamp = stamp  # do not retry until it changes again
+                return False
+            self._stamp = stamp
+            self._validator = validator
+            self.reloads += 1
+            return True
+
+    def validator(self) -> Validator:
+        """Return the current validator, reloading first if it is time to"""
+        if time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.check_interval
+            self.reload()
+        return self._validator
+
+
+# Schema validate_registration_data and the default registrations use, set
+# by REGISTRATION_SCHEMA or the built-in rules; loaded on first use
+_default: Optional[SchemaFile] = None
+_default_lock = threading.Lock()
+
+
+def get_schema() -> SchemaFile:
+    """Return the registration schema in force"""
+    global _default
+    schema = _default
+    if schema is None:
+        with _default_lock:
+            if _default is None:
+                _default = SchemaFile(os.environ.get("REGISTRATION_SCHEMA") or DEFAULT_SCHEMA_PATH)
+            schema = _default
+    return schema
+
+
+def set_schema(schema: SchemaFile) -> None:
+    """
+    Replace the rules registrations are validated against
+
+    Args:
+        schema: e.g. SchemaFile("rules.json")
+    """
+    global _default
+    _default = schema
@@ -0,0 +1,366 @@
+"""
+Username and email uniqueness
+Bloom filter in front of a pluggable store of claimed keys
+"""
+import math
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+try:
+    from src.email_validation import normalize_email
+    from src.validators import fold_text
+except ImportError:
+    from email_validation import normalize_email
+    from validators import fold_text
+
+USERNAME = "username"
+EMAIL = "email"
+KINDS = (USERNAME, EMAIL)
+
+
+def username_key(username: str) -> str:
+    """Uniqueness key for a username: "Alice", "ALICE" and "\uff21lice" collide"""
+    return fold_text(username)
+
+
+def email_key(email: str) -> str:
+    """Uniqueness key for an email address, IDNA domain, NFKC and case folded"""
+    return fold_text(normalize_email(email) or email)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    Membership tests may return false positives at roughly error_rate
+    while no more than capacity keys have been added, and never false
+    negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> range:
+        # Double hashing: k positions h1 + i*h2 from the two halves of the
+        # string's SipHash, returned as a range to be reduced modulo size.
+        # hash() is salted per process, which is fine since filters are
+        # never shared and keeps crafted colliding keys out
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return range(h1, h1 + self.hash_count * h2, h2)
+
+    def add(self, key: str) -> None:
+        """Add a key"""
+        bits, size = self._bits, self.size
+        for position in self._positions(key):
+            position %= size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Add many keys"""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits, size = self._bits, self.size
+        for position in self._positions(key):
+            position %= size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class UniquenessStore(ABC):
+    """
+    Authoritative record of claimed keys
+
+    Subclasses must make claim() atomic: of several concurrent claims for
+    the same key exactly one may succeed, across processes if the store is
+    shared.
+    """
+
+    @abstractmethod
+    def contains(self, kind: str, key: str) -> bool:
+        """Return True if key has been claimed"""
+
+    @abstractmethod
+    def claim(self, keys: Dict[str, str]) -> Optional[str]:
+        """
+        Claim all keys or none of them
+
+        Args:
+            keys: kind -> normalized key
+
+        Returns:
+            None on success, else the first kind whose key was already taken
+        """
+
+    @abstractmethod
+    def release(self, keys: Dict[str, str]) -> None:
+        """
+        Give up claimed keys, e.g. when the registration was not saved
+
+        Args:
+            keys: kind -> normalized key
+        """
+
+    @abstractmethod
+    def iter_keys(self, kind: str) -> Iterator[str]:
+        """Yield every claimed key of one kind"""
+
+    @abstractmethod
+    def count(self, kind: str) -> int:
+        """Number of claimed keys of one kind"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget every claim"""
+
+
+class MemoryStore(UniquenessStore):
+    """Per-process store backed by sets; for tests and single-worker use"""
+
+    def __init__(self):
+        self._keys: Dict[str, Set[str]] = {kind: set() for kind in KINDS}
+        self._lock = threading.Lock()
+
+    def contains(self, kind: str, key: str) -> bool:
+        return key in self._keys[kind]
+
+    def claim(self, keys: Dict[str, str]) -> Optional[str]:
+        with self._lock:
+            for kind, key in keys.items():
+                if key in self._keys[kind]:
+                    return kind
+            for kind, key in keys.items():
+                self._keys[kind].add(key)
+        return None
+
+    def release(self, keys: Dict[str, str]) -> None:
+        with self._lock:
+            for kind, key in keys.items():
+                self._keys[kind].discard(key)
+
+    def iter_keys(self, kind: str) -> Iterator[str]:
+        return iter(list(self._keys[kind]))
+
+    def count(self, kind: str) -> int:
+        return len(self._keys[kind])
+
+    def clear(self) -> None:
+        with self._lock:
+            for keys in self._keys.values():
+                keys.clear()
+
+
+class SQLiteStore(UniquenessStore):
+    """
+    Store shared by every worker through one SQLite database
+
+    The primary key makes claims atomic across processes.
+    """
+
+    # Rows fetched per round trip when rebuilding a filter
+    FETCH_SIZE = 10000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS unique_keys ("
+                " kind TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (kind, key)"
+                ") WITHOUT ROWID"
+            )
+
+    def contains(self, kind: str, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM unique_keys WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        return row is not None
+
+    def claim(self, keys: Dict[str, str]) -> Optional[str]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for kind, key in keys.items():
+                    self._conn.execute(
+                        "INSERT INTO unique_keys (kind, key) VALUES (?, ?)", (kind, key)
+                    )
+            except sqlite3.IntegrityError:
+                self._conn.execute("ROLLBACK")
+                for kind, key in keys.items():
+                    if self._conn.execute(
+                        "SELECT 1 FROM unique_keys WHERE kind = ? AND key = ?", (kind, key)
+                    ).fetchone() is not None:
+                        return kind
+                raise
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return None
+
+    def release(self, keys: Dict[str, str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM unique_keys WHERE kind = ? AND key = ?", list(keys.items())
+            )
+
+    def iter_keys(self, kind: str) -> Iterator[str]:
+        with self._lock:
+            cursor = self._conn.execute("SELECT key FROM unique_keys WHERE kind = ?", (kind,))
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+            if not rows:
+                return
+            for (key,) in rows:
+                yield key
+
+    def count(self, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM unique_keys WHERE kind = ?", (kind,)
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM unique_keys")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class UniquenessIndex:
+    """
+    Uniqueness checks that usually skip the store
+
+    A key that is not in the Bloom filter has certainly not been claimed,
+    so only filter hits (taken keys and rare false positives) are looked up
+    in the store. Claims always go to the store, which settles races. The
+    filters are rebuilt from the store on construction and whenever they
+    outgrow their capacity.
+
+    With a store shared between workers, a filter only knows the keys
+    claimed before its last rebuild plus those claimed through this index;
+    a key claimed elsewhere since then is still caught by claim().
+    """
+
+    def __init__(self, store: UniquenessStore, capacity: int = 1_000_000,
+                 error_rate: float = 0.01):
+        self.store = store
+        self.error_rate = error_rate
+        self._capacity = capacity
+        self._filters: Dict[str, BloomFilter] = {}
+        self.store_lookups = 0
+        # Keeps claims from landing in a filter that a rebuild is replacing
+        self._lock = threading.RLock()
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Reload both filters from the store in bulk"""
+        with self._lock:
+            filters = {}
+            for kind in KINDS:
+                capacity = max(self._capacity, self.store.count(kind) * 2)
+                bloom = BloomFilter(capacity, self.error_rate)
+                bloom.update(self.store.iter_keys(kind))
+                filters[kind] = bloom
+            self._filters = filters
+
+    def _maybe_taken(self, kind: str, key: str) -> bool:
+        if key not in self._filters[kind]:
+            return False
+        self.store_lookups += 1
+        return self.store.contains(kind, key)
+
+    def is_taken(self, username: Optional[str] = None,
+                 email: Optional[str] = None) -> Optional[str]:
+        """
+        Check availability without claiming anything
+
+        Returns:
+            USERNAME or EMAIL for the first value already taken, else None
+        """
+        if username is not None and self._maybe_taken(USERNAME, username_key(username)):
+            return USERNAME
+        if email is not None and self._maybe_taken(EMAIL, email_key(email)):
+            return EMAIL
+        return None
+
+    def claim(self, username: str, email: str) -> Optional[str]:
+        """
+        Reserve a username and email together
+
+        Returns:
+            None if both were free and are now claimed, else USERNAME or
+            EMAIL for the first value already taken
+        """
+        keys = {USERNAME: username_key(username), EMAIL: email_key(email)}
+        for kind, key in keys.items():
+            if self._maybe_taken(kind, key):
+                return kind
+        with self._lock:
+            taken = self.store.claim(keys)
+            if taken is not None:
+                return taken
+            for kind, key in keys.items():
+                self._filters[kind].add(key)
+            if any(bloom.count > bloom.capacity for bloom in self._filters.values()):
+                self.rebuild()
+        return None
+
+    def release(self, username: str, email: str) -> None:
+        """
+        Free a username and email claimed together
+
+        The filters keep their bits, so the names now cost a store lookup
+        when checked, which finds them free.
+        """
+        self.store.release({USERNAME: username_key(username), EMAIL: email_key(email)})
+
+    def clear(self) -> None:
+        """Forget every claim and empty the filters"""
+        self.store.clear()
+        self.rebuild()
+
+    def info(self) -> dict:
+        """Return filter and store statistics"""
+        info = {
+            kind: {"keys": bloom.count, "capacity": bloom.capacity}
+            for kind, bloom in self._filters.items()
+        }
+        info["store_lookups"] = self.store_lookups
+        return info
+
+
+def open_uniqueness_index(path: Optional[str] = None) -> UniquenessIndex:
+    """
+    Build an index over a SQLite store at path, or an in-memory one
+
+    Args:
+        path: SQLite database file shared by all workers; None keeps
+            claims in this process only
+    """
+    store = SQLiteStore(path) if path else MemoryStore()
+    return UniquenessIndex(store)
@@ -0,0 +1,336 @@
+"""
+User persistence
+Block-allocated user IDs and write-behind batched inserts into SQLite
+"""
+import itertools
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# IDs reserved from the database per round trip
+DEFAULT_BLOCK_SIZE = 1000
+# Rows written per transaction, at most
+DEFAULT_BATCH_SIZE = 500
+# Longest time a registration waits in the queue before it is written
+DEFAULT_FLUSH_INTERVAL = 0.05
+# Registrations queued before add() blocks
+DEFAULT_QUEUE_SIZE = 10000
+
+
+class UserStore(ABC):
+    """Registered users; add() assigns the user ID"""
+
+    @abstractmethod
+    def add(self, username: str, email: str, birth_date: str) -> int:
+        """
+        Store a new user
+
+        Args:
+            username: Username as submitted
+            email: Email address as submitted
+            birth_date: Birth date, ISO formatted
+
+        Returns:
+            The new user's ID
+        """
+
+    @abstractmethod
+    def get(self, user_id: int) -> Optional[dict]:
+        """Return the user with this ID, or None"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored users"""
+
+    def flush(self) -> None:
+        """Block until every add() so far is durable"""
+
+    def close(self) -> None:
+        """Flush and release resources"""
+
+
+class MemoryUserStore(UserStore):
+    """Per-process store for tests and single-worker use"""
+
+    def __init__(self):
+        self._users: Dict[int, dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, username: str, email: str, birth_date: str) -> int:
+        with self._lock:
+            user_id = next(self._ids)
+            self._users[user_id] = {
+                "id": user_id, "username": username, "email": email, "birth_date": birth_date,
+            }
+        return user_id
+
+    def get(self, user_id: int) -> Optional[dict]:
+        user = self._users.get(user_id)
+        return dict(user) if user is not None else None
+
+    def count(self) -> int:
+        return len(self._users)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections to one database
+
+    Connections are opened on demand, up to size, and handed to one thread
+    at a time; callers beyond that wait for a connection to be returned.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.path = path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the with block"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                conn = self._open() if len(self._all) < self.size else None
+                if conn is not None:
+                    self._all.append(conn)
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close every connection"""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+
+class IdAllocator:
+    """
+    Hands out user IDs from blocks reserved in the database
+
+    One short transaction reserves block_size IDs, which are then assigned
+    in memory. Every process reserves its own blocks, so IDs are unique
+    across workers; unused IDs of a block are skipped when a worker exits.
+    """
+
+    def __init__(self, pool: ConnectionPool, block_size: int = DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.pool = pool
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                start = conn.execute(
+                    "SELECT next_id FROM id_sequence WHERE name = 'users'"
+                ).fetchone()[0]
+                conn.execute(
+                    "UPDATE id_sequence SET next_id = ? WHERE name = 'users'",
+                    (start + self.block_size,),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        self._next, self._end = start, start + self.block_size
+
+    def allocate(self) -> int:
+        """Return an unused user ID"""
+        with self._lock:
+            if self._next >= self._end:
+                self._reserve()
+            user_id = self._next
+            self._next += 1
+            return user_id
+
+
+class SQLiteUserStore(UserStore):
+    """
+    Users in a SQLite database (WAL mode), shared by all workers
+
+    With write_behind, add() returns as soon as the ID is allocated and the
+    row is queued; a writer thread groups queued rows into one transaction
+    per batch_size rows or flush_interval seconds, whichever comes first.
+    Rows still queued are lost if the process dies, so flush() before
+    anything that must see them from another process. Without
+    write_behind every add() commits its own transaction.
+
+    A batch that cannot be written is logged, counted in failed_rows and
+    passed to on_failure, so the caller can undo what it did for those
+    users (add() has already returned their IDs). Open the store in the
+    process that uses it: its connections and writer thread do not
+    survive a fork.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 write_behind: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 on_failure: Optional[Callable[[List[tuple]], None]] = None):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " id INTEGER PRIMARY KEY, username TEXT NOT NULL, email TEXT NOT NULL,"
+                " birth_date TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS id_sequence ("
+                " name TEXT PRIMARY KEY, next_id INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO id_sequence (name, next_id) VALUES ('users', 1)")
+        self.ids = IdAllocator(self.pool, block_size)
+        self.write_behind = write_behind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batches_written = 0
+        self.failed_rows = 0
+        self.on_failure = on_failure
+        # Rows queued but not yet committed, so get() can read its own writes
+        self._pending: Dict[int, tuple] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        if write_behind:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="user-store-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _insert(self, rows: List[tuple]) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO users (id, username, email, birth_date, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)", rows,
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        self.batches_written += 1
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            rows, waiters = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+                remaining = deadline - time.monotonic()
+                if len(rows) >= self.batch_size or remaining <= 0 or waiters:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # stop after this batch
+                    break
+            if rows:
+                try:
+                    self._insert(rows)
+                except sqlite3.Error:
+                    logger.exception("Failed to write %d users", len(rows))
+                    self.failed_rows += len(rows)
+                    if self.on_failure is not None:
+                        try:
+                            self.on_failure(rows)
+                        except Exception:
+                            logger.exception("on_failure failed for %d users", len(rows))
+                for row in rows:
+                    self._pending.pop(row[0], None)
+            for waiter in waiters:
+                waiter.set()
+
+    def add(self, username: str, email: str, birth_date: str) -> int:
+        user_id = self.ids.allocate()
+        row = (user_id, username, email, birth_date, time.time())
+        if self._writer is None:
+            self._insert([row])
+        else:
+            self._pending[user_id] = row
+            self._queue.put(row)
+        return user_id
+
+    def get(self, user_id: int) -> Optional[dict]:
+        row = self._pending.get(user_id)
+        if row is None:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT id, username, email, birth_date, created_at FROM users WHERE id = ?",
+                    (user_id,),
+                ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "username": row[1], "email": row[2], "birth_date": row[3]}
+
+    def count(self) -> int:
+        self.flush()
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def flush(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self.pool.close()
+
+
+def open_user_store(path: Optional[str] = None,
+                    on_failure: Optional[Callable[[List[tuple]], None]] = None) -> UserStore:
+    """
+    Open a SQLite user store at path, or an in-memory one
+
+    Args:
+        path: SQLite database file shared by all workers; None keeps users
+            in this process only
+        on_failure: Called with the (id, username, email, birth_date,
+            created_at) rows of a batch that could not be written
+    """
+    return SQLiteUserStore(path, on_failure=on_failure) if path else MemoryUserStore()
@@ -0,0 +1,278 @@
+"""
+Command-line validator for registration files
+
+Streams a JSONL file (one record per line) or a JSON document through the
+registration validators in bounded memory, writes one NDJSON verdict per
+record and prints a summary to stderr.
+
+Usage:
+    python -m src.validate_file data/sample_requests.json
+    python -m src.validate_file big.jsonl --output verdicts.jsonl --workers 8
+"""
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from typing import IO, Iterable, Iterator, List
+
+try:
+    from src.date_parser import parse_date
+    from src.parallel import ParallelValidator
+    from src.validators import UNPARSED_FORMAT, validate_registration_batch
+except ImportError:
+    from date_parser import parse_date
+    from parallel import ParallelValidator
+    from validators import UNPARSED_FORMAT, validate_registration_batch
+
+DEFAULT_CHUNK_SIZE = 2000
+READ_SIZE = 64 * 1024
+
+# Longest array element, in characters, held in memory; longer ones are
+# skipped as invalid records
+MAX_RECORD_SIZE = 1024 * 1024
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+INVALID_RECORD = "Invalid request data"
+# Summary key for records that are not objects, as in the request metrics
+INVALID_RECORD_CODE = "invalid_request"
+
+
+def _unwrap(record):
+    """Sample files wrap each request body as {"request": {...}}"""
+    if isinstance(record, dict) and isinstance(record.get("request"), dict):
+        return record["request"]
+    return record
+
+
+def iter_jsonl(stream: IO[str]) -> Iterator:
+    """Yield one decoded record per non-blank line; bad lines yield None"""
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield _unwrap(json.loads(line))
+        except ValueError:
+            yield None
+
+
+# Characters that matter when looking for the end of an array element; a
+# backslash is matched with the character it escapes
+_STRUCTURAL = re.compile(r'\\.?|[\[\]{},"]', re.DOTALL)
+
+# Scan state at the start of an element: (depth, in a string, after a backslash)
+_ELEMENT_START = (0, False, False)
+
+
+def _element_end(text: str, start: int, state: tuple) -> tuple:
+    """
+    Find the top-level "," or "]" after an array element
+
+    Strings and nested values are stepped over without being decoded, so
+    malformed elements can be skipped. The state carries over to the next
+    chunk of an element that does not end in text.
+
+    Returns:
+        (index of the separator or -1, state at the end of text)
+    """
+    depth, in_string, escaped = state
+    if escaped:
+        # The previous chunk ended in a backslash
+        start += 1
+        escaped = False
+    for match in _STRUCTURAL.finditer(text, start):
+        char = match.group()
+        if char[0] == "\\":
+            escaped = len(char) == 1
+        elif char == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char in "[{":
+            depth += 1
+        elif depth:
+            if char in "]}":
+                depth -= 1
+        elif char != "}":
+            return match.start(), _ELEMENT_START
+    return -1, (depth, in_string, escaped)
+
+
+def iter_json_array(stream: IO[str], max_record_size: int = MAX_RECORD_SIZE) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array without loading it whole
+
+    Like iter_jsonl, an element that cannot be decoded yields None and
+    reading resumes after the next top-level ",". Elements longer than
+    max_record_size characters are skipped the same way without being
+    held in memory, as is a final element cut off by the end of the file.
+
+    A top-level object is read in full; its "test_cases" list is used as
+    the records, as in data/sample_requests.json.
+    """
+    decoder = json.JSONDecoder()
+    buffer = stream.read(READ_SIZE).lstrip()
+    if not buffer.startswith("["):
+        # Whole-document fallback for objects
+        document = json.loads(buffer + stream.read())
+        records = document.get("test_cases", []) if isinstance(document, dict) else []
+        for record in records:
+            yield _unwrap(record)
+        return
+
+    position = 1
+    eof = False
+    while True:
+        # Skip whitespace and separators between elements
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        if position >= len(buffer):
+            if eof:
+                return
+            chunk = stream.read(READ_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            end = None
+        # A value touching the end of the buffer may be truncated
+        if end is not None and (end < len(buffer) or eof):
+            yield _unwrap(record)
+            position = end
+            continue
+
+        # Undecodable, or not complete yet: see whether the element ends here
+        stop, state = _element_end(buffer, position, _ELEMENT_START)
+        if stop >= 0:
+            yield None
+            position = stop
+            continue
+        if eof:
+            yield None
+            return
+        if len(buffer) - position > max_record_size:
+            # Too long to hold: skip to its end chunk by chunk
+            while stop < 0:
+                buffer = stream.read(READ_SIZE)
+                if not buffer:
+                    break
+                stop, state = _element_end(buffer, 0, state)
+            yield None
+            if stop < 0:
+                return
+            position = stop
+            continue
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_records(path: str, stream: IO[str]) -> Iterator:
+    """Pick the reader for a file based on its suffix"""
+    if path.lower().endswith(JSONL_SUFFIXES):
+        return iter_jsonl(stream)
+    return iter_json_array(stream)
+
+
+def validate_chunk(records: List) -> List[dict]:
+    """
+    Validate one chunk of records
+
+    Args:
+        records: Decoded records; anything that is not a dict is invalid
+
+    Returns:
+        One verdict dict per record, in order
+    """
+    rows = [record for record in records if isinstance(record, dict)]
+    result = validate_registration_batch(records=rows)
+
+    verdicts = []
+    row = 0
+    for record in records:
+        if not isinstance(record, dict):
+            verdicts.append({"valid": False, "errors": [INVALID_RECORD],
+                             "codes": [INVALID_RECORD_CODE], "date_format": None})
+            continue
+        birth_date = record.get("birth_date", "")
+        parsed = parse_date(birth_date) if birth_date and isinstance(birth_date, str) else None
+        verdicts.append({
+            "valid": result.valid[row],
+            "errors": result.errors.get(row, []),
+            "codes": result.codes.get(row, []),
+            "date_format": parsed[1] if parsed else None,
+        })
+        row += 1
+    return verdicts
+
+
+def iter_verdicts(records: Iterable, workers: int = 1,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Validate records in order, optionally across a process pool
+
+    Memory stays bounded regardless of input size; see ParallelValidator.
+    """
+    with ParallelValidator(workers, chunk_size) as validator:
+        yield from validator.imap(records, validate_chunk)
+
+
+def run(path: str, output: IO[str], workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Validate a file and write NDJSON verdicts
+
+    Returns:
+        Summary dictionary with totals, error codes and date formats
+    """
+    total = valid = 0
+    errors = Counter()
+    formats = Counter()
+    with open(path, encoding="utf-8") as stream:
+        records = iter_records(path, stream)
+        for index, verdict in enumerate(iter_verdicts(records, workers, chunk_size)):
+            total += 1
+            valid += verdict["valid"]
+            errors.update(verdict["codes"])
+            formats[verdict["date_format"] or UNPARSED_FORMAT] += 1
+            output.write(json.dumps({"index": index, **verdict}) + "\n")
+    return {
+        "total": total,
+        "valid": valid,
+        "invalid": total - valid,
+        "errors": dict(errors.most_common()),
+        "date_formats": dict(formats.most_common()),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.validate_file",
+        description="Validate a JSONL or JSON file of registration records",
+    )
+    parser.add_argument("path", help="JSONL (.jsonl/.ndjson) or JSON file")
+    parser.add_argument("--output", "-o", help="write verdicts here instead of stdout")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="records per work unit (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be positive")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            summary = run(args.path, output, args.workers, args.chunk_size)
+    else:
+        summary = run(args.path, sys.stdout, args.workers, args.chunk_size)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,38 @@
 Date validation module
 Now supports multiple common date formats for cross-browser compatibility
 """
-from datetime import datetime
-from typing import Tuple
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from src.date_parser import EU_FORMAT, ISO_FORMAT, parse_date
+    from src.date_table import DateTable
+    from src.errors import (
+        DATE_EMPTY_ERROR,
+        DATE_FUTURE_ERROR,
+        ValidationError,
+        date_out_of_range,
+        invalid_date_format,
+    )
+    from src.locales import DEFAULT_LOCALE, DEFAULT_ORDER, resolve_locale
+    from src.metrics import metrics
+except ImportError:
+    from date_parser import EU_FORMAT, ISO_FORMAT, parse_date
+    from date_table import DateTable
+    from errors import (
+        DATE_EMPTY_ERROR,
+        DATE_FUTURE_ERROR,
+        ValidationError,
+        date_out_of_range,
+        invalid_date_format,
+    )
+    from locales import DEFAULT_LOCALE, DEFAULT_ORDER, resolve_locale
+    from metrics import metrics
 
 
 class DateValidationError(Exception):
@@ -11,7 +41,300 @@ class DateValidationError(Exception):
     pass
 
 
-def validate_birth_date(date_string: str) -> Tuple[bool, str]:
+# Earliest accepted birth year; the latest is the current year
+MIN_BIRTH_YEAR = 1900
+
+# Label for date strings that match none of the supported formats
+UNPARSED_FORMAT = "unparsed"
+
+_DATE_VALID = (True, "Date format is valid")
+
+
+class Clock:
+    """
+    Shared source of today's date and the allowed birth-year window
+    
+    The wall clock is read at most once per tick (and always again at local
+    midnight); between refreshes callers only pay for a monotonic clock
+    read. Tests can freeze it to make time-dependent checks deterministic.
+    """
+    
+    def __init__(self, tick: Optional[float] = None,
+                 now: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            tick: Maximum seconds between refreshes; None refreshes only
+                at midnight
+            now: Wall clock, injectable for tests
+        """
+        self.tick = tick
+        self._now = now
+        self._today: Optional[date] = None
+        self._expires = 0.0
+        self._frozen: Optional[date] = None
+    
+    def _refresh(self) -> date:
+        now = self._now()
+        today = now.date()
+        # Real seconds until the next local midnight; subtracting naive
+        # datetimes would be an hour off across a DST change
+        midnight = time.mktime((today.year, today.month, today.day + 1, 0, 0, 0, 0, 0, -1))
+        remaining = midnight - now.timestamp()
+        if self.tick is not None:
+            remaining = min(remaining, self.tick)
+        self._today = today
+        self._expires = time.monotonic() + remaining
+        return self._today
+    
+    def today(self) -> date:
+        """Return today's date"""
+        if self._frozen is not None:
+            return self._frozen
+        if self._today is None or time.monotonic() >= self._expires:
+            return self._refresh()
+        return self._today
+    
+    def year_bounds(self) -> Tuple[int, int]:
+        """Return the inclusive (earliest, latest) accepted birth year"""
+        return MIN_BIRTH_YEAR, self.today().year
+    
+    def freeze(self, day: date) -> None:
+        """Pin today() to a fixed date until unfreeze()"""
+        self._frozen = day
+    
+    def unfreeze(self) -> None:
+        """Go back to reading the wall clock"""
+        self._frozen = None
+        self._today = None
+
+
+# Clock read by every validator
+clock = Clock()
+
+
+class BirthDateCache:
+    """
+    Bounded LRU cache of birth date validation results
+    
+    Entries are (error, detected format) pairs keyed on the raw date
+    string, paired with the slash format order when a locale changes it. Results depend on the current day
+    (future and year-range checks), so the whole cache is invalidated as
+    soon as it is consulted on a different day than it was filled.
+    """
+    
+    def __init__(self, maxsize: int = 50000):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._today: Optional[date] = None
+        self._lock = threading.Lock()
+    
+    def _check_day(self, today: date) -> None:
+        # Caller holds the lock
+        if today != self._today:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._today = today
+    
+    def get(self, date_string: Hashable, today: date) -> Optional[tuple]:
+        """Return the cached result for date_string, or None on a miss"""
+        with self._lock:
+            self._check_day(today)
+            result = self._entries.get(date_string)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(date_string)
+            self.hits += 1
+            return result
+    
+    def put(self, date_string: Hashable, today: date, result: tuple) -> None:
+        """Store a result computed for the given day"""
+        with self._lock:
+            self._check_day(today)
+            self._entries[date_string] = result
+            self._entries.move_to_end(date_string)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._today = None
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+    
+    def info(self) -> dict:
+        """Return cache statistics"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+# Optional cache in front of validate_birth_date, disabled by default
+_birth_date_cache: Optional[BirthDateCache] = None
+
+
+def enable_birth_date_cache(maxsize: int = 50000) -> BirthDateCache:
+    """
+    Put a bounded LRU cache in front of validate_birth_date
+    
+    Args:
+        maxsize: Maximum number of distinct date strings to keep
+        
+    Returns:
+        The newly installed cache
+    """
+    global _birth_date_cache
+    _birth_date_cache = BirthDateCache(maxsize)
+    return _birth_date_cache
+
+
+def disable_birth_date_cache() -> None:
+    """Remove the validate_birth_date cache"""
+    global _birth_date_cache
+    _birth_date_cache = None
+
+
+def get_birth_date_cache() -> Optional[BirthDateCache]:
+    """Return the active validate_birth_date cache, if any"""
+    return _birth_date_cache
+
+
+# Optional table of every valid birth date spelling, disabled by default
+_date_table: Optional[DateTable] = None
+
+
+def enable_date_table(build: bool = True) -> DateTable:
+    """
+    Validate birth dates by table lookup instead of parsing
+    
+    Valid dates are then found with one dict lookup; invalid ones miss and
+    still go through the parser (and the cache, if enabled). The table
+    holds every spelling of every date since MIN_BIRTH_YEAR, about 400k
+    strings or 35 MB, and grows by one year each new year.
+    
+    Args:
+        build: Fill the table now (~0.3 s) rather than on first use
+        
+    Returns:
+        The newly installed table
+    """
+    global _date_table
+    table = DateTable(MIN_BIRTH_YEAR)
+    if build:
+        table.extend_to(clock.today().year)
+    _date_table = table
+    return table
+
+
+def disable_date_table() -> None:
+    """Go back to parsing every birth date"""
+    global _date_table
+    _date_table = None
+
+
+def get_date_table() -> Optional[DateTable]:
+    """Return the active date table, if any"""
+    return _date_table
+
+
+def _count_format(fmt: Optional[str], locale: str, slash_formats: Tuple[str, ...]) -> None:
+    """Record which format a date was read in (None: unparsed)"""
+    metrics.inc("birth_date_formats_total", fmt or UNPARSED_FORMAT)
+    if fmt is not None and fmt != ISO_FORMAT:
+        # How often the locale's first guess is right
+        if fmt == slash_formats[0]:
+            metrics.inc("birth_date_locale_hits_total", locale)
+        else:
+            metrics.inc("birth_date_locale_misses_total", locale)
+
+
+def _check_birth_date(date_string: str, today: date,
+                      slash_formats: Tuple[str, ...] = DEFAULT_ORDER
+                      ) -> Tuple[Optional[ValidationError], Optional[str]]:
+    """
+    Parse and range-check a non-empty date string relative to today
+    
+    Returns:
+        (error or None, format the date was read in or None if unparsed)
+    """
+    # Classify and parse the input in a single pass (ISO, then the slash
+    # formats in the locale's order)
+    parsed = parse_date(date_string, slash_formats)
+    if parsed is None:
+        # None of the formats worked
+        return invalid_date_format(date_string), None
+    date_obj, fmt = parsed
+    
+    # Check if future date
+    if date_obj > today:
+        return DATE_FUTURE_ERROR, fmt
+    
+    # Check if date is within reasonable range
+    current_year = today.year
+    if date_obj.year < MIN_BIRTH_YEAR or date_obj.year > current_year:
+        return date_out_of_range(MIN_BIRTH_YEAR, current_year), fmt
+    
+    return None, fmt
+
+
+def check_birth_date(date_string: str, locale: Optional[str] = None) -> Optional[ValidationError]:
+    """
+    Validate a birth date and report the failure as an error code
+    
+    Same rules as validate_birth_date, without rendering a message.
+    
+    Args:
+        date_string: Date string in one of the supported formats
+        locale: Optional locale tag or Accept-Language header value
+        
+    Returns:
+        None if the date is valid, else the ValidationError
+    """
+    if not date_string or not isinstance(date_string, str):
+        return DATE_EMPTY_ERROR
+    
+    today = clock.today()
+    locale_key, slash_formats = resolve_locale(locale)
+    table = _date_table
+    if table is not None:
+        fmt = table.lookup(date_string, today, slash_formats[0] == EU_FORMAT)
+        if fmt is not None:
+            if metrics.enabled:
+                _count_format(fmt, locale_key, slash_formats)
+            return None
+    cache = _birth_date_cache
+    if cache is None:
+        error, fmt = _check_birth_date(date_string, today, slash_formats)
+    else:
+        # Repeated inputs skip parsing entirely; the format is cached with
+        # the verdict so that they are still counted
+        key = date_string if slash_formats is DEFAULT_ORDER else (slash_formats, date_string)
+        entry = cache.get(key, today)
+        if entry is None:
+            entry = _check_birth_date(date_string, today, slash_formats)
+            cache.put(key, today, entry)
+        error, fmt = entry
+    if metrics.enabled:
+        _count_format(fmt, locale_key, slash_formats)
+    return error
+
+
+def validate_birth_date(date_string: str, locale: Optional[str] = None) -> Tuple[bool, str]:
     """
     Validate birth date format
     
@@ -20,47 +343,161 @@ def validate_birth_date(date_string: str) -> Tuple[bool, str]:
     - US format: MM/DD/YYYY (Safari may input)
     - European format: DD/MM/YYYY (some regions)
     
+    Slash dates are tried US first unless the locale hint says day-first,
+    so "05/06/1990" is 6 May by default and 5 June for "en-GB".
+    
     Args:
         date_string: Date string in one of the supported formats
+        locale: Optional locale tag or Accept-Language header value
         
     Returns:
         (is_valid, error_message or success_message)
     """
+    error = check_birth_date(date_string, locale)
+    if error is None:
+        return _DATE_VALID
+    return False, error.message
+
+
+def normalize_birth_date(date_string: str, locale: Optional[str] = None) -> Optional[str]:
+    """
+    Convert a date in any supported format to YYYY-MM-DD
+    
+    Args:
+        date_string: Date string in one of the supported formats
+        locale: Optional locale hint for ambiguous dates
+        
+    Returns:
+        ISO formatted date, or None if the string cannot be parsed
+    """
     if not date_string or not isinstance(date_string, str):
-        return False, "Date cannot be empty"
-    
-    # Try multiple common date formats to support cross-browser compatibility
-    date_formats = [
-        "%Y-%m-%d",  # ISO 8601 format (Chrome default)
-        "%m/%d/%Y",  # US format (Safari may input)
-        "%d/%m/%Y",  # European format (some regions)
-    ]
-    
-    date_obj = None
-    for fmt in date_formats:
-        try:
-            date_obj = datetime.strptime(date_string, fmt)
-            break  # Successfully parsed, exit loop
-        except ValueError:
-            continue  # Try next format
-    
-    if date_obj is None:
-        # None of the formats worked
-        return False, f"Invalid date format. Supported formats: YYYY-MM-DD, MM/DD/YYYY, DD/MM/YYYY. Received: {date_string}"
+        return None
+    parsed = parse_date(date_string, resolve_locale(locale)[1])
+    return parsed[0].isoformat() if parsed is not None else None
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC form of a string, as its length is checked
     
-    # Check if future date
-    if date_obj > datetime.now():
-        return False, "Birth date cannot be in the future"
+    Fullwidth and other compatibility characters become their plain
+    equivalents and combining sequences are composed, so "\uff41\uff42" is
+    "ab" and "e\u0301" is one character. unicodedata returns strings that
+    are already in NFKC, such as all ASCII, without copying them.
+    """
+    return unicodedata.normalize("NFKC", text)
+
+
+def fold_text(text: str) -> str:
+    """
+    NFKC and case folded form of a string, for comparing identifiers
     
-    # Check if date is within reasonable range
-    current_year = datetime.now().year
-    if date_obj.year < 1900 or date_obj.year > current_year:
-        return False, f"Birth year must be between 1900 and {current_year}"
+    "Alice", "ALICE" and "\uff21\uff4c\uff49\uff43\uff45" all fold to "alice".
+    """
+    return unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", text).casefold())
+
+
+def schema_validator() -> Callable[[dict, Optional[str]], List[ValidationError]]:
+    """Compiled validator of the registration schema in force (see schema.get_schema)"""
+    # Imported here: the schema is compiled against this module's checks
+    try:
+        from src.schema import get_schema
+    except ImportError:
+        from schema import get_schema
+    return get_schema().validator()
+
+
+def registration_errors(username: str, email: str, birth_date: str,
+                        locale: Optional[str] = None) -> List[ValidationError]:
+    """
+    Validate complete registration data and report failures as error codes
+    
+    The rules are those of the registration schema, so they follow a
+    reloaded schema file like /api/register does.
+    
+    Args:
+        username: Username
+        email: Email address
+        birth_date: Birth date
+        locale: Optional locale hint for ambiguous dates
+        
+    Returns:
+        ValidationErrors in field order; empty if the data is valid
+    """
+    return schema_validator()(
+        {"username": username, "email": email, "birth_date": birth_date}, locale
+    )
+
+
+class ValidationResult(Mapping):
+    """
+    Result of validate_registration_data
+    
+    Reads like the {"valid": ..., "errors": [...]} dict it replaces:
+    result["valid"], result["errors"], dict(result) and comparison with a
+    dict all work. It keeps the ValidationErrors and only renders the
+    message list when errors is first read, and valid data always gets the
+    shared VALID instance, so a valid record allocates nothing.
+    
+    Attributes:
+        valid: True if there are no errors
+    """
+    
+    __slots__ = ("valid", "_errors", "_messages")
+    
+    _KEYS = ("valid", "errors")
+    
+    def __init__(self, errors: Sequence[ValidationError] = (),
+                 messages: Optional[List[str]] = None):
+        """
+        Args:
+            errors: ValidationErrors in field order
+            messages: Already rendered messages, used instead of errors
+        """
+        self.valid = not errors and not messages
+        self._errors = errors
+        self._messages = messages or None
+    
+    @property
+    def errors(self) -> List[str]:
+        """Error messages in field order; empty if valid"""
+        messages = self._messages
+        if messages is None:
+            # A new list per read while empty, so VALID is never mutated
+            messages = [error.message for error in self._errors]
+            if messages:
+                self._messages = messages
+        return messages
+    
+    def __getitem__(self, key: str):
+        if key == "valid":
+            return self.valid
+        if key == "errors":
+            return self.errors
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return 2
+    
+    def __repr__(self) -> str:
+        return f"ValidationResult(valid={self.valid!r}, errors={self.errors!r})"
     
-    return True, "Date format is valid"
+    def __reduce__(self):
+        # Valid results unpickle to the shared instance
+        if self.valid:
+            return "VALID"
+        return ValidationResult, ((), self.errors)
 
 
-def validate_registration_data(username: str, email: str, birth_date: str) -> dict:
+# Shared result for every valid record
+VALID = ValidationResult()
+
+
+def validate_registration_data(username: str, email: str, birth_date: str,
+                               locale: Optional[str] = None) -> ValidationResult:
     """
     Validate complete registration data
     
@@ -68,26 +505,96 @@ def validate_registration_data(username: str, email: str, birth_date: str) -> di
         username: Username
         email: Email address
         birth_date: Birth date
+        locale: Optional locale hint for ambiguous dates (see
+            validate_birth_date)
         
     Returns:
-        Validation result dictionary
+        ValidationResult; VALID if the data is valid
+    """
+    errors = registration_errors(username, email, birth_date, locale)
+    if not errors:
+        return VALID
+    return ValidationResult(errors)
+
+
+class BatchValidationResult:
     """
-    errors = []
+    Compact result of validate_registration_batch
+    
+    Attributes:
+        valid: Valid mask, one bool per record in input order
+        errors: Sparse mapping of record index to its error messages,
+            only populated for invalid records
+        codes: The same mapping with error codes (see src.errors)
+    """
+    
+    __slots__ = ("valid", "errors", "codes")
+    
+    def __init__(self, valid: List[bool], errors: Dict[int, List[str]],
+                 codes: Optional[Dict[int, List[str]]] = None):
+        self.valid = valid
+        self.errors = errors
+        self.codes = codes if codes is not None else {}
+    
+    def __len__(self) -> int:
+        return len(self.valid)
     
-    # Validate username
-    if not username or len(username) < 3:
-        errors.append("Username must be at least 3 characters")
+    @property
+    def valid_count(self) -> int:
+        """Number of valid records"""
+        return len(self.valid) - len(self.errors)
     
-    # Validate email
-    if not email or "@" not in email:
-        errors.append("Invalid email format")
+    def result(self, index: int) -> ValidationResult:
+        """Return the validate_registration_data style result for one record"""
+        if self.valid[index]:
+            return VALID
+        return ValidationResult(messages=self.errors[index])
+
+
+def validate_registration_batch(
+    usernames: Optional[Sequence[str]] = None,
+    emails: Optional[Sequence[str]] = None,
+    birth_dates: Optional[Sequence[str]] = None,
+    records: Optional[Iterable[dict]] = None,
+) -> BatchValidationResult:
+    """
+    Validate many registrations at once
+    
+    Gives the same verdicts as calling validate_registration_data on every
+    record, but looks up the registration schema once for the whole batch,
+    checks each distinct email and birth date string only once and keeps
+    messages only for invalid records.
+    
+    Args:
+        usernames: Username column
+        emails: Email column
+        birth_dates: Birth date column
+        records: Iterable of {"username", "email", "birth_date"} dicts,
+            used instead of the columns
+        
+    Returns:
+        BatchValidationResult with a valid mask and sparse errors
+    """
+    if records is not None:
+        if usernames is not None or emails is not None or birth_dates is not None:
+            raise ValueError("Pass either records or columns, not both")
+        records = list(records)
+    elif usernames is None or emails is None or birth_dates is None:
+        raise ValueError("usernames, emails and birth_dates are all required")
+    else:
+        if len(emails) != len(usernames) or len(birth_dates) != len(usernames):
+            raise ValueError("usernames, emails and birth_dates must have the same length")
+        records = [
+            {"username": username, "email": email, "birth_date": birth_date}
+            for username, email, birth_date in zip(usernames, emails, birth_dates)
+        ]
     
-    # Validate birth date
-    is_valid, message = validate_birth_date(birth_date)
-    if not is_valid:
-        errors.append(message)
+    valid = [True] * len(records)
+    errors: Dict[int, List[str]] = {}
+    codes: Dict[int, List[str]] = {}
+    for index, record_errors in schema_validator().batch(records):
+        valid[index] = False
+        errors[index] = [error.message for error in record_errors]
+        codes[index] = [error.code for error in record_errors]
     
-    return {
-        "valid": len(errors) == 0,
-        "errors": errors
-    }
+    return BatchValidationResult(valid, errors, codes)
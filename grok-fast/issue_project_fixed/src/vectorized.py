@@ -0,0 +1,200 @@
+"""
+Vectorized birth date validation
+Optional NumPy backend for bulk re-validation of large date columns
+"""
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # NumPy is optional
+    np = None
+    HAS_NUMPY = False
+
+try:
+    from src.date_parser import parse_date
+    from src.errors import (
+        CODE_INDEX,
+        DATE_EMPTY,
+        DATE_FUTURE,
+        DATE_INVALID_FORMAT,
+        DATE_OUT_OF_RANGE,
+        NO_ERROR,
+    )
+    from src.validators import MIN_BIRTH_YEAR, clock
+except ImportError:
+    from date_parser import parse_date
+    from errors import (
+        CODE_INDEX,
+        DATE_EMPTY,
+        DATE_FUTURE,
+        DATE_INVALID_FORMAT,
+        DATE_OUT_OF_RANGE,
+        NO_ERROR,
+    )
+    from validators import MIN_BIRTH_YEAR, clock
+
+# Per-row results are positions in errors.CODES
+_EMPTY = CODE_INDEX[DATE_EMPTY]
+_INVALID_FORMAT = CODE_INDEX[DATE_INVALID_FORMAT]
+_FUTURE = CODE_INDEX[DATE_FUTURE]
+_OUT_OF_RANGE = CODE_INDEX[DATE_OUT_OF_RANGE]
+
+# Rows are processed in slices of this size to bound temporary memory
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Shortest ("1/1/1990") and longest ("1990-01-01") accepted spellings
+_MIN_LENGTH = 8
+_CANONICAL_LENGTH = 10
+_ISO_DIGITS = (0, 1, 2, 3, 5, 6, 8, 9)
+_SLASH_DIGITS = (0, 1, 3, 4, 6, 7, 8, 9)
+
+
+def _scalar_code(value, today: date) -> int:
+    """Error code position for a single value, using the per-string parser"""
+    if not value or not isinstance(value, str):
+        return _EMPTY
+    parsed = parse_date(value)
+    if parsed is None:
+        return _INVALID_FORMAT
+    date_obj = parsed[0]
+    if date_obj > today:
+        return _FUTURE
+    if date_obj.year < MIN_BIRTH_YEAR or date_obj.year > today.year:
+        return _OUT_OF_RANGE
+    return NO_ERROR
+
+
+def _field(digits, start: int, stop: int):
+    """Combine digit columns [start, stop) into an integer column"""
+    value = digits[:, start]
+    for column in range(start + 1, stop):
+        value = value * 10 + digits[:, column]
+    return value
+
+
+def _days_in_month(year, month):
+    """Vectorized month length; month must already be clipped to 1..12"""
+    table = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return table[month] + ((month == 2) & leap)
+
+
+def _is_calendar_date(year, month, day):
+    """Vectorized check that (year, month, day) exists"""
+    month_ok = (month >= 1) & (month <= 12)
+    dim = _days_in_month(year, np.clip(month, 1, 12))
+    return (year >= 1) & month_ok & (day >= 1) & (day <= dim)
+
+
+def _validate_chunk(strings, today: date):
+    """Validate one slice of a unicode array, returning an array of code positions"""
+    count = strings.shape[0]
+    codes = np.full(count, _INVALID_FORMAT, dtype=np.int8)
+    lengths = np.char.str_len(strings)
+    codes[lengths == 0] = _EMPTY
+
+    # Fixed-width code point matrix; only rows of exactly ten characters
+    # can have one of the canonical zero-padded shapes
+    chars = np.zeros((count, _CANONICAL_LENGTH), dtype=np.uint32)
+    short = lengths <= _CANONICAL_LENGTH
+    if short.any():
+        fixed = strings[short].astype("U%d" % _CANONICAL_LENGTH)
+        chars[short] = fixed.view(np.uint32).reshape(-1, _CANONICAL_LENGTH)
+    digits = chars.astype(np.int32) - ord("0")
+    is_digit = (digits >= 0) & (digits <= 9)
+    digits[~is_digit] = 0
+    candidate = lengths == _CANONICAL_LENGTH
+
+    iso = (
+        candidate
+        & (chars[:, 4] == ord("-"))
+        & (chars[:, 7] == ord("-"))
+        & is_digit[:, _ISO_DIGITS].all(axis=1)
+    )
+    slash = (
+        candidate
+        & (chars[:, 2] == ord("/"))
+        & (chars[:, 5] == ord("/"))
+        & is_digit[:, _SLASH_DIGITS].all(axis=1)
+    )
+
+    # ISO: YYYY-MM-DD
+    year = np.where(iso, _field(digits, 0, 4), _field(digits, 6, 10))
+    month = np.where(iso, _field(digits, 5, 7), 0)
+    day = np.where(iso, _field(digits, 8, 10), 0)
+    iso_ok = iso & _is_calendar_date(year, month, day)
+
+    # Slash: US (MM/DD/YYYY) wins over European (DD/MM/YYYY) when both fit
+    first = _field(digits, 0, 2)
+    second = _field(digits, 3, 5)
+    us_ok = slash & _is_calendar_date(year, first, second)
+    eu_ok = slash & ~us_ok & _is_calendar_date(year, second, first)
+    month = np.where(us_ok, first, np.where(eu_ok, second, month))
+    day = np.where(us_ok, second, np.where(eu_ok, first, day))
+
+    parsed = iso_ok | us_ok | eu_ok
+    key = year * 10000 + month * 100 + day
+    today_key = today.year * 10000 + today.month * 100 + today.day
+    codes[parsed] = NO_ERROR
+    codes[parsed & (year < MIN_BIRTH_YEAR)] = _OUT_OF_RANGE
+    codes[parsed & (key > today_key)] = _FUTURE
+
+    # Anything else that could still be a date (unpadded fields, space
+    # padded days, non-ASCII digits, ...) goes through the per-string
+    # parser, once per distinct spelling
+    fallback = ~iso & ~slash & (lengths >= _MIN_LENGTH) & (lengths <= _CANONICAL_LENGTH)
+    if fallback.any():
+        distinct, inverse = np.unique(strings[fallback], return_inverse=True)
+        distinct_codes = np.array(
+            [_scalar_code(str(value), today) for value in distinct], dtype=np.int8
+        )
+        codes[fallback] = distinct_codes[inverse.ravel()]
+    return codes
+
+
+def validate_birth_dates(
+    date_strings: Iterable,
+    today: Optional[date] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple:
+    """
+    Validate many birth dates at once
+
+    Gives the same verdict as validate_birth_date for every element. With
+    NumPy installed the canonical zero-padded shapes are checked with array
+    operations; without NumPy this falls back to a per-string loop.
+
+    Args:
+        date_strings: NumPy array or iterable of date strings
+        today: Reference date for the future/year-range checks
+            (default: the shared validator clock)
+        chunk_size: Number of rows validated per slice
+
+    Returns:
+        (valid, codes) as NumPy bool/int8 arrays, or lists without NumPy;
+        codes are positions in errors.CODES, NO_ERROR for valid dates
+    """
+    if today is None:
+        today = clock.today()
+
+    if not HAS_NUMPY:
+        codes = [_scalar_code(value, today) for value in date_strings]
+        return [code == NO_ERROR for code in codes], codes
+
+    values = np.asarray(date_strings)
+    if values.dtype.kind != "U":
+        # Mixed or non-string input: anything that is not a string counts
+        # as empty, exactly like validate_birth_date
+        values = np.array(
+            [value if isinstance(value, str) else "" for value in values.ravel()],
+            dtype=str,
+        )
+    values = values.ravel()
+
+    codes = np.empty(values.shape[0], dtype=np.int8)
+    for start in range(0, values.shape[0], chunk_size):
+        stop = start + chunk_size
+        codes[start:stop] = _validate_chunk(values[start:stop], today)
+    return codes == NO_ERROR, codes
@@ -0,0 +1,26 @@
+"""
+Shared test fixtures
+"""
+import pytest
+from src.app import rate_limiter
+from src.asgi_app import rate_limiter as asgi_rate_limiter
+from src.registration import get_uniqueness_index, set_user_store
+from src.user_store import MemoryUserStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_registrations():
+    """Start every test with no registered users; yields a reset function"""
+    def reset():
+        get_uniqueness_index().clear()
+        set_user_store(MemoryUserStore())
+    
+    reset()
+    yield reset
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    """Start every test with full rate-limit buckets"""
+    rate_limiter.table.clear()
+    asgi_rate_limiter.table.clear()
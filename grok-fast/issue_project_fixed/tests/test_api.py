@@ -2,9 +2,10 @@
 API integration tests
 Test complete registration workflow
 """
+import io
 import pytest
 import json
-from src.app import app
+from src.app import PayloadTooLarge, _iter_ndjson_records, app
 
 
 @pytest.fixture
@@ -114,5 +115,81 @@ class TestRegistrationAPI:
         assert response.status_code == 400
 
 
+class TestBatchRegistrationAPI:
+    """Bulk registration API test class"""
+    
+    RECORDS = [
+        {"username": "chromeuser", "email": "chrome@test.com", "birth_date": "1995-08-20"},
+        {"username": "baduser", "email": "bad@nowhere", "birth_date": "not-a-date"},
+        {"username": "safariuser", "email": "safari@test.com", "birth_date": "08/20/1995"},
+    ]
+    
+    @staticmethod
+    def read_lines(response):
+        return [json.loads(line) for line in response.data.decode().splitlines()]
+    
+    def test_json_array_batch(self, client):
+        """✅ Test a JSON array is answered with one NDJSON line per record"""
+        response = client.post('/api/register/batch', json=self.RECORDS)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = self.read_lines(response)
+        assert [line['index'] for line in lines] == [0, 1, 2]
+        assert [line['status'] for line in lines] == [201, 400, 201]
+        assert len(lines[1]['errors']) == 2
+    
+    def test_ndjson_batch(self, client):
+        """✅ Test NDJSON bodies, including undecodable lines"""
+        body = "\n".join(json.dumps(record) for record in self.RECORDS) + "\nnot json\n"
+        response = client.post(
+            '/api/register/batch',
+            data=body,
+            content_type='application/x-ndjson'
+        )
+        lines = self.read_lines(response)
+        assert [line['success'] for line in lines] == [True, False, True, False]
+        assert lines[3]['message'] == 'Invalid request data'
+    
+    def test_batch_record_limit(self, client):
+        """✅ Test batches over the record limit are rejected"""
+        app.config['BATCH_MAX_RECORDS'] = 2
+        try:
+            response = client.post('/api/register/batch', json=self.RECORDS)
+            assert response.status_code == 413
+            body = "\n".join(json.dumps(record) for record in self.RECORDS)
+            response = client.post(
+                '/api/register/batch',
+                data=body,
+                content_type='application/x-ndjson'
+            )
+            lines = self.read_lines(response)
+            assert len(lines) == 3
+            assert lines[-1]['message'] == 'Batch size limit exceeded'
+        finally:
+            app.config['BATCH_MAX_RECORDS'] = 1000
+    
+    def test_batch_body_limit(self, client):
+        """✅ Test bodies over the size limit are rejected"""
+        app.config['BATCH_MAX_BODY_BYTES'] = 64
+        try:
+            response = client.post('/api/register/batch', json=self.RECORDS)
+            assert response.status_code == 413
+        finally:
+            app.config['BATCH_MAX_BODY_BYTES'] = 1024 * 1024
+    
+    def test_ndjson_long_line_is_not_buffered(self):
+        """✅ Test one overlong NDJSON line is refused after reading just past the limit"""
+        stream = io.BytesIO(b'{"username": "' + b"a" * 1000000 + b'"}\n')
+        records = _iter_ndjson_records(app, stream, 1000)
+        with pytest.raises(PayloadTooLarge):
+            next(records)
+        assert stream.tell() == 1001
+    
+    def test_batch_rejects_non_array(self, client):
+        """✅ Test a JSON body that is not an array is rejected"""
+        response = client.post('/api/register/batch', json=self.RECORDS[0])
+        assert response.status_code == 400
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
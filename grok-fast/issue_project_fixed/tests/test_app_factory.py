@@ -0,0 +1,135 @@
+"""
+App factory and warm-up tests
+create_app() builds independent apps; warm-up primes caches without side effects
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from src.app import app, create_app, default_config
+from src.metrics import metrics
+from src.page import static_page
+from src.registration import default_registrations, get_uniqueness_index, get_user_store, warm_up
+from src.schema import DEFAULT_SCHEMA_PATH
+from src.user_store import SQLiteUserStore
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+VALID = {"username": "testuser", "email": "test@example.com", "birth_date": "1990-05-15"}
+
+
+@pytest.fixture
+def cold_app():
+    """App built without warm-up or rate limiting"""
+    return create_app({"WARM_UP": False, "RATE_LIMIT_ENABLED": False})
+
+
+class TestCreateApp:
+    """create_app test class"""
+
+    def test_defaults(self, cold_app):
+        """✅ Test a new app starts from default_config"""
+        for key, value in default_config().items():
+            if key not in ("WARM_UP", "RATE_LIMIT_ENABLED"):
+                assert cold_app.config[key] == value
+
+    def test_config_overrides(self):
+        """✅ Test settings passed in replace the defaults for that app only"""
+        small = create_app({"WARM_UP": False, "REGISTER_MAX_BODY_BYTES": 16})
+        response = small.test_client().post("/api/register", json=VALID)
+        assert response.status_code == 413
+        assert app.test_client().post("/api/register", json=VALID).status_code == 201
+
+    def test_routes(self, cold_app):
+        """✅ Test every route is served by a factory-built app"""
+        client = cold_app.test_client()
+        assert client.get("/").status_code == 200
+        assert client.get("/api/health").get_json() == {"status": "ok"}
+        assert client.get("/api/metrics").status_code == 200
+        assert client.post("/api/register", json=VALID).status_code == 201
+        response = client.post("/api/register/batch", json=[VALID])
+        assert json.loads(response.data.splitlines()[0])["status"] == 409
+
+    def test_own_rate_limiter(self, cold_app):
+        """✅ Test each app gets its own rate limiter"""
+        limiter = cold_app.extensions["rate_limiter"]
+        assert limiter is not app.extensions["rate_limiter"]
+        assert limiter.enabled is False
+
+    def test_stores_from_config(self, tmp_path):
+        """✅ Test USER_DB and UNIQUENESS_DB give the app its own SQLite stores"""
+        built = create_app({
+            "WARM_UP": False, "RATE_LIMIT_ENABLED": False,
+            "USER_DB": str(tmp_path / "users.db"), "UNIQUENESS_DB": str(tmp_path / "unique.db"),
+        })
+        registrations = built.extensions["registrations"]
+        assert registrations is not default_registrations()
+        assert built.test_client().post("/api/register", json=VALID).status_code == 201
+        assert isinstance(registrations.users, SQLiteUserStore)
+        registrations.close()
+        assert registrations.users.count() == 1
+        assert registrations.uniqueness.info()["username"]["keys"] == 1
+        registrations.close()
+        assert get_user_store().count() == 0
+    
+    def test_schema_from_config(self, tmp_path):
+        """✅ Test REGISTRATION_SCHEMA sets the rules of that app only"""
+        rules = json.loads(open(DEFAULT_SCHEMA_PATH).read())
+        rules["fields"][0]["rules"][0]["min_length"] = 2
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(rules))
+        relaxed = create_app({"WARM_UP": False, "REGISTRATION_SCHEMA": str(path)})
+        data = dict(VALID, username="ab")
+        assert relaxed.test_client().post("/api/register", json=data).status_code == 201
+        assert app.test_client().post("/api/register", json=data).status_code == 400
+    
+    def test_import_does_not_warm_up(self):
+        """✅ Test importing src.app builds nothing that warm-up would"""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import src.app, src.page; print(src.page.static_page.cache_info().currsize)"],
+            cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "0"
+        assert app.config["WARM_UP"] is False
+    
+    def test_page_built_lazily(self):
+        """✅ Test the page is only rendered once it is needed"""
+        static_page.cache_clear()
+        cold_app = create_app({"WARM_UP": False})
+        assert static_page.cache_info().currsize == 0
+        assert cold_app.test_client().get("/").status_code == 200
+        assert static_page.cache_info().currsize == 1
+
+    def test_warm_up_builds_page(self):
+        """✅ Test warm-up renders the page before the first request"""
+        static_page.cache_clear()
+        create_app({"WARM_UP": True})
+        assert static_page.cache_info().currsize == 1
+
+
+class TestWarmUp:
+    """warm_up test class"""
+
+    def test_no_side_effects(self):
+        """✅ Test warm-up stores no users, claims no names and counts nothing"""
+        metrics.reset()
+        warm_up()
+        assert get_user_store().count() == 0
+        info = get_uniqueness_index().info()
+        assert info["username"]["keys"] == info["email"]["keys"] == 0
+        assert "registration_requests_total{" not in metrics.render()
+        assert metrics.enabled
+
+    def test_names_stay_free(self):
+        """✅ Test the sample names can still be registered after warm-up"""
+        warm_up()
+        data = {"username": "warmup", "email": "warmup@example.com", "birth_date": "1990-05-15"}
+        assert app.test_client().post("/api/register", json=data).status_code == 201
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,190 @@
+"""
+ASGI application tests
+Responses must match the Flask application byte for byte
+"""
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+import src.asgi_app
+from src import rate_limit
+from src.app import REGISTER_PAGE, app as flask_app
+from src.asgi_app import app as asgi_app
+from src.page import GZIP, IDENTITY, static_page
+from src.rate_limit import IP_BURST
+from src.registration import get_user_store, set_user_store
+from src.user_store import open_user_store
+
+BATCH = [
+    {"username": "batchuser", "email": "batch@test.com", "birth_date": "1995-08-20"},
+    {"username": "ab", "email": "bad", "birth_date": "not-a-date"},
+    {"username": "batchuser", "email": "other@test.com", "birth_date": "1995-08-20"},
+    "not an object",
+]
+
+
+def asgi_request(method, path, body=b"", content_type=None, extra_headers=None):
+    """Drive the ASGI app directly and collect its response"""
+    headers = [(b"content-type", content_type.encode())] if content_type else []
+    for name, value in (extra_headers or {}).items():
+        headers.append((name.lower().encode(), value.encode()))
+    path, _, query = path.partition("?")
+    scope = {"type": "http", "method": method, "path": path,
+             "query_string": query.encode(), "headers": headers}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(asgi_app(scope, receive, send))
+    start, body_message = sent
+    return start["status"], dict(start["headers"]), body_message["body"]
+
+
+@pytest.fixture
+def client():
+    """Create Flask test client for comparison"""
+    flask_app.config['TESTING'] = True
+    with flask_app.test_client() as client:
+        yield client
+
+
+CASES = [
+    ("GET", "/", b"", None),
+    ("GET", "/api/health", b"", None),
+    ("POST", "/api/register", json.dumps({
+        "username": "chromeuser", "email": "chrome@test.com", "birth_date": "1995-08-20"
+    }).encode(), "application/json"),
+    ("POST", "/api/register", json.dumps({
+        "username": "ab", "email": "bad", "birth_date": "not-a-date"
+    }).encode(), "application/json"),
+    ("POST", "/api/register?errors=codes", json.dumps({
+        "username": "ab", "email": "bad", "birth_date": "not-a-date"
+    }).encode(), "application/json"),
+    ("POST", "/api/register", b'{"username": "testuser"}', "application/json"),
+    ("POST", "/api/register", b"null", "application/json"),
+    ("POST", "/api/register", b"not json", "application/json"),
+    ("POST", "/api/register", b"x=1", "text/plain"),
+    ("POST", "/api/register", b'{"username": "' + b"a" * 5000 + b'"}', "application/json"),
+    ("GET", "/api/register", b"", None),
+    ("GET", "/missing", b"", None),
+    ("POST", "/api/register/batch", json.dumps(BATCH).encode(), "application/json"),
+    ("POST", "/api/register/batch?errors=codes", json.dumps(BATCH).encode(), "application/json"),
+    ("POST", "/api/register/batch",
+     "\n".join(json.dumps(record) for record in BATCH).encode() + b"\n{broken\n\n",
+     "application/x-ndjson"),
+    ("POST", "/api/register/batch", b'{"username": "testuser"}', "application/json"),
+    ("POST", "/api/register/batch", json.dumps([{}] * 1001).encode(), "application/json"),
+    ("POST", "/api/register/batch", b"[" + b" " * (1024 * 1024) + b"]", "application/json"),
+]
+
+
+class TestASGIApp:
+    """ASGI application test class"""
+    
+    @pytest.mark.parametrize("method,path,body,content_type", CASES)
+    def test_matches_flask(self, client, method, path, body, content_type,
+                           fresh_registrations):
+        """✅ Test status, content type and body equal the Flask app"""
+        status, headers, data = asgi_request(method, path, body, content_type)
+        fresh_registrations()
+        expected = client.open(path, method=method, data=body, content_type=content_type)
+        assert status == expected.status_code
+        assert headers[b"content-type"].decode() == expected.headers["Content-Type"]
+        assert data == expected.data
+    
+    @pytest.mark.parametrize("request_headers", [
+        {"Accept-Encoding": "gzip, deflate"},
+        {"Accept-Encoding": "identity;q=0"},
+        {"If-None-Match": REGISTER_PAGE.etags[IDENTITY]},
+        {"Accept-Encoding": "gzip", "If-None-Match": REGISTER_PAGE.etags[GZIP]},
+    ])
+    def test_page_matches_flask(self, client, request_headers):
+        """✅ Test compressed and revalidated pages equal the Flask app's"""
+        status, headers, data = asgi_request("GET", "/", extra_headers=request_headers)
+        expected = client.get("/", headers=request_headers)
+        assert status == expected.status_code
+        for name in ("Content-Encoding", "ETag", "Cache-Control", "Vary"):
+            assert headers.get(name.lower().encode(), b"").decode() == expected.headers.get(name, "")
+        assert data == expected.data
+    
+    def test_head_has_no_body(self):
+        """✅ Test HEAD requests get headers only"""
+        status, headers, data = asgi_request("HEAD", "/api/health")
+        assert status == 200
+        assert data == b""
+        assert headers[b"content-length"] == b"16"
+    
+    def test_rate_limited(self, monkeypatch):
+        """✅ Test over-limit clients get the Flask app's 429 with Retry-After"""
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: 100.0))
+        body = json.dumps({"username": "ab"}).encode()
+        statuses = [
+            asgi_request("POST", "/api/register", body, "application/json")[0]
+            for _ in range(int(IP_BURST))
+        ]
+        status, headers, data = asgi_request("POST", "/api/register/batch", body, "application/json")
+        assert statuses == [400] * int(IP_BURST)
+        assert status == 429
+        assert headers[b"retry-after"] == b"1"
+        assert json.loads(data) == {"success": False, "message": "Too many requests"}
+        assert asgi_request("GET", "/api/health")[0] == 200
+    
+    def test_batch_records_are_charged(self, monkeypatch):
+        """✅ Test batch records cost a token each, as in the Flask app"""
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: 100.0))
+        body = json.dumps([{"username": "ab"}] * (int(IP_BURST) + 5)).encode()
+        status, _, data = asgi_request("POST", "/api/register/batch", body, "application/json")
+        lines = [json.loads(line) for line in data.splitlines()]
+        assert status == 200
+        assert [line["status"] for line in lines] == [400] * int(IP_BURST) + [429] * 5
+        assert lines[-1]["retry_after"] == 1
+        body = json.dumps({"username": "ab"}).encode()
+        assert asgi_request("POST", "/api/register", body, "application/json")[0] == 429
+    
+    @pytest.mark.parametrize("on_disk", [False, True])
+    def test_sqlite_work_leaves_the_loop(self, monkeypatch, tmp_path, on_disk):
+        """✅ Test registrations run in a worker thread only when a SQLite store is used"""
+        threads = []
+        inner = src.asgi_app.registration_response
+        
+        def recording(*args):
+            threads.append(threading.get_ident())
+            return inner(*args)
+        
+        monkeypatch.setattr(src.asgi_app, "registration_response", recording)
+        if on_disk:
+            set_user_store(open_user_store(str(tmp_path / "users.db")))
+        try:
+            body = json.dumps(BATCH[0]).encode()
+            assert asgi_request("POST", "/api/register", body, "application/json")[0] == 201
+        finally:
+            if on_disk:
+                get_user_store().close()
+        assert (threads[0] != threading.get_ident()) is on_disk
+    
+    def test_lifespan(self):
+        """✅ Test lifespan startup warms up, and startup and shutdown are acknowledged"""
+        static_page.cache_clear()
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+        
+        async def receive():
+            return messages.pop(0)
+        
+        async def send(message):
+            sent.append(message["type"])
+        
+        asyncio.run(asgi_app({"type": "lifespan"}, receive, send))
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert static_page.cache_info().currsize == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
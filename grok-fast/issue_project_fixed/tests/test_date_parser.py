@@ -0,0 +1,85 @@
+"""
+Date parser unit tests
+The compiled parser must agree with the original strptime format loop
+"""
+import random
+from datetime import date, datetime
+
+import pytest
+from src.date_parser import (
+    DATE_FORMATS,
+    EU_FORMAT,
+    ISO_FORMAT,
+    US_FORMAT,
+    days_in_month,
+    parse_date,
+)
+
+
+def strptime_loop(date_string):
+    """Reference implementation: the original strptime format loop"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_string, fmt).date(), fmt
+        except ValueError:
+            continue
+    return None
+
+
+class TestParseDate:
+    """Date parser test class"""
+
+    def test_iso_format(self):
+        """✅ Test ISO format is parsed"""
+        assert parse_date("1990-05-15") == (date(1990, 5, 15), ISO_FORMAT)
+
+    def test_us_format_preferred_for_ambiguous_dates(self):
+        """✅ Test ambiguous slash dates are read as US format first"""
+        assert parse_date("05/06/1990") == (date(1990, 5, 6), US_FORMAT)
+
+    def test_european_format(self):
+        """✅ Test European format is used when US format cannot match"""
+        assert parse_date("15/05/1990") == (date(1990, 5, 15), EU_FORMAT)
+
+    def test_invalid_day_of_month(self):
+        """✅ Test impossible calendar dates are rejected"""
+        assert parse_date("1990-02-30") is None
+        assert parse_date("2023-02-29") is None
+        assert parse_date("2024-02-29") == (date(2024, 2, 29), ISO_FORMAT)
+
+    def test_garbage_input(self):
+        """✅ Test inputs without a known shape are rejected"""
+        for value in ("not-a-date", "19900515", "1990-05-15 ", "0000-01-01", ""):
+            assert parse_date(value) is None
+
+    @pytest.mark.parametrize("value", [
+        "1990-5-1", "1990-05- 1", "5/1/1990", " 5/ 1/1990", "1/ 5/1990",
+        "31/12/1999", "12/31/1999", "13/13/1990", "1990-13-01", "1990-00-10",
+        "02/29/2000", "29/02/1900", "1990/05/15", "١٩٩٠-٠٥-١٥", "1990-05-150",
+    ])
+    def test_edge_cases_match_strptime(self, value):
+        """✅ Test edge-case spellings behave exactly like strptime"""
+        assert parse_date(value) == strptime_loop(value)
+
+    def test_random_inputs_match_strptime(self):
+        """✅ Test randomly generated inputs behave exactly like strptime"""
+        rng = random.Random(1234)
+        for _ in range(5000):
+            small = [
+                rng.choice(["", "", " "]) + str(rng.randint(0, 40)).zfill(rng.randint(1, 2))
+                for _ in range(2)
+            ]
+            year = str(rng.randint(0, 2100)).zfill(rng.choice([2, 4, 4, 4]))
+            fields = [year] + small if rng.random() < 0.5 else small + [year]
+            value = rng.choice("-/.").join(fields)
+            assert parse_date(value) == strptime_loop(value), value
+
+    def test_days_in_month(self):
+        """✅ Test month lengths including leap years"""
+        assert days_in_month(1900, 2) == 28
+        assert days_in_month(2000, 2) == 29
+        assert days_in_month(1990, 4) == 30
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
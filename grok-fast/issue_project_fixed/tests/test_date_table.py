@@ -0,0 +1,123 @@
+"""
+Date table tests
+Table lookups must agree with the parser on every spelling
+"""
+from datetime import date
+
+import pytest
+from src.date_parser import EU_FORMAT, ISO_FORMAT, US_FORMAT, parse_date
+from src.date_table import DateTable
+from src.locales import DAY_FIRST, MONTH_FIRST
+from src.metrics import metrics
+from src.validators import (
+    check_birth_date,
+    clock,
+    disable_date_table,
+    enable_date_table,
+    get_date_table,
+)
+
+TODAY = date(2025, 6, 15)
+
+# Field spellings around every edge the parser cares about
+FIELDS = (
+    [str(i) for i in range(0, 33)]
+    + ["0%d" % i for i in range(0, 10)]
+    + [" %d" % i for i in range(0, 10)]
+    + ["00", "001", "+1", ""]
+)
+
+
+@pytest.fixture(scope="module")
+def table():
+    """Table over 2023-2025, enough to cover both leap and common years"""
+    table = DateTable(2023)
+    table.extend_to(2025)
+    return table
+
+
+@pytest.fixture
+def date_table():
+    """Validators in table mode with a frozen clock"""
+    clock.freeze(TODAY)
+    yield enable_date_table()
+    disable_date_table()
+    clock.unfreeze()
+
+
+class TestDateTable:
+    """DateTable test class"""
+
+    @pytest.mark.parametrize("year", ["2022", "2024", "2025", "2026", "0000"])
+    def test_agrees_with_parser(self, table, year):
+        """✅ Test every spelling resolves exactly as parse_date and the range check would"""
+        for first in FIELDS:
+            for second in FIELDS:
+                for date_string in (f"{year}-{first}-{second}", f"{first}/{second}/{year}"):
+                    for order in (MONTH_FIRST, DAY_FIRST):
+                        parsed = parse_date(date_string, order)
+                        expected = None
+                        if parsed is not None and date(2023, 1, 1) <= parsed[0] <= TODAY:
+                            expected = parsed[1]
+                        assert table.lookup(date_string, TODAY, order is DAY_FIRST) == expected
+
+    def test_ambiguous_dates(self, table):
+        """✅ Test 05/06/2024 is May 6 month first and June 5 day first"""
+        assert table.lookup("05/06/2024", TODAY) == US_FORMAT
+        assert table.lookup("05/06/2024", TODAY, day_first=True) == EU_FORMAT
+        assert table.lookup("25/06/2024", TODAY) == EU_FORMAT
+        assert table.lookup("2024-02-29", TODAY) == ISO_FORMAT
+
+    def test_future_dates_miss(self, table):
+        """✅ Test dates after today are not found"""
+        assert table.lookup("2025-06-15", TODAY) == ISO_FORMAT
+        assert table.lookup("2025-06-16", TODAY) is None
+        assert table.lookup("06/16/2025", TODAY) is None
+
+    def test_extends_with_the_year(self):
+        """✅ Test a new year is added on first lookup"""
+        table = DateTable(2024)
+        table.extend_to(2024)
+        assert table.lookup("2025-01-01", date(2025, 1, 1)) == ISO_FORMAT
+        assert table.max_year == 2025
+
+
+class TestTableMode:
+    """validate_birth_date in table mode test class"""
+
+    @pytest.mark.parametrize("date_string,locale", [
+        ("1990-05-15", None),
+        ("05/06/1990", None),
+        ("05/06/1990", "en-GB"),
+        ("31/12/1999", None),
+        ("02/29/2001", None),
+        ("2025-06-16", None),
+        ("1899-12-31", None),
+        ("1990-5-15", None),
+        ("not-a-date", None),
+    ])
+    def test_same_result_as_parsing(self, date_table, date_string, locale):
+        """✅ Test table mode reports the same error as the parsing path"""
+        with_table = check_birth_date(date_string, locale)
+        disable_date_table()
+        assert with_table == check_birth_date(date_string, locale)
+
+    def test_formats_are_counted(self, date_table):
+        """✅ Test table hits still feed the date format metrics"""
+        metrics.reset()
+        check_birth_date("05/06/1990", "en-GB")
+        assert "birth_date_formats_total{format=\"%d/%m/%Y\"} 1" in metrics.render()
+
+    def test_lazy_build(self):
+        """✅ Test the table can be filled on first use"""
+        table = enable_date_table(build=False)
+        try:
+            assert len(table) == 0
+            assert check_birth_date("1990-05-15") is None
+            assert get_date_table() is table and len(table) > 0
+        finally:
+            disable_date_table()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
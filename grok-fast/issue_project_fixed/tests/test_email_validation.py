@@ -0,0 +1,78 @@
+"""
+Email validator unit tests
+Syntax, IDNA normalization and disposable-domain checks
+"""
+import pytest
+from src.email_validation import (
+    DISPOSABLE_EMAIL,
+    INVALID_EMAIL,
+    domain_cache_info,
+    normalize_domain,
+    normalize_email,
+    validate_email,
+)
+from src.validators import validate_registration_batch, validate_registration_data
+
+
+class TestValidateEmail:
+    """Email validation test class"""
+
+    @pytest.mark.parametrize("email", [
+        "test@example.com",
+        "first.last+tag@sub.example.co.uk",
+        "o'brien@example.org",
+        "user@bücher.example",
+        "user@xn--bcher-kva.example",
+        "USER@EXAMPLE.COM",
+    ])
+    def test_valid_addresses(self, email):
+        """✅ Test common valid addresses are accepted"""
+        assert validate_email(email) == (True, "Email format is valid")
+
+    @pytest.mark.parametrize("email", [
+        "", None, 42, "invalid-email", "@example.com", "user@", "user@localhost",
+        "a@b@example.com", ".user@example.com", "user.@example.com", "us..er@example.com",
+        "user@-example.com", "user@example-.com", "user@exa_mple.com", "user@example.c0m1",
+        "user name@example.com", "user@example..com", "user@.example.com",
+        "x" * 65 + "@example.com", "user@" + "a" * 250 + ".com",
+    ])
+    def test_invalid_addresses(self, email):
+        """✅ Test malformed addresses are rejected"""
+        assert validate_email(email) == (False, INVALID_EMAIL)
+
+    def test_disposable_domains(self):
+        """✅ Test disposable domains and their subdomains are rejected"""
+        assert validate_email("x@mailinator.com") == (False, DISPOSABLE_EMAIL)
+        assert validate_email("x@EU.Mailinator.com") == (False, DISPOSABLE_EMAIL)
+        assert validate_email("x@notmailinator.com")[0] is True
+
+    def test_normalization(self):
+        """✅ Test domains are lowercased and IDNA-encoded, local parts kept"""
+        assert normalize_domain("Bücher.Example") == "xn--bcher-kva.example"
+        assert normalize_email("John.Doe@EXAMPLE.com") == "John.Doe@example.com"
+        assert normalize_email("invalid-email") is None
+
+    def test_domain_verdicts_are_cached(self):
+        """✅ Test repeated domains skip the domain checks"""
+        before = domain_cache_info().hits
+        for index in range(5):
+            validate_email(f"user{index}@cached-domain.example")
+        assert domain_cache_info().hits - before == 4
+
+
+class TestRegistrationEmail:
+    """Registration integration tests"""
+
+    def test_registration_uses_email_validator(self):
+        """✅ Test registration reports the email validator's message"""
+        result = validate_registration_data("testuser", "x@yopmail.com", "1990-05-15")
+        assert result == {"valid": False, "errors": [DISPOSABLE_EMAIL]}
+
+    def test_batch_matches_per_record(self):
+        """✅ Test batch validation gives the same email verdicts"""
+        emails = ["ok@example.com", "x@yopmail.com", "a@b", None]
+        result = validate_registration_batch(
+            ["testuser"] * 4, emails, ["1990-05-15"] * 4
+        )
+        for index, email in enumerate(emails):
+            assert result.result(index) == validate_registration_data("testuser", email, "1990-05-15")
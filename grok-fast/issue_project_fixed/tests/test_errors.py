@@ -0,0 +1,77 @@
+"""
+Validation error code tests
+Codes render to the original messages, and compact responses carry codes only
+"""
+import json
+
+import pytest
+from src import errors
+from src.app import app
+from src.registration import registration_response
+from src.validators import check_birth_date, registration_errors
+
+
+class TestErrorCodes:
+    """Error code test class"""
+
+    def test_messages_render_lazily(self):
+        """✅ Test messages are rendered from the code and its params"""
+        assert errors.invalid_date_format("13/13/1990").message == (
+            "Invalid date format. Supported formats: YYYY-MM-DD, MM/DD/YYYY, DD/MM/YYYY."
+            " Received: 13/13/1990"
+        )
+        assert errors.date_out_of_range(1900, 2025).message == "Birth year must be between 1900 and 2025"
+        assert errors.invalid_date_format("{0}{x}").message.endswith("Received: {0}{x}")
+
+    def test_parameterless_errors_are_shared(self):
+        """✅ Test common rejections reuse one error object"""
+        assert check_birth_date("") is errors.DATE_EMPTY_ERROR
+        assert check_birth_date("2999-01-01") is errors.DATE_FUTURE_ERROR
+        assert check_birth_date("1850-01-01") is check_birth_date("1850-02-01")
+
+    def test_code_index(self):
+        """✅ Test every code has one array position, with 0 kept for a pass"""
+        assert errors.CODES[errors.NO_ERROR] is None
+        assert set(errors.CODE_INDEX) == set(errors.MESSAGES)
+        for code, index in errors.CODE_INDEX.items():
+            assert errors.CODES[index] is code
+
+    def test_registration_errors(self):
+        """✅ Test registration errors are reported as codes in field order"""
+        found = registration_errors("ab", "bad", "not-a-date")
+        assert [error.code for error in found] == [
+            errors.USERNAME_TOO_SHORT, errors.EMAIL_INVALID, errors.DATE_INVALID_FORMAT,
+        ]
+        assert registration_errors("gooduser", "good@example.com", "1990-05-15") == []
+
+
+class TestCompactErrors:
+    """Compact error payload tests"""
+
+    BAD = {"username": "baduser", "email": "bad@nowhere", "birth_date": "not-a-date"}
+
+    def test_codes_mode(self):
+        """✅ Test ?errors=codes returns only the codes"""
+        client = app.test_client()
+        response = client.post('/api/register?errors=codes', json=self.BAD)
+        assert response.status_code == 400
+        assert json.loads(response.data) == {
+            "success": False,
+            "errors": ["email_invalid", "date_invalid_format"],
+        }
+        verbose = client.post('/api/register', json=self.BAD)
+        assert json.loads(verbose.data)["message"] == "Registration data validation failed"
+        assert len(response.data) < len(verbose.data) / 2
+
+    @pytest.mark.parametrize("first_date,second_date", [
+        ("not-a-date", "garbage"),
+        ("2999-01-01", "2998-05-05"),
+        ("1850-01-01", "1700-01-01"),
+    ])
+    def test_compact_bodies_are_preencoded(self, first_date, second_date):
+        """✅ Test compact rejections with the same codes share one encoded body"""
+        first, _ = registration_response(dict(self.BAD, birth_date=first_date), codes=True)
+        second, _ = registration_response(
+            dict(self.BAD, username="otheruser", birth_date=second_date), codes=True
+        )
+        assert first is second
@@ -0,0 +1,157 @@
+"""
+Early-reject guard tests
+Size limits and cheap checks in front of full validation
+"""
+import json
+
+import pytest
+from src import errors
+from src.app import app
+from src.guard import MALFORMED, MAX_BODY_BYTES, MAX_FIELDS, screen
+from src.registration import registration_response
+from src.schema import DEFAULT_SCHEMA_PATH, compile_schema, load_schema
+
+
+@pytest.fixture(scope="module")
+def prescreen():
+    """Cheap rules of the default registration schema"""
+    return load_schema(DEFAULT_SCHEMA_PATH).prescreen
+
+
+@pytest.fixture
+def client():
+    """Create test client"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestScreen:
+    """screen() test class"""
+
+    def test_plausible_body_passes(self, prescreen):
+        """✅ Test a well-formed body is left to full validation"""
+        assert screen({"username": "gooduser", "email": "a@b", "birth_date": "junk"}, prescreen) is None
+
+    @pytest.mark.parametrize("data", [
+        None,
+        [],
+        "text",
+        {f"field{i}": i for i in range(MAX_FIELDS + 1)},
+        {"username": "gooduser", "email": "a@b.com", "birth_date": "1" * 33},
+    ])
+    def test_malformed(self, data):
+        """✅ Test non-objects, too many fields and oversized dates are malformed"""
+        assert screen(data) is MALFORMED
+
+    def test_cheap_errors(self, prescreen):
+        """✅ Test missing keys and bad lengths are caught without parsing"""
+        assert screen({"username": "ab"}, prescreen) == [
+            errors.USERNAME_TOO_SHORT_ERROR, errors.EMAIL_INVALID_ERROR, errors.DATE_EMPTY_ERROR,
+        ]
+        assert screen({"username": "a" * 65, "email": "no-at-sign", "birth_date": "1990-01-01"},
+                      prescreen) == [errors.USERNAME_TOO_LONG_ERROR, errors.EMAIL_INVALID_ERROR]
+
+    def test_normalized_username_length(self, prescreen):
+        """✅ Test username lengths are counted on the NFKC form"""
+        body = {"email": "a@example.com", "birth_date": "1990-01-01"}
+        assert screen({**body, "username": "e\u0301e\u0301"}, prescreen) == [errors.USERNAME_TOO_SHORT_ERROR]
+        assert screen({**body, "username": "\ufb03"}, prescreen) is None
+
+    def test_cheap_rules_follow_the_schema(self):
+        """✅ Test only the rules before a field's first check are prescreened"""
+        prescreen = compile_schema({"fields": [
+            {"name": "username", "type": "string",
+             "rules": [{"min_length": 2, "error": "username_too_short"}]},
+            {"name": "email", "type": "string", "type_error": "email_invalid",
+             "rules": [{"check": "email"}, {"contains": "@", "error": "email_invalid"}]},
+        ]}).prescreen
+        assert screen({"username": "ab", "email": "no-at-sign"}, prescreen) is None
+        assert screen({"username": "a"}, prescreen) == [errors.USERNAME_TOO_SHORT_ERROR]
+
+    def test_shape_only_without_prescreen(self):
+        """✅ Test field values are not judged when no prescreen is given"""
+        assert screen({"username": "ab"}) is None
+
+
+class TestRegisterLimits:
+    """Request size limit tests"""
+
+    def test_oversized_body(self, client):
+        """✅ Test bodies over the limit get 413 before being parsed"""
+        body = b'{"username": "' + b"a" * MAX_BODY_BYTES + b'"}'
+        response = client.post('/api/register', data=body, content_type='application/json')
+        assert response.status_code == 413
+        assert json.loads(response.data) == {"success": False, "message": "Request body too large"}
+
+    def test_limit_is_configurable(self, client):
+        """✅ Test REGISTER_MAX_BODY_BYTES is honoured"""
+        app.config["REGISTER_MAX_BODY_BYTES"] = 16
+        try:
+            response = client.post('/api/register', json={"username": "gooduser"})
+        finally:
+            app.config["REGISTER_MAX_BODY_BYTES"] = MAX_BODY_BYTES
+        assert response.status_code == 413
+
+    def test_too_many_fields(self, client):
+        """✅ Test objects with many keys are invalid requests"""
+        data = {f"field{i}": i for i in range(MAX_FIELDS + 1)}
+        response = client.post('/api/register', json=data)
+        assert response.status_code == 400
+        assert json.loads(response.data)["message"] == "Invalid request data"
+
+    def test_username_too_long(self, client):
+        """✅ Test usernames over 64 characters are rejected"""
+        response = client.post('/api/register', json={
+            "username": "a" * 65, "email": "long@test.com", "birth_date": "1990-01-01"
+        })
+        assert response.status_code == 400
+        assert json.loads(response.data)["errors"] == ["Username must be at most 64 characters"]
+
+
+class TestEarlyReject:
+    """Precomputed reject response tests"""
+
+    @pytest.mark.parametrize("codes", [False, True])
+    def test_rejects_share_one_body(self, codes):
+        """✅ Test rejects with the same errors reuse one encoded body"""
+        first, status = registration_response({"username": "ab"}, codes=codes)
+        second, _ = registration_response(
+            {"username": "x", "email": 1, "birth_date": ""}, codes=codes
+        )
+        assert status == 400
+        assert first is second
+
+    def test_date_parser_is_skipped(self, monkeypatch):
+        """✅ Test bodies failing cheap checks never reach the date parser"""
+        from src import validators
+
+        def fail(*args):
+            raise AssertionError("date parser ran")
+
+        monkeypatch.setattr(validators, "_check_birth_date", fail)
+        monkeypatch.setattr(validators, "parse_date", fail)
+        monkeypatch.setattr(validators, "_birth_date_cache", None)
+        monkeypatch.setattr(validators, "_date_table", None)
+        for data in ({"username": "ab", "email": "a@example.com", "birth_date": "1990-01-01"},
+                     {"username": "gooduser", "email": "bad", "birth_date": "1990-01-01"}):
+            body, status = registration_response(data)
+            assert status == 400
+
+    def test_malformed_skips_validation(self, monkeypatch):
+        """✅ Test malformed bodies never reach the registration schema"""
+        from src import registration
+
+        def fail(*args):
+            raise AssertionError("schema ran")
+
+        fail.prescreen = fail
+        monkeypatch.setattr(registration.SchemaFile, "validator", lambda self: fail)
+        data = {f"field{i}": i for i in range(MAX_FIELDS + 1)}
+        body, status = registration_response(data)
+        assert status == 400
+        assert json.loads(body)["message"] == "Invalid request data"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+"""
+JSON provider tests
+"""
+import json
+from datetime import date
+
+import pytest
+import src.json_provider as json_provider
+from src.app import app
+from src.json_provider import dumps_bytes, encode_response, loads
+from src.registration import (
+    INVALID_REQUEST,
+    encode_success,
+    registration_response,
+    registration_success,
+)
+
+BODY = {"success": False, "errors": ["Invalid email format"], "message": "failed"}
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib"""
+    if request.param == "fast":
+        if json_provider.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_provider, "orjson", None)
+    return request.param
+
+
+class TestJSONProvider:
+    """JSON provider test class"""
+    
+    def test_compact_sorted_output(self, backend):
+        """✅ Test output matches jsonify's compact, sorted layout"""
+        expected = json.dumps(BODY, sort_keys=True, separators=(",", ":")).encode()
+        assert dumps_bytes(BODY) == expected
+        assert encode_response(BODY) == expected + b"\n"
+    
+    def test_dates_use_flask_format(self, backend):
+        """✅ Test dates serialize the way Flask's default provider does"""
+        assert dumps_bytes({"d": date(2020, 1, 2)}) == b'{"d":"Thu, 02 Jan 2020 00:00:00 GMT"}'
+    
+    def test_loads_bytes_and_str(self, backend):
+        """✅ Test decoding from bytes and str, and rejecting bad input"""
+        assert loads(b'{"a": 1}') == loads('{"a": 1}') == {"a": 1}
+        with pytest.raises(ValueError):
+            loads("not json")
+    
+    def test_flask_provider_round_trip(self, backend):
+        """✅ Test the app's provider encodes and decodes"""
+        assert app.json.loads(app.json.dumps(BODY)) == BODY
+        with app.app_context():
+            assert app.json.response(BODY).data == encode_response(BODY)
+    
+    def test_constant_bodies_are_preencoded(self):
+        """✅ Test constant bodies are encoded once and reused"""
+        first, status = registration_response(None)
+        second, _ = registration_response([])
+        assert status == 400
+        assert first is second
+        assert json.loads(first) == INVALID_REQUEST
+    
+    @pytest.mark.parametrize("user_id", [1, 42, 10 ** 12])
+    def test_success_template(self, user_id, backend):
+        """✅ Test the spliced success body equals a fully encoded one"""
+        assert encode_success(user_id) == encode_response(registration_success(user_id))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,47 @@
+"""
+Locale hint unit tests
+Ambiguous slash dates follow the format order of the requester's locale
+"""
+from datetime import date
+
+import pytest
+from src.date_parser import EU_FORMAT, US_FORMAT, parse_date
+from src.locales import DAY_FIRST, DEFAULT_LOCALE, MONTH_FIRST, resolve_locale
+
+
+class TestResolveLocale:
+    """Locale index lookup tests"""
+
+    @pytest.mark.parametrize("hint,expected", [
+        (None, (DEFAULT_LOCALE, MONTH_FIRST)),
+        ("", (DEFAULT_LOCALE, MONTH_FIRST)),
+        ("en-US", ("en-us", MONTH_FIRST)),
+        ("en-GB", ("en-gb", DAY_FIRST)),
+        ("de_DE", ("de", DAY_FIRST)),
+        ("en", ("en", MONTH_FIRST)),
+        ("xx-YY", (DEFAULT_LOCALE, MONTH_FIRST)),
+    ])
+    def test_tags(self, hint, expected):
+        """✅ Test region tags win over their language, unknown tags use the default"""
+        assert resolve_locale(hint) == expected
+
+    def test_accept_language_quality(self):
+        """✅ Test the most preferred known language is used"""
+        assert resolve_locale("en-US;q=0.5, fr-CH, fr;q=0.9") == ("fr", DAY_FIRST)
+        assert resolve_locale("xx, *;q=0.1, en-AU;q=0.3") == ("en-au", DAY_FIRST)
+        assert resolve_locale("de;q=0, en-US") == ("en-us", MONTH_FIRST)
+        assert resolve_locale("de;q=bogus") == (DEFAULT_LOCALE, MONTH_FIRST)
+
+
+class TestLocaleParsing:
+    """Format order tests"""
+
+    def test_day_first_order(self):
+        """✅ Test ambiguous dates are read day first for day-first locales"""
+        assert parse_date("05/06/1990", DAY_FIRST) == (date(1990, 6, 5), EU_FORMAT)
+        assert parse_date("05/06/1990", MONTH_FIRST) == (date(1990, 5, 6), US_FORMAT)
+
+    def test_unambiguous_dates_ignore_order(self):
+        """✅ Test dates only one slash format can read still parse"""
+        assert parse_date("12/31/1999", DAY_FIRST) == (date(1999, 12, 31), US_FORMAT)
+        assert parse_date("31/12/1999", MONTH_FIRST) == (date(1999, 12, 31), EU_FORMAT)
@@ -0,0 +1,126 @@
+"""
+Metrics registry and /api/metrics tests
+"""
+import threading
+
+import pytest
+from src.app import app
+from src.metrics import MetricsRegistry, metrics
+from src.validators import check_birth_date, disable_birth_date_cache, enable_birth_date_cache
+
+
+@pytest.fixture
+def client():
+    """Create test client with a clean metrics registry"""
+    app.config['TESTING'] = True
+    metrics.reset()
+    with app.test_client() as client:
+        yield client
+
+
+class TestMetricsRegistry:
+    """Metrics registry test class"""
+    
+    def test_counter_exposition(self):
+        """✅ Test counters render in text exposition format"""
+        registry = MetricsRegistry()
+        registry.inc("registration_requests_total", "success")
+        registry.inc("registration_requests_total", "success")
+        registry.inc("registration_errors_total", 'say "hi"')
+        text = registry.render()
+        assert "# TYPE registration_requests_total counter" in text
+        assert 'registration_requests_total{outcome="success"} 2' in text
+        assert 'registration_errors_total{error="say \\"hi\\""} 1' in text
+    
+    def test_histogram_buckets(self):
+        """✅ Test histogram buckets are cumulative with sum and count"""
+        registry = MetricsRegistry(buckets=(0.001, 0.01))
+        for seconds in (0.0005, 0.005, 0.5):
+            registry.observe("registration_stage_seconds", "parse", seconds)
+        text = registry.render()
+        assert 'registration_stage_seconds_bucket{stage="parse",le="0.001"} 1' in text
+        assert 'registration_stage_seconds_bucket{stage="parse",le="0.01"} 2' in text
+        assert 'registration_stage_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+        assert 'registration_stage_seconds_count{stage="parse"} 3' in text
+    
+    def test_disabled_records_nothing(self):
+        """✅ Test a disabled registry is a no-op"""
+        registry = MetricsRegistry(enabled=False)
+        registry.inc("registration_requests_total", "success")
+        assert "registration_requests_total{" not in registry.render()
+    
+    def test_threads_are_aggregated(self):
+        """✅ Test per-thread shards, including finished threads, are summed"""
+        registry = MetricsRegistry()
+        
+        def work():
+            for _ in range(100):
+                registry.inc("registration_requests_total", "success")
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        work()
+        assert 'registration_requests_total{outcome="success"} 500' in registry.render()
+        assert len(registry._shards) == 1
+
+
+class TestMetricsEndpoint:
+    """Metrics endpoint test class"""
+    
+    def test_register_is_instrumented(self, client):
+        """✅ Test outcomes, error types, stages and date formats are exported"""
+        client.post('/api/register', json={
+            "username": "metricuser", "email": "m@test.com", "birth_date": "05/15/1990"
+        })
+        client.post('/api/register', json={
+            "username": "metricuser2", "email": "m2@test.com", "birth_date": "not-a-date"
+        })
+        client.post('/api/register', json={
+            "username": "ab", "email": "m@test.com", "birth_date": "not-a-date"
+        })
+        response = client.get('/api/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+        text = response.get_data(as_text=True)
+        assert 'registration_requests_total{outcome="success"} 1' in text
+        assert 'registration_requests_total{outcome="validation_failed"} 1' in text
+        assert 'registration_requests_total{outcome="early_reject"} 1' in text
+        assert 'registration_errors_total{error="date_invalid_format"} 1' in text
+        assert 'registration_errors_total{error="username_too_short"} 1' in text
+        assert 'birth_date_formats_total{format="%m/%d/%Y"} 1' in text
+        assert 'registration_stage_seconds_count{stage="parse"} 3' in text
+        assert 'registration_stage_seconds_count{stage="validate"} 3' in text
+    
+    def test_locale_hit_rate(self, client):
+        """✅ Test Accept-Language picks the date order and hit rates are counted per locale"""
+        for birth_date in ("05/06/1990", "25/06/1990", "06/25/1990"):
+            client.post('/api/register', headers={"Accept-Language": "en-GB,en;q=0.8"}, json={
+                "username": "localeuser", "email": "l@test.com", "birth_date": birth_date
+            })
+        text = client.get('/api/metrics').get_data(as_text=True)
+        assert 'birth_date_formats_total{format="%d/%m/%Y"} 2' in text
+        assert 'birth_date_locale_hits_total{locale="en-gb"} 2' in text
+        assert 'birth_date_locale_misses_total{locale="en-gb"} 1' in text
+    
+    def test_cache_hits_are_counted(self):
+        """✅ Test dates served from the birth date cache still count their format"""
+        metrics.reset()
+        cache = enable_birth_date_cache()
+        try:
+            for _ in range(5):
+                assert check_birth_date("25/06/1990", "en-GB") is None
+                check_birth_date("not-a-date")
+        finally:
+            disable_birth_date_cache()
+        assert cache.info()["hits"] == 8
+        text = metrics.render()
+        assert 'birth_date_formats_total{format="%d/%m/%Y"} 5' in text
+        assert 'birth_date_formats_total{format="unparsed"} 5' in text
+        assert 'birth_date_locale_hits_total{locale="en-gb"} 5' in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""
+Static page tests
+Pre-compressed registration page, ETags and content negotiation
+"""
+import gzip
+
+import pytest
+from src import page
+from src.app import REGISTER_PAGE, app
+from src.page import GZIP, IDENTITY, StaticPage
+
+
+@pytest.fixture
+def client():
+    """Create test client"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def static_page():
+    """Page over a small body, without brotli"""
+    return StaticPage(b"<p>hello</p>" * 50)
+
+
+class TestNegotiation:
+    """Accept-Encoding negotiation test class"""
+
+    @pytest.mark.parametrize("accept_encoding,expected", [
+        (None, IDENTITY),
+        ("", IDENTITY),
+        ("gzip", GZIP),
+        ("gzip, deflate", GZIP),
+        ("deflate", IDENTITY),
+        ("gzip;q=0, identity", IDENTITY),
+        ("GZIP;q=0.5, identity;q=0.4", GZIP),
+        ("*", GZIP),
+        ("identity;q=0, gzip", GZIP),
+        ("identity;q=0", None),
+        ("*;q=0", None),
+    ])
+    def test_encoding_for(self, static_page, accept_encoding, expected):
+        """✅ Test the encoding follows Accept-Encoding and its q-values"""
+        assert static_page.encoding_for(accept_encoding) == expected
+
+    def test_brotli_preferred(self, monkeypatch):
+        """✅ Test brotli wins over gzip when it is installed"""
+        fake = type("brotli", (), {"compress": staticmethod(lambda body, quality: b"br" + body)})
+        monkeypatch.setattr(page, "brotli", fake)
+        with_brotli = StaticPage(b"body")
+        assert with_brotli.encoding_for("gzip, deflate, br") == page.BROTLI
+        status, headers, body = with_brotli.respond("br")
+        assert body == b"brbody"
+        assert ("Content-Encoding", "br") in headers
+
+
+class TestResponses:
+    """StaticPage.respond test class"""
+
+    def test_variants_decode_to_the_page(self, static_page):
+        """✅ Test the gzip variant holds the same document"""
+        status, headers, body = static_page.respond("gzip")
+        assert status == 200
+        assert gzip.decompress(body) == static_page.bodies[IDENTITY]
+        assert len(body) < len(static_page.bodies[IDENTITY])
+
+    def test_etags_differ_per_encoding(self, static_page):
+        """✅ Test each representation has its own strong ETag"""
+        etags = set(static_page.etags.values())
+        assert len(etags) == len(static_page.bodies)
+        assert all(etag.startswith('"') for etag in etags)
+
+    def test_not_modified(self, static_page):
+        """✅ Test a matching If-None-Match gets an empty 304"""
+        etag = static_page.etags[GZIP]
+        status, headers, body = static_page.respond("gzip", etag)
+        assert (status, body) == (304, b"")
+        assert ("ETag", etag) in headers
+        # The identity ETag does not validate the gzip representation
+        assert static_page.respond("gzip", static_page.etags[IDENTITY])[0] == 200
+        assert static_page.respond(None, f'"x", {static_page.etags[IDENTITY]}')[0] == 304
+        assert static_page.respond(None, "*")[0] == 304
+
+    def test_not_acceptable(self, static_page):
+        """✅ Test refusing every encoding gets 406"""
+        assert static_page.respond("identity;q=0")[0] == 406
+
+
+class TestIndexRoute:
+    """GET / test class"""
+
+    def test_page_is_prerendered(self, client, monkeypatch):
+        """✅ Test the page is served without rendering the template"""
+        import flask
+
+        monkeypatch.setattr(flask, "render_template", None)
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.data == REGISTER_PAGE.bodies[IDENTITY]
+        assert response.headers["Cache-Control"] == page.CACHE_CONTROL
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["ETag"] == REGISTER_PAGE.etags[IDENTITY]
+
+    def test_gzip(self, client):
+        """✅ Test gzip-capable clients get the compressed page"""
+        response = client.get('/', headers={"Accept-Encoding": "gzip, deflate"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.data) == REGISTER_PAGE.bodies[IDENTITY]
+        assert int(response.headers["Content-Length"]) == len(REGISTER_PAGE.bodies[GZIP])
+
+    def test_revalidation(self, client):
+        """✅ Test revalidating with the ETag gets 304"""
+        etag = client.get('/').headers["ETag"]
+        response = client.get('/', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
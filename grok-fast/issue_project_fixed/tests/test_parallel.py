@@ -0,0 +1,49 @@
+"""
+Parallel validation executor tests
+"""
+import pytest
+from src.parallel import ParallelValidator, validate_records, validate_registration_parallel
+from src.validators import validate_registration_data
+
+RECORDS = [
+    {"username": "user%d" % i, "email": "user%d@example.com" % i,
+     "birth_date": ["1990-05-15", "05/15/1990", "not-a-date", "2999-01-01"][i % 4]}
+    for i in range(200)
+]
+
+EXPECTED = [
+    validate_registration_data(r["username"], r["email"], r["birth_date"]) for r in RECORDS
+]
+
+
+class TestParallelValidator:
+    """Parallel executor test class"""
+    
+    def test_chunk_matches_per_record(self):
+        """✅ Test a chunk gives validate_registration_data results"""
+        assert validate_records(RECORDS) == EXPECTED
+    
+    def test_pool_results_in_order(self):
+        """✅ Test pooled results come back in input order"""
+        with ParallelValidator(workers=2, chunk_size=16) as validator:
+            assert validator.validate(iter(RECORDS)) == EXPECTED
+            assert validator._executor is not None
+    
+    def test_small_jobs_run_inline(self):
+        """✅ Test small inputs never start the pool"""
+        with ParallelValidator(workers=4, chunk_size=100) as validator:
+            assert validator.validate(RECORDS[:150]) == EXPECTED[:150]
+            assert validator._executor is None
+    
+    def test_convenience_function(self):
+        """✅ Test validate_registration_parallel"""
+        assert validate_registration_parallel(RECORDS, workers=2, chunk_size=50) == EXPECTED
+    
+    def test_invalid_chunk_size(self):
+        """✅ Test chunk size must be positive"""
+        with pytest.raises(ValueError):
+            ParallelValidator(chunk_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
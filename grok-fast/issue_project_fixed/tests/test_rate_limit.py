@@ -0,0 +1,146 @@
+"""
+Rate limiter tests
+Token buckets in the shared table and the 429 middleware
+"""
+import json
+import multiprocessing
+from types import SimpleNamespace
+
+import pytest
+from src import rate_limit
+from src.app import app, rate_limiter
+from src.rate_limit import (
+    IP_BURST,
+    RateLimiter,
+    SharedBucketTable,
+    client_keys,
+)
+
+
+@pytest.fixture
+def limiter():
+    """Limiter over a private 64-slot table"""
+    table = SharedBucketTable(slots=64)
+    yield RateLimiter(table, ip_rate=1, ip_burst=3, subnet_rate=2, subnet_burst=5)
+    table.close()
+
+
+class TestClientKeys:
+    """Bucket key test class"""
+
+    def test_subnets(self):
+        """✅ Test addresses in one /24 or /64 share the subnet key only"""
+        first, second = client_keys("10.0.0.1"), client_keys("10.0.0.2")
+        assert first[0] != second[0]
+        assert first[1] == second[1]
+        assert client_keys("10.0.1.1")[1] != first[1]
+        assert client_keys("2001:db8::1")[1] == client_keys("2001:db8::ffff")[1]
+
+    def test_unparseable_address(self):
+        """✅ Test odd REMOTE_ADDR values still get buckets"""
+        ip_key, subnet_key = client_keys("unix-socket")
+        assert ip_key and subnet_key
+
+
+class TestTokenBuckets:
+    """Token bucket test class"""
+
+    def test_burst_then_refill(self, limiter):
+        """✅ Test a client gets its burst, then one request per 1/rate seconds"""
+        assert [limiter.check("10.0.0.1", now=100.0) for _ in range(3)] == [0.0] * 3
+        assert limiter.check("10.0.0.1", now=100.0) == pytest.approx(1.0)
+        assert limiter.check("10.0.0.1", now=100.5) == pytest.approx(0.5)
+        assert limiter.check("10.0.0.1", now=101.0) == 0.0
+
+    def test_subnet_limit(self, limiter):
+        """✅ Test many IPs of one subnet share the subnet's bucket"""
+        allowed = [limiter.check(f"10.0.0.{i}", now=100.0) == 0.0 for i in range(8)]
+        assert allowed == [True] * 5 + [False] * 3
+        assert limiter.check("10.0.9.1", now=100.0) == 0.0
+
+    def test_rejects_do_not_spend_tokens(self, limiter):
+        """✅ Test a request refused by the subnet leaves the IP's bucket alone"""
+        for i in range(5):
+            limiter.check(f"10.0.0.{i}", now=100.0)
+        assert limiter.check("10.0.0.200", now=100.0) > 0
+        assert [limiter.check("10.0.0.200", now=110.0) for _ in range(3)] == [0.0] * 3
+
+    def test_table_full(self):
+        """✅ Test a full table reuses slots instead of failing"""
+        table = SharedBucketTable(slots=8)
+        limiter = RateLimiter(table)
+        try:
+            for i in range(100):
+                assert limiter.check(f"10.{i}.0.1", now=100.0 + i) == 0.0
+            assert table.used() == 8
+        finally:
+            table.close()
+
+    def test_invalid_size(self):
+        """✅ Test table sizes must be powers of two"""
+        with pytest.raises(ValueError):
+            SharedBucketTable(slots=100)
+
+
+def _spend(path, count, results):
+    limiter = RateLimiter(SharedBucketTable(path))
+    results.put(sum(limiter.check("10.0.0.1", now=100.0) == 0.0 for _ in range(count)))
+
+
+@pytest.mark.skipif(rate_limit.fcntl is None, reason="needs fcntl")
+def test_shared_between_processes(tmp_path):
+    """✅ Test workers opening the same file enforce one limit"""
+    path = str(tmp_path / "buckets")
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_spend, args=(path, 15, results)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert results.get() + results.get() == IP_BURST
+
+
+class TestMiddleware:
+    """429 middleware test class"""
+
+    def test_too_many_requests(self, monkeypatch):
+        """✅ Test over-limit clients get a precomputed 429 with Retry-After"""
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: 100.0))
+        client = app.test_client()
+        statuses = [
+            client.post('/api/register', json={"username": "ab"}).status_code
+            for _ in range(int(IP_BURST) + 1)
+        ]
+        assert statuses == [400] * int(IP_BURST) + [429]
+        response = client.post('/api/register', json={"username": "ab"})
+        assert response.headers["Retry-After"] == "1"
+        assert json.loads(response.data) == {"success": False, "message": "Too many requests"}
+
+    def test_batch_records_are_charged(self, monkeypatch):
+        """✅ Test each batch record costs a token, so batches cannot bypass the limit"""
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: 100.0))
+        client = app.test_client()
+        response = client.post('/api/register/batch', json=[{"username": "ab"}] * (int(IP_BURST) + 5))
+        lines = [json.loads(line) for line in response.data.splitlines()]
+        assert [line["status"] for line in lines] == [400] * int(IP_BURST) + [429] * 5
+        assert lines[-1] == {"success": False, "message": "Too many requests",
+                             "index": int(IP_BURST) + 4, "status": 429, "retry_after": 1}
+        assert client.post('/api/register', json={"username": "ab"}).status_code == 429
+
+    def test_other_paths_not_limited(self):
+        """✅ Test only the registration endpoints are throttled"""
+        client = app.test_client()
+        for _ in range(int(IP_BURST) + 5):
+            assert client.get('/api/health').status_code == 200
+
+    def test_disabled(self, monkeypatch):
+        """✅ Test a disabled limiter lets everything through"""
+        monkeypatch.setattr(rate_limiter, "enabled", False)
+        client = app.test_client()
+        for _ in range(int(IP_BURST) + 5):
+            assert client.post('/api/register', json={"username": "ab"}).status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
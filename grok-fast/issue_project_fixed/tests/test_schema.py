@@ -0,0 +1,258 @@
+"""
+Registration schema tests
+Compiled validators must match the hand-written rules
+"""
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from src import errors
+from src.email_validation import check_email
+from src.registration import registration_outcome
+from src.schema import (
+    DEFAULT_SCHEMA_PATH,
+    SchemaError,
+    SchemaFile,
+    compile_schema,
+    get_schema,
+    load_schema,
+    set_schema,
+)
+from src.validators import (
+    check_birth_date,
+    normalize_text,
+    registration_errors,
+    validate_registration_batch,
+    validate_registration_data,
+)
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+USERNAMES = [
+    "", "ab", "abc", "a" * 64, "a" * 65, None, 123, ["abc"], "Ünïcødé",
+    "\uff41\uff42", "e\u0301e\u0301e", "\ufb03", "\u00e9" * 64 + "e\u0301",
+]
+EMAILS = ["", "bad", "user@example.com", "user@mailinator.com", "a@b", None, 5]
+DATES = ["", "1990-05-15", "05/06/1990", "31/12/1999", "2999-01-01", "1850-01-01", "junk", None]
+
+
+def reference_errors(username, email, birth_date, locale=None):
+    """The rules /api/register applied before they moved into the schema"""
+    found = []
+    length = len(normalize_text(username)) if isinstance(username, str) else -1
+    if length < 3:
+        found.append(errors.USERNAME_TOO_SHORT_ERROR)
+    elif length > 64:
+        found.append(errors.USERNAME_TOO_LONG_ERROR)
+    for error in (check_email(email), check_birth_date(birth_date, locale)):
+        if error is not None:
+            found.append(error)
+    return found
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    """Writable copy of the default schema"""
+    path = tmp_path / "rules.json"
+    path.write_bytes(open(DEFAULT_SCHEMA_PATH, "rb").read())
+    return path
+
+
+def rewrite(path, schema):
+    """Replace the schema file so that its stamp changes"""
+    stat = os.stat(path)
+    path.write_text(json.dumps(schema))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestDefaultSchema:
+    """Default schema test class"""
+
+    def test_matches_reference_rules(self):
+        """✅ Test the default schema reports exactly what the hand-written rules did"""
+        validate = load_schema(DEFAULT_SCHEMA_PATH)
+        for username, email, birth_date in itertools.product(USERNAMES, EMAILS, DATES):
+            data = {"username": username, "email": email, "birth_date": birth_date}
+            for locale in (None, "en-GB"):
+                assert validate(data, locale) == reference_errors(
+                    username, email, birth_date, locale
+                )
+
+    def test_missing_fields(self):
+        """✅ Test missing fields read as empty strings"""
+        validate = load_schema(DEFAULT_SCHEMA_PATH)
+        assert validate({}) == reference_errors("", "", "")
+
+    def test_unrolled(self):
+        """✅ Test the generated code has no loop over fields or rules"""
+        validate = load_schema(DEFAULT_SCHEMA_PATH).source.split("\ndef ")[0]
+        assert "for " not in validate
+        assert "len(value) < 3" in validate
+
+
+class TestCompileSchema:
+    """compile_schema test class"""
+
+    def test_custom_rules(self):
+        """✅ Test pattern and contains rules, in order, first failure wins"""
+        validate = compile_schema({"fields": [
+            {"name": "username", "type": "string", "rules": [
+                {"min_length": 5, "error": "username_too_short"},
+                {"pattern": "[a-z0-9_]+", "error": "username_too_long"},
+            ]},
+            {"name": "email", "type": "string", "rules": [
+                {"contains": "@", "error": "email_invalid"},
+            ]},
+        ]})
+        assert validate({"username": "abc", "email": "x@y"}) == [errors.USERNAME_TOO_SHORT_ERROR]
+        assert validate({"username": "Abcdef", "email": "xy"}) == [
+            errors.USERNAME_TOO_LONG_ERROR, errors.EMAIL_INVALID_ERROR,
+        ]
+        assert validate({"username": "abcdef", "email": "x@y"}) == []
+
+    def test_default_value(self):
+        """✅ Test a field default replaces missing values"""
+        validate = compile_schema({"fields": [
+            {"name": "birth_date", "default": "1990-01-01", "rules": [{"check": "birth_date"}]},
+        ]})
+        assert validate({}) == []
+
+    def test_non_finite_default(self):
+        """✅ Test JSON NaN and Infinity defaults compile into working code"""
+        schema = json.loads('{"fields": [{"name": "x", "default": NaN, "rules": []},'
+                            ' {"name": "y", "default": Infinity, "rules": [{"check": "email"}]}]}')
+        validate = compile_schema(schema)
+        assert validate({}) == [errors.EMAIL_INVALID_ERROR]
+        assert validate.prescreen({}) == []
+        assert validate.batch([{}]) == [(0, [errors.EMAIL_INVALID_ERROR])]
+
+    @pytest.mark.parametrize("schema", [
+        {},
+        {"fields": []},
+        {"fields": [{"rules": []}]},
+        {"fields": [{"name": "x", "type": "int"}]},
+        {"fields": [{"name": "x", "rules": [{"check": "nope"}]}]},
+        {"fields": [{"name": "x", "type": "string", "rules": [{"min_length": 1, "error": "nope"}]}]},
+        {"fields": [{"name": "x", "type": "string", "rules": [{"min_length": -1, "error": "email_invalid"}]}]},
+        {"fields": [{"name": "x", "type": "string", "rules": [{"pattern": "(", "error": "email_invalid"}]}]},
+        {"fields": [{"name": "x", "rules": [{"max_length": 3, "error": "email_invalid"}]}]},
+        {"fields": [{"name": "x", "type": "string", "rules": [{"shout": 1, "error": "email_invalid"}]}]},
+        {"fields": [{"name": "username", "type": "string"}]},
+        {"fields": [{"name": "x", "type": "string", "rules": [{"min_length": 1, "error": ["email_invalid"]}]}]},
+        {"fields": [{"name": "x", "rules": [{"check": ["email"]}]}]},
+        {"fields": [{"name": "x", "rules": 5}]},
+        {"fields": [{"name": "x", "type": "string", "type_error": {}, "rules": []}]},
+    ])
+    def test_invalid_schemas(self, schema):
+        """✅ Test malformed schemas are refused at compile time"""
+        with pytest.raises(SchemaError):
+            compile_schema(schema)
+
+
+class TestHotReload:
+    """SchemaFile reload test class"""
+
+    def test_reloads_on_change(self, schema_path):
+        """✅ Test an edited schema replaces the validator without a restart"""
+        schema = SchemaFile(str(schema_path), check_interval=0)
+        old = schema.validator()
+        assert old({"username": "abcd", "email": "a@example.com", "birth_date": "1990-01-01"}) == []
+        rules = json.loads(schema_path.read_text())
+        rules["fields"][0]["rules"][0]["min_length"] = 5
+        rewrite(schema_path, rules)
+        new = schema.validator()
+        assert new is not old and schema.reloads == 1
+        assert new({"username": "abcd", "email": "a@example.com", "birth_date": "1990-01-01"}) == [
+            errors.USERNAME_TOO_SHORT_ERROR
+        ]
+
+    def test_unchanged_file_is_not_recompiled(self, schema_path):
+        """✅ Test the validator is reused while the file is unchanged"""
+        schema = SchemaFile(str(schema_path), check_interval=0)
+        assert schema.validator() is schema.validator()
+        assert schema.reloads == 0
+
+    def test_broken_schema_keeps_old_rules(self, schema_path):
+        """✅ Test a schema that fails to compile leaves the old validator in place"""
+        schema = SchemaFile(str(schema_path), check_interval=0)
+        old = schema.validator()
+        rewrite(schema_path, {"fields": [{"name": "x", "rules": [{"check": "nope"}]}]})
+        assert schema.validator() is old
+        os.remove(schema_path)
+        assert schema.validator() is old
+
+    def test_any_load_failure_keeps_old_rules(self, schema_path, monkeypatch):
+        """✅ Test even unexpected compile errors keep the old validator and are not retried"""
+        schema = SchemaFile(str(schema_path), check_interval=0)
+        old = schema.validator()
+        calls = []
+
+        def broken(path):
+            calls.append(path)
+            raise TypeError("unexpected")
+
+        monkeypatch.setattr("src.schema.load_schema", broken)
+        rewrite(schema_path, {"fields": [{"name": "username", "type": "string"}]})
+        assert schema.validator() is old
+        assert schema.validator() is old
+        assert len(calls) == 1
+
+    def test_broken_schema_over_http(self, schema_path):
+        """✅ Test a schema that fails to compile leaves /api/register on the old rules"""
+        previous = get_schema()
+        set_schema(SchemaFile(str(schema_path), check_interval=0))
+        try:
+            rewrite(schema_path, {"fields": [{"name": "username", "type": "string"}]})
+            body, status = registration_outcome({"username": "ab"}, codes=True)
+            assert status == 400
+        finally:
+            set_schema(previous)
+
+    def test_relaxed_schema_applies_everywhere(self, schema_path):
+        """✅ Test a reloaded schema can relax a rule for every validation path"""
+        previous = get_schema()
+        set_schema(SchemaFile(str(schema_path), check_interval=0))
+        try:
+            rules = json.loads(schema_path.read_text())
+            rules["fields"][0]["rules"][0]["min_length"] = 2
+            rewrite(schema_path, rules)
+            data = {"username": "ab", "email": "ab@example.com", "birth_date": "1990-01-01"}
+            assert registration_outcome(data)[1] == 201
+            assert registration_errors("ab", "ab@example.com", "1990-01-01") == []
+            assert validate_registration_data("ab", "ab@example.com", "1990-01-01")["valid"]
+            assert validate_registration_batch(records=[data]).valid == [True]
+        finally:
+            set_schema(previous)
+
+    def test_registration_uses_schema(self, schema_path):
+        """✅ Test /api/register validation follows the active schema"""
+        previous = get_schema()
+        set_schema(SchemaFile(str(schema_path), check_interval=0))
+        try:
+            data = {"username": "abcd", "email": "a@example.com", "birth_date": "1990-01-01"}
+            rules = json.loads(schema_path.read_text())
+            rules["fields"][0]["rules"][0]["min_length"] = 5
+            rewrite(schema_path, rules)
+            body, status = registration_outcome(data, codes=True)
+            assert status == 400
+            assert body["errors"] == ["username_too_short"]
+        finally:
+            set_schema(previous)
+
+    def test_validators_do_not_load_registrations(self):
+        """✅ Test validating records leaves the registration service unimported"""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, src.validators as v; v.validate_registration_batch(records=[{}]);"
+             " v.validate_registration_data('ab', 'x', ''); print('src.registration' in sys.modules)"],
+            cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,141 @@
+"""
+Uniqueness index unit tests
+Bloom filter, stores and the 409 response for taken names
+"""
+import json
+
+import pytest
+from src.app import app
+from src.uniqueness import (
+    EMAIL,
+    USERNAME,
+    BloomFilter,
+    MemoryStore,
+    SQLiteStore,
+    UniquenessIndex,
+    UniquenessStore,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each store implementation"""
+    if request.param == "memory":
+        yield MemoryStore()
+    else:
+        store = SQLiteStore(str(tmp_path / "unique.db"))
+        yield store
+        store.close()
+
+
+class TestBloomFilter:
+    """Bloom filter test class"""
+
+    def test_no_false_negatives(self):
+        """✅ Test every added key is reported present"""
+        bloom = BloomFilter(1000)
+        keys = [f"user{i}" for i in range(1000)]
+        bloom.update(keys)
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate(self):
+        """✅ Test the false positive rate stays near the target at capacity"""
+        bloom = BloomFilter(10000, error_rate=0.01)
+        bloom.update(f"user{i}" for i in range(10000))
+        false_positives = sum(f"other{i}" in bloom for i in range(10000))
+        assert false_positives < 200
+
+    def test_invalid_arguments(self):
+        """✅ Test capacity and error rate are checked"""
+        with pytest.raises(ValueError):
+            BloomFilter(0)
+        with pytest.raises(ValueError):
+            BloomFilter(10, error_rate=1.5)
+
+
+class TestUniquenessIndex:
+    """Uniqueness index test class"""
+
+    def test_store_interface_is_enforced(self):
+        """✅ Test a store missing part of the interface cannot be created"""
+        class ClaimOnly(UniquenessStore):
+            def claim(self, keys):
+                return None
+
+        with pytest.raises(TypeError, match="release"):
+            ClaimOnly()
+
+    def test_claims_are_case_insensitive(self, store):
+        """✅ Test names differing only in case or domain encoding collide"""
+        index = UniquenessIndex(store, capacity=100)
+        assert index.claim("Alice", "alice@example.com") is None
+        assert index.claim("ALICE", "other@example.com") == USERNAME
+        assert index.claim("bob", "Alice@EXAMPLE.com") == EMAIL
+        assert index.claim("bücher", "b@bücher.example") is None
+        assert index.claim("carol", "B@xn--bcher-kva.example") == EMAIL
+
+    def test_claims_are_normalized(self, store):
+        """✅ Test fullwidth and decomposed spellings collide with plain ones"""
+        index = UniquenessIndex(store, capacity=100)
+        assert index.claim("alice", "alice@example.com") is None
+        assert index.claim("\uff21\uff4c\uff49\uff43\uff45", "other@example.com") == USERNAME
+        assert index.claim("jos\u00e9", "jose@example.com") is None
+        assert index.claim("JOSE\u0301", "jose2@example.com") == USERNAME
+        assert index.claim("dave", "\uff41lice@example.com") == EMAIL
+
+    def test_failed_claims_reserve_nothing(self, store):
+        """✅ Test a conflict on the email leaves the username free"""
+        index = UniquenessIndex(store, capacity=100)
+        index.claim("alice", "alice@example.com")
+        assert index.claim("bob", "alice@example.com") == EMAIL
+        assert index.is_taken(username="bob") is None
+
+    def test_new_names_skip_the_store(self, store):
+        """✅ Test names the filter has never seen are not looked up"""
+        index = UniquenessIndex(store, capacity=1000)
+        for i in range(100):
+            assert index.claim(f"user{i}", f"user{i}@example.com") is None
+        assert index.store_lookups < 5
+
+    def test_rebuild_from_store(self, tmp_path):
+        """✅ Test a new index picks up claims already in the store"""
+        path = str(tmp_path / "unique.db")
+        UniquenessIndex(SQLiteStore(path)).claim("alice", "alice@example.com")
+        index = UniquenessIndex(SQLiteStore(path))
+        assert index.info()[USERNAME]["keys"] == 1
+        assert index.is_taken(username="alice") == USERNAME
+        assert index.claim("alice", "new@example.com") == USERNAME
+
+    def test_claim_made_elsewhere_is_caught(self, tmp_path):
+        """✅ Test the store settles claims another worker made after startup"""
+        path = str(tmp_path / "unique.db")
+        first = UniquenessIndex(SQLiteStore(path))
+        second = UniquenessIndex(SQLiteStore(path))
+        assert first.claim("alice", "alice@example.com") is None
+        assert second.claim("alice", "alice@example.com") == USERNAME
+
+    def test_filter_grows_past_capacity(self, store):
+        """✅ Test filters are rebuilt larger once they fill up"""
+        index = UniquenessIndex(store, capacity=10)
+        for i in range(25):
+            index.claim(f"user{i}", f"user{i}@example.com")
+        assert index.info()[USERNAME]["capacity"] >= 25
+        assert index.is_taken(username="user3") == USERNAME
+
+
+class TestConflictAPI:
+    """Registration conflict API tests"""
+
+    def test_taken_username_and_email(self):
+        """✅ Test registering a taken username or email returns 409"""
+        client = app.test_client()
+        payload = {"username": "dupuser", "email": "dup@example.com", "birth_date": "1990-05-15"}
+        assert client.post('/api/register', json=payload).status_code == 201
+
+        response = client.post('/api/register', json=dict(payload, username="DupUser", email="new@example.com"))
+        assert response.status_code == 409
+        assert json.loads(response.data) == {"success": False, "message": "Username is already taken"}
+
+        response = client.post('/api/register', json=dict(payload, username="newuser"))
+        assert response.status_code == 409
+        assert json.loads(response.data)["message"] == "Email is already registered"
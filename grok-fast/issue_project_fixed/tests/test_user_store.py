@@ -0,0 +1,170 @@
+"""
+User store unit tests
+ID allocation, write-behind batching and the IDs returned by the API
+"""
+import json
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+from src.app import app
+from src.registration import Registrations, get_user_store, set_user_store
+from src.user_store import MemoryUserStore, SQLiteUserStore, UserStore
+
+VALID = {"username": "forkuser", "email": "fork@example.com", "birth_date": "1990-05-15"}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh SQLite database"""
+    return str(tmp_path / "users.db")
+
+
+class TestUserStore:
+    """UserStore interface test class"""
+
+    def test_interface_is_enforced(self):
+        """✅ Test a store missing part of the interface cannot be created"""
+        class AddOnly(UserStore):
+            def add(self, username, email, birth_date):
+                return 1
+
+        with pytest.raises(TypeError, match="count"):
+            AddOnly()
+
+    def test_flush_and_close_are_optional(self):
+        """✅ Test stores without buffering inherit no-op flush and close"""
+        store = MemoryUserStore()
+        store.flush()
+        store.close()
+
+
+class TestSQLiteUserStore:
+    """SQLite user store test class"""
+
+    def test_write_behind_batches_inserts(self, db_path):
+        """✅ Test queued users are readable at once and written in few transactions"""
+        store = SQLiteUserStore(db_path, batch_size=100, flush_interval=1.0)
+        ids = [store.add(f"user{i}", f"user{i}@example.com", "1990-05-15") for i in range(250)]
+        assert ids == list(range(1, 251))
+        assert store.get(7)["username"] == "user6"
+        assert store.count() == 250
+        assert store.batches_written <= 4
+        store.close()
+
+    def test_concurrent_adds(self, db_path):
+        """✅ Test threads registering at once all get distinct, persisted IDs"""
+        store = SQLiteUserStore(db_path)
+        ids = []
+
+        def register(worker):
+            for i in range(50):
+                ids.append(store.add(f"w{worker}u{i}", f"w{worker}u{i}@example.com", "1990-05-15"))
+
+        threads = [threading.Thread(target=register, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(set(ids)) == 400
+        assert store.count() == 400
+        store.close()
+
+    def test_workers_get_disjoint_blocks(self, db_path):
+        """✅ Test stores sharing a database never hand out the same ID"""
+        first = SQLiteUserStore(db_path, block_size=10, write_behind=False)
+        second = SQLiteUserStore(db_path, block_size=10, write_behind=False)
+        ids = [store.add("user", "u@example.com", "1990-05-15")
+               for _ in range(15) for store in (first, second)]
+        assert len(set(ids)) == 30
+        first.close()
+        second.close()
+
+    def test_reopen_continues_after_reserved_ids(self, db_path):
+        """✅ Test a restarted store does not reuse IDs and keeps its users"""
+        store = SQLiteUserStore(db_path, block_size=10)
+        store.add("alice", "alice@example.com", "1990-05-15")
+        store.close()
+        store = SQLiteUserStore(db_path, block_size=10)
+        assert store.add("bob", "bob@example.com", "1990-05-15") == 11
+        assert store.get(1) == {
+            "id": 1, "username": "alice", "email": "alice@example.com", "birth_date": "1990-05-15"
+        }
+        store.close()
+
+
+class TestRegistrationIds:
+    """Registration API user ID tests"""
+
+    def test_returns_stored_user_id(self):
+        """✅ Test 201 responses carry the ID the user was stored under"""
+        client = app.test_client()
+        first = client.post('/api/register', headers={"Accept-Language": "en-GB"}, json={
+            "username": "firstuser", "email": "first@example.com", "birth_date": "05/06/1990"
+        })
+        second = client.post('/api/register', json={
+            "username": "seconduser", "email": "second@example.com", "birth_date": "1990-05-15"
+        })
+        assert first.status_code == second.status_code == 201
+        first_id = json.loads(first.data)["user_id"]
+        assert json.loads(second.data)["user_id"] == first_id + 1
+        assert get_user_store().get(first_id)["birth_date"] == "1990-06-05"
+
+    def test_failed_batch_frees_names(self, db_path, monkeypatch):
+        """✅ Test users the writer fails to save do not keep their names claimed"""
+        registrations = Registrations(user_db=db_path)
+        store = registrations.users
+
+        def fail(rows):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(store, "_insert", fail)
+        body, status = registrations.outcome(VALID)
+        assert status == 201
+        store.flush()
+        assert store.failed_rows == 1
+        assert registrations.uniqueness.is_taken(VALID["username"], VALID["email"]) is None
+        registrations.close()
+
+    def test_failed_add_frees_names(self, db_path, monkeypatch):
+        """✅ Test a synchronous insert that fails releases the claim and raises"""
+        registrations = Registrations()
+        monkeypatch.setattr(registrations.users, "add", lambda *row: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            registrations.outcome(VALID)
+        assert registrations.uniqueness.is_taken(VALID["username"], VALID["email"]) is None
+
+    def test_sqlite_store_behind_api(self, db_path):
+        """✅ Test registrations reach the SQLite store"""
+        store = SQLiteUserStore(db_path)
+        set_user_store(store)
+        response = app.test_client().post('/api/register', json={
+            "username": "dbuser", "email": "db@example.com", "birth_date": "1990-05-15"
+        })
+        user_id = json.loads(response.data)["user_id"]
+        store.flush()
+        reader = SQLiteUserStore(db_path)
+        assert reader.get(user_id)["username"] == "dbuser"
+        reader.close()
+        store.close()
+
+
+def _register_in_child(registrations, results):
+    body, status = registrations.outcome(VALID)
+    registrations.users.flush()
+    results.put((status, registrations.users.count()))
+
+
+def test_forked_worker_opens_its_own_store(db_path):
+    """✅ Test a worker forked after the store was opened saves through its own writer"""
+    registrations = Registrations(user_db=db_path)
+    registrations.users.count()  # opened before the fork, as with --preload
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    worker = context.Process(target=_register_in_child, args=(registrations, results))
+    worker.start()
+    worker.join(timeout=30)
+    assert results.get(timeout=5) == (201, 1)
+    assert registrations.users.count() == 1
+    registrations.close()
@@ -0,0 +1,100 @@
+"""
+File validator CLI tests
+"""
+import io
+import json
+import os
+import tracemalloc
+
+import pytest
+import src.validate_file as validate_file
+from src.validate_file import iter_json_array, main, run
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sample_requests.json")
+
+RECORDS = [
+    {"username": "chromeuser", "email": "chrome@test.com", "birth_date": "1995-08-20"},
+    {"username": "ab", "email": "bad", "birth_date": "not-a-date"},
+    {"username": "euuser", "email": "eu@test.com", "birth_date": "20/08/1995"},
+    "not an object",
+]
+
+
+class TestValidateFile:
+    """File validator test class"""
+    
+    def test_sample_requests(self):
+        """✅ Test the bundled sample file validates cleanly"""
+        output = io.StringIO()
+        summary = run(SAMPLE_FILE, output)
+        assert summary["total"] == 4
+        assert summary["valid"] == 4
+        assert summary["date_formats"] == {"%Y-%m-%d": 2, "%m/%d/%Y": 1, "%d/%m/%Y": 1}
+        assert len(output.getvalue().splitlines()) == 4
+    
+    def test_jsonl_with_bad_lines(self, tmp_path):
+        """✅ Test JSONL files, counting error codes and undecodable lines"""
+        path = tmp_path / "records.jsonl"
+        path.write_text("\n".join(json.dumps(r) for r in RECORDS) + "\n{broken\n\n")
+        output = io.StringIO()
+        summary = run(str(path), output)
+        assert summary["total"] == 5
+        assert summary["valid"] == 2
+        assert summary["errors"]["date_invalid_format"] == 1
+        assert summary["errors"]["invalid_request"] == 2
+        verdicts = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [v["index"] for v in verdicts] == [0, 1, 2, 3, 4]
+    
+    def test_array_streaming_across_reads(self, monkeypatch):
+        """✅ Test array elements split across read boundaries"""
+        monkeypatch.setattr(validate_file, "READ_SIZE", 7)
+        text = json.dumps(RECORDS * 3, indent=1)
+        assert list(iter_json_array(io.StringIO(text))) == RECORDS * 3
+    
+    def test_truncated_array(self):
+        """✅ Test a final element cut off by the end of the file yields None"""
+        assert list(iter_json_array(io.StringIO('[{"username": "a"}, {"user'))) == [
+            {"username": "a"}, None,
+        ]
+    
+    @pytest.mark.parametrize("read_size", [3, 7, 64 * 1024])
+    def test_malformed_elements_are_skipped(self, monkeypatch, read_size):
+        """✅ Test bad elements yield None and reading resumes at the next one"""
+        monkeypatch.setattr(validate_file, "READ_SIZE", read_size)
+        text = ('[{"username": "a"}, {"username": nope, "x": ["]", "\\"", {}]},'
+                ' {"username": "b"}, {"bad" 1}, {"username": "c"}]')
+        assert list(iter_json_array(io.StringIO(text))) == [
+            {"username": "a"}, None, {"username": "b"}, None, {"username": "c"},
+        ]
+    
+    def test_oversized_element_is_not_buffered(self, monkeypatch):
+        """✅ Test an element over the size limit is skipped chunk by chunk"""
+        monkeypatch.setattr(validate_file, "READ_SIZE", 4096)
+        stream = io.StringIO('[{"username": "' + "a\\\"," * 100000 + '"}, {"username": "b"}]')
+        tracemalloc.start()
+        try:
+            records = list(iter_json_array(stream, max_record_size=10000))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert records == [None, {"username": "b"}]
+        assert peak < 200000
+    
+    def test_workers_give_same_output(self, tmp_path):
+        """✅ Test the process pool gives the same ordered verdicts"""
+        path = tmp_path / "records.json"
+        path.write_text(json.dumps(RECORDS * 50))
+        serial, parallel = io.StringIO(), io.StringIO()
+        assert run(str(path), serial) == run(str(path), parallel, workers=2, chunk_size=16)
+        assert serial.getvalue() == parallel.getvalue()
+    
+    def test_main_writes_output_file(self, tmp_path, capsys):
+        """✅ Test the command-line entry point"""
+        output = tmp_path / "verdicts.jsonl"
+        assert main([SAMPLE_FILE, "--output", str(output)]) == 0
+        assert len(output.read_text().splitlines()) == 4
+        assert json.loads(capsys.readouterr().err)["valid"] == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,8 +2,34 @@
 Date validator unit tests
 These tests demonstrate cross-browser date format compatibility issues
 """
+import pickle
+import time
+from datetime import date, datetime
+
 import pytest
-from src.validators import validate_birth_date, validate_registration_data
+import src.validators as validators
+from src.validators import (
+    BirthDateCache,
+    VALID,
+    Clock,
+    ValidationResult,
+    clock,
+    disable_birth_date_cache,
+    enable_birth_date_cache,
+    fold_text,
+    normalize_text,
+    validate_birth_date,
+    validate_registration_batch,
+    validate_registration_data,
+)
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock():
+    """Pin the validator clock so date-range tests do not drift over time"""
+    clock.freeze(date(2025, 6, 15))
+    yield clock
+    clock.unfreeze()
 
 
 class TestDateValidation:
@@ -54,6 +80,11 @@ class TestDateValidation:
         """✅ Test very old date - should fail"""
         is_valid, message = validate_birth_date("1850-01-01")
         assert is_valid is False
+    
+    def test_today_is_not_future(self):
+        """✅ Test today's date is accepted and tomorrow is not"""
+        assert validate_birth_date("2025-06-15")[0] is True
+        assert validate_birth_date("2025-06-16") == (False, "Birth date cannot be in the future")
 
 
 class TestRegistrationValidation:
@@ -105,5 +136,254 @@ class TestRegistrationValidation:
         assert any("email" in err for err in result["errors"])
 
 
+class TestNormalization:
+    """Unicode normalization test class"""
+    
+    def test_normal_forms(self):
+        """✅ Test compatibility characters and combining marks are normalized"""
+        assert normalize_text("\uff21\uff4c\uff49\uff43\uff45") == "Alice"
+        assert normalize_text("e\u0301") == "\u00e9"
+        assert fold_text("\uff21\uff4c\uff49\uff43\uff45") == fold_text("ALICE") == "alice"
+        assert fold_text("Stra\u00dfe") == "strasse"
+    
+    def test_normal_input_is_returned_as_is(self):
+        """✅ Test strings already in NFKC come back unchanged"""
+        name = "alice"
+        assert normalize_text(name) is name
+        assert fold_text("Alice") == "alice"
+    
+    def test_username_length_is_normalized(self):
+        """✅ Test combining characters do not count toward the username length"""
+        result = validate_registration_data("e\u0301e\u0301", "test@example.com", "1990-05-15")
+        assert result["errors"] == ["Username must be at least 3 characters"]
+        assert validate_registration_data("\u00e9" * 64, "test@example.com", "1990-05-15")["valid"]
+        assert validate_registration_data("e\u0301" * 64, "test@example.com", "1990-05-15")["valid"]
+
+
+class TestValidationResult:
+    """ValidationResult test class"""
+    
+    def test_valid_is_shared(self):
+        """✅ Test every valid record gets the same result object"""
+        first = validate_registration_data("testuser", "test@example.com", "1990-05-15")
+        second = validate_registration_data("otheruser", "other@example.com", "05/15/1990")
+        assert first is VALID and second is VALID
+        assert first == {"valid": True, "errors": []}
+    
+    def test_dict_compatible(self):
+        """✅ Test invalid results read and compare like the old dict"""
+        result = validate_registration_data("ab", "test@example.com", "1990-05-15")
+        expected = {"valid": False, "errors": ["Username must be at least 3 characters"]}
+        assert result == expected
+        assert dict(result) == expected
+        assert result["errors"] is result.errors
+        assert list(result) == ["valid", "errors"]
+        with pytest.raises(KeyError):
+            result["username"]
+    
+    def test_slotted(self):
+        """✅ Test results carry no per-instance dict"""
+        assert not hasattr(ValidationResult(), "__dict__")
+    
+    def test_valid_errors_not_shared(self):
+        """✅ Test mutating the errors read from VALID does not leak"""
+        VALID.errors.append("oops")
+        assert VALID.errors == []
+    
+    def test_pickle(self):
+        """✅ Test results survive the trip to and from worker processes"""
+        assert pickle.loads(pickle.dumps(VALID)) is VALID
+        result = validate_registration_data("ab", "bad", "")
+        assert pickle.loads(pickle.dumps(result)) == result
+
+
+class TestClock:
+    """Validator clock tests"""
+    
+    @staticmethod
+    def counting_now(moment):
+        calls = []
+        
+        def now():
+            calls.append(moment)
+            return moment
+        return now, calls
+    
+    def test_reads_wall_clock_once_per_day(self):
+        """✅ Test repeated reads reuse the cached date"""
+        now, calls = self.counting_now(datetime(2024, 3, 1, 12, 0))
+        test_clock = Clock(now=now)
+        assert test_clock.today() == date(2024, 3, 1)
+        assert test_clock.today() == date(2024, 3, 1)
+        assert len(calls) == 1
+        assert test_clock.year_bounds() == (1900, 2024)
+    
+    def test_refreshes_at_midnight(self, monkeypatch):
+        """✅ Test the cached date expires at local midnight"""
+        monotonic = [1000.0]
+        monkeypatch.setattr(validators.time, "monotonic", lambda: monotonic[0])
+        moments = [datetime(2024, 3, 1, 23, 59, 59), datetime(2024, 3, 2, 0, 0, 1)]
+        test_clock = Clock(now=lambda: moments[0])
+        assert test_clock.today() == date(2024, 3, 1)
+        moments.pop(0)
+        monotonic[0] += 0.5
+        assert test_clock.today() == date(2024, 3, 1)
+        monotonic[0] += 1.0
+        assert test_clock.today() == date(2024, 3, 2)
+    
+    @pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+    def test_refreshes_at_midnight_after_spring_forward(self, monkeypatch):
+        """✅ Test the date still turns at midnight when the clocks went forward that evening"""
+        # Clocks jump from 22:00 to 23:00 on Saturday 9 March 2024
+        monkeypatch.setenv("TZ", "XST3XDT,M3.2.6/22,M11.1.0/1")
+        time.tzset()
+        try:
+            monotonic = [1000.0]
+            monkeypatch.setattr(validators.time, "monotonic", lambda: monotonic[0])
+            moments = [datetime(2024, 3, 9, 21, 0), datetime(2024, 3, 10, 0, 0, 1)]
+            test_clock = Clock(now=lambda: moments[0])
+            assert test_clock.today() == date(2024, 3, 9)
+            # Two real hours later it is just past midnight
+            moments.pop(0)
+            monotonic[0] += 2 * 3600 + 1
+            assert test_clock.today() == date(2024, 3, 10)
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+    
+    def test_tick(self):
+        """✅ Test a zero tick re-reads the wall clock every time"""
+        now, calls = self.counting_now(datetime(2024, 3, 1, 12, 0))
+        test_clock = Clock(tick=0, now=now)
+        test_clock.today()
+        test_clock.today()
+        assert len(calls) == 2
+    
+    def test_freeze(self):
+        """✅ Test freezing pins the date"""
+        test_clock = Clock(now=lambda: datetime(2024, 3, 1, 12, 0))
+        test_clock.freeze(date(2000, 1, 1))
+        assert test_clock.today() == date(2000, 1, 1)
+        test_clock.unfreeze()
+        assert test_clock.today() == date(2024, 3, 1)
+
+
+class TestBirthDateCache:
+    """Birth date cache tests"""
+    
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        """Install a small cache for each test"""
+        yield enable_birth_date_cache(maxsize=2)
+        disable_birth_date_cache()
+    
+    def test_repeated_input_hits_cache(self, cache):
+        """✅ Test repeated inputs are served from the cache"""
+        first = validate_birth_date("1990-05-15")
+        second = validate_birth_date("1990-05-15")
+        assert first == second == (True, "Date format is valid")
+        assert cache.info()["hits"] == 1
+        assert cache.info()["misses"] == 1
+    
+    def test_cached_errors_match_uncached(self, cache):
+        """✅ Test cached rejections keep their messages"""
+        expected = validate_birth_date("not-a-date")
+        assert validate_birth_date("not-a-date") == expected
+        assert "Received: not-a-date" in expected[1]
+    
+    def test_locale_order_is_part_of_key(self, cache):
+        """✅ Test cached readings of ambiguous dates are not shared across locales"""
+        assert validate_birth_date("06/07/2025") == (True, "Date format is valid")
+        assert validate_birth_date("06/07/2025", "en-GB") == (False, "Birth date cannot be in the future")
+    
+    def test_lru_eviction(self):
+        """✅ Test least recently used entries are evicted first"""
+        cache = BirthDateCache(maxsize=2)
+        today = date(2024, 1, 1)
+        cache.put("a", today, (True, "ok"))
+        cache.put("b", today, (True, "ok"))
+        cache.get("a", today)
+        cache.put("c", today, (True, "ok"))
+        assert cache.get("b", today) is None
+        assert cache.get("a", today) == (True, "ok")
+        assert cache.info()["evictions"] == 1
+    
+    def test_day_change_invalidates(self):
+        """✅ Test entries cached yesterday are not reused today"""
+        cache = BirthDateCache(maxsize=10)
+        cache.put("2024-01-02", date(2024, 1, 1), (False, "Birth date cannot be in the future"))
+        assert cache.get("2024-01-02", date(2024, 1, 2)) is None
+        assert cache.info()["invalidations"] == 1
+    
+    def test_invalid_maxsize(self):
+        """✅ Test cache size must be positive"""
+        with pytest.raises(ValueError):
+            BirthDateCache(maxsize=0)
+
+
+class TestRegistrationBatch:
+    """Batch registration validation tests"""
+    
+    RECORDS = [
+        {"username": "testuser", "email": "test@example.com", "birth_date": "1990-05-15"},
+        {"username": "ab", "email": "invalid-email", "birth_date": "not-a-date"},
+        {"username": "safariuser", "email": "safari@example.com", "birth_date": "05/15/1990"},
+        {"username": "futureuser", "email": "future@example.com", "birth_date": "2999-01-01"},
+        {"username": "olduser", "email": "old@example.com", "birth_date": "1850-01-01"},
+        {"username": "nodate", "email": "nodate@example.com"},
+        {"username": "testuser", "email": "test@example.com", "birth_date": "1990-05-15"},
+    ]
+    
+    def test_matches_per_record_validation(self):
+        """✅ Test batch verdicts equal validate_registration_data"""
+        result = validate_registration_batch(records=self.RECORDS)
+        assert len(result) == len(self.RECORDS)
+        for index, record in enumerate(self.RECORDS):
+            expected = validate_registration_data(
+                record.get("username", ""),
+                record.get("email", ""),
+                record.get("birth_date", ""),
+            )
+            assert result.result(index) == expected
+    
+    def test_columns_and_sparse_errors(self):
+        """✅ Test column input only records errors for invalid rows"""
+        result = validate_registration_batch(
+            usernames=["testuser", "ab"],
+            emails=["test@example.com", "test@example.com"],
+            birth_dates=["1990-05-15", "15/05/1990"],
+        )
+        assert result.valid == [True, False]
+        assert list(result.errors) == [1]
+        assert result.valid_count == 1
+    
+    def test_each_distinct_date_is_checked_once(self, monkeypatch):
+        """✅ Test repeated birth dates in a batch are parsed once"""
+        from src import validators
+        
+        parsed = []
+        check = validators._check_birth_date
+        
+        def counting(date_string, *args):
+            parsed.append(date_string)
+            return check(date_string, *args)
+        
+        monkeypatch.setattr(validators, "_check_birth_date", counting)
+        monkeypatch.setattr(validators, "_birth_date_cache", None)
+        monkeypatch.setattr(validators, "_date_table", None)
+        result = validate_registration_batch(
+            usernames=["user%d" % i for i in range(6)],
+            emails=["user%d@example.com" % i for i in range(6)],
+            birth_dates=["1990-05-15", "2999-01-01"] * 3,
+        )
+        assert result.valid == [True, False] * 3
+        assert sorted(parsed) == ["1990-05-15", "2999-01-01"]
+    
+    def test_mismatched_columns(self):
+        """✅ Test columns of different lengths are rejected"""
+        with pytest.raises(ValueError):
+            validate_registration_batch(usernames=["a"], emails=[], birth_dates=[])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,79 @@
+"""
+Vectorized birth date validation tests
+Every verdict must match the per-string validate_birth_date
+"""
+import random
+from datetime import date
+
+import pytest
+import src.vectorized as vectorized
+from src import errors
+from src.validators import _check_birth_date
+from src.vectorized import validate_birth_dates
+
+TODAY = date(2024, 6, 15)
+
+SAMPLES = [
+    "1990-05-15", "05/15/1990", "15/05/1990", "05/06/1990", "", "not-a-date",
+    "2024-06-15", "2024-06-16", "06/16/2024", "1850-01-01", "1899-12-31",
+    "1900-01-01", "2000-02-29", "1900-02-29", "02/29/2000", "29/02/1900",
+    "1990-5-15", "1990-05- 5", "5/15/1990", "١٩٩٠-٠٥-١٥", "0000-01-01",
+    "1990-13-01", "13/13/1990", "1990-05-15 ", "1990/05/15", "2999-01-01",
+]
+
+
+def expected_code(value):
+    """Error code the per-string validator reports; None for a valid date"""
+    if not value or not isinstance(value, str):
+        return errors.DATE_EMPTY
+    error, _ = _check_birth_date(value, TODAY)
+    return None if error is None else error.code
+
+
+def code_names(codes):
+    """Error codes for an array of code positions"""
+    return [errors.CODES[code] for code in codes]
+
+
+def random_samples(count, seed=7):
+    """Generate canonical and near-canonical date spellings"""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        year = str(rng.randint(1880, 2030)).zfill(4)
+        first = str(rng.randint(0, 32)).zfill(rng.choice([1, 2, 2, 2]))
+        second = str(rng.randint(0, 32)).zfill(2)
+        if rng.random() < 0.5:
+            values.append(f"{year}-{first}-{second}")
+        else:
+            values.append(f"{first}/{second}/{year}")
+    return values
+
+
+class TestVectorizedValidation:
+    """Vectorized validation test class"""
+    
+    def test_numpy_backend_matches_scalar(self):
+        """✅ Test NumPy verdicts equal the per-string validator"""
+        np = pytest.importorskip("numpy")
+        values = SAMPLES + random_samples(3000)
+        valid, codes = validate_birth_dates(np.array(values), today=TODAY, chunk_size=500)
+        assert code_names(codes.tolist()) == [expected_code(v) for v in values]
+        assert valid.tolist() == [expected_code(v) is None for v in values]
+    
+    def test_numpy_backend_mixed_input(self):
+        """✅ Test non-string elements count as empty"""
+        pytest.importorskip("numpy")
+        valid, codes = validate_birth_dates(["1990-05-15", None, 42], today=TODAY)
+        assert code_names(codes.tolist()) == [None, errors.DATE_EMPTY, errors.DATE_EMPTY]
+    
+    def test_fallback_without_numpy(self, monkeypatch):
+        """✅ Test the pure Python fallback gives the same verdicts"""
+        monkeypatch.setattr(vectorized, "HAS_NUMPY", False)
+        valid, codes = validate_birth_dates(SAMPLES + [None], today=TODAY)
+        assert code_names(codes) == [expected_code(v) for v in SAMPLES + [None]]
+        assert valid == [code == errors.NO_ERROR for code in codes]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])